@@ -9,6 +9,59 @@ def create_app(config_class=Config):
     )  # Add static folder path
     app.config.from_object(config_class)
 
+    from app.metrics import metrics
+
+    # Registers /metrics and the request timing hooks
+    metrics.init_app(app)
+
+    from app import models
+    from app.context import fetch_pool
+    from app.singleflight import single_flight
+
+    models.init_app(app)
+    fetch_pool.init_app(app)
+    single_flight.init_app(app)
+
+    from app.cache import shot_cache
+    from app.refresh import season_refresh
+
+    shot_cache.init_app(app)
+    season_refresh.init_app(app)
+
+    from app import ingest
+    from app.store import shot_store
+
+    shot_store.init_app(app)
+    ingest.init_app(app)
+
+    from app import baselines
+
+    # Loads the precomputed league baselines once, if they were built
+    baselines.init_app(app)
+
+    from app.page_cache import page_cache
+
+    page_cache.init_app(app)
+
+    from app.player_index import player_index
+
+    # Build the player lookup tables once at startup
+    player_index.load()
+
+    from app.warmup import warmup
+
+    # /healthz and /readyz; the warm-up itself runs from wsgi.py, or from
+    # run.py when run as a script
+    warmup.init_app(app)
+
+    from app import export
+
+    export.init_app(app)
+
+    from app import assets
+
+    assets.init_app(app)
+
     from app.routes import main
 
     app.register_blueprint(main)
@@ -0,0 +1,93 @@
+# app/assets.py
+import os
+import pkgutil
+from functools import lru_cache
+
+import click
+import plotly
+from flask import Response, abort, current_app, request, url_for
+from flask.cli import with_appcontext
+
+# Versioned names never change content, so browsers may cache them for a year
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+
+
+def plotlyjs_bundle():
+    """
+    The plotly.js bundle shipped with the plotly package. Read directly, as
+    plotly.offline would also import IPython at startup.
+    """
+    return pkgutil.get_data("plotly", "package_data/plotly.min.js")
+
+
+def plotlyjs_filename():
+    """
+    Static path of the plotly.js bundle. Named after the plotly package
+    version, which pins the bundle it ships.
+    """
+    return f"js/plotly-{plotly.__version__}.min.js"
+
+
+def vendor_plotlyjs(static_folder):
+    """Write the plotly.js bundle under static/ once, if it isn't there yet"""
+    path = os.path.join(static_folder, plotlyjs_filename())
+    if os.path.exists(path):
+        return path
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(plotlyjs_bundle())
+    os.replace(tmp_path, path)
+    return path
+
+
+@lru_cache(maxsize=None)
+def _packaged_plotlyjs():
+    return plotlyjs_bundle()
+
+
+def serve_plotlyjs(version):
+    """The bundle straight from the plotly package, when it was not vendored"""
+    if version != plotly.__version__:
+        abort(404)
+    return Response(_packaged_plotlyjs(), mimetype="text/javascript")
+
+
+def plotlyjs_url():
+    """
+    URL of the plotly.js bundle: the static file written by `flask
+    vendor-assets` at build time, or the package copy served by the app
+    """
+    if current_app.config["PLOTLYJS_VENDORED"]:
+        return url_for("static", filename=plotlyjs_filename())
+    return url_for("plotlyjs", version=plotly.__version__)
+
+
+@click.command("vendor-assets")
+@with_appcontext
+def vendor_assets_command():
+    """Write the plotly.js bundle into static/, e.g. while building an image."""
+    click.echo(f"Wrote {vendor_plotlyjs(current_app.static_folder)}")
+
+
+def init_app(app):
+    # Only checked here: the static folder may be read-only when deployed
+    filename = plotlyjs_filename()
+    app.config["PLOTLYJS_VENDORED"] = os.path.exists(
+        os.path.join(app.static_folder, filename)
+    )
+    app.add_url_rule("/assets/js/plotly-<version>.min.js", "plotlyjs", serve_plotlyjs)
+    app.cli.add_command(vendor_assets_command)
+
+    @app.after_request
+    def cache_versioned_assets(response):
+        if (
+            request.endpoint == "static"
+            and request.view_args.get("filename") == filename
+        ) or request.endpoint == "plotlyjs":
+            response.cache_control.no_cache = None
+            response.cache_control.public = True
+            response.cache_control.max_age = IMMUTABLE_MAX_AGE
+            response.cache_control.immutable = True
+        return response
@@ -0,0 +1,212 @@
+# app/baselines.py
+import os
+
+import click
+import numpy as np
+import pandas as pd
+from flask.cli import with_appcontext
+
+from .ingest import season_range
+from .models import ShotChart
+from .stats import SHOT_TYPES, SUMMARY_ZONES
+from .store import shot_store
+
+# Distance buckets in feet, as left-closed edges
+DISTANCE_EDGES = [0, 4, 10, 16, 24, 30, np.inf]
+DISTANCE_LABELS = ["0-3 ft", "4-9 ft", "10-15 ft", "16-23 ft", "24-29 ft", "30+ ft"]
+
+BASELINE_COLUMNS = [
+    "Season",
+    "Group",
+    "Bucket",
+    "Attempts",
+    "FG%",
+    "AttemptRate",
+    "PointsPerShot",
+]
+
+
+def compute_baselines(shots_df, season):
+    """
+    League FG%, share of all attempts and points per shot for every zone,
+    shot type and distance bucket in a season's shots. Shot type buckets use
+    the zone table's summary row names so both join on Zone.
+    """
+    made = shots_df["SHOT_MADE_FLAG"].to_numpy(dtype=bool)
+    is_three = shots_df["SHOT_TYPE"].to_numpy() == SHOT_TYPES[1]
+    points = np.where(is_three, 3, 2) * made
+    groups = {
+        "zone": shots_df["SHOT_ZONE_BASIC"].to_numpy(),
+        "type": np.where(is_three, SUMMARY_ZONES[1], SUMMARY_ZONES[0]),
+        "distance": pd.cut(
+            shots_df["SHOT_DISTANCE"],
+            DISTANCE_EDGES,
+            right=False,
+            labels=DISTANCE_LABELS,
+        ),
+    }
+
+    frames = []
+    for group, buckets in groups.items():
+        totals = (
+            pd.DataFrame({"Bucket": buckets, "Made": made, "Points": points})
+            .groupby("Bucket", sort=True, observed=True)
+            .agg(
+                Attempts=("Made", "size"),
+                Made=("Made", "sum"),
+                Points=("Points", "sum"),
+            )
+            .reset_index()
+        )
+        frames.append(
+            pd.DataFrame(
+                {
+                    "Season": season,
+                    "Group": group,
+                    "Bucket": totals["Bucket"],
+                    "Attempts": totals["Attempts"],
+                    "FG%": totals["Made"] / totals["Attempts"] * 100,
+                    "AttemptRate": totals["Attempts"] / len(shots_df),
+                    "PointsPerShot": totals["Points"] / totals["Attempts"],
+                }
+            )
+        )
+    return compact_baselines(pd.concat(frames, ignore_index=True))
+
+
+def compact_baselines(table):
+    """Categorical keys and 32-bit numbers, a few KB per season"""
+    return table[BASELINE_COLUMNS].astype(
+        {
+            "Season": "category",
+            "Group": "category",
+            "Bucket": "category",
+            "Attempts": np.int32,
+            "FG%": np.float32,
+            "AttemptRate": np.float32,
+            "PointsPerShot": np.float32,
+        }
+    )
+
+
+class LeagueBaselines:
+    """
+    Lookup table of league baselines written by `flask build-baselines` and
+    loaded once at startup. Per-season zone FG% frames are indexed ahead of
+    time so a request only pays for one join.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.table = None
+        self._zone_fg = {}
+
+    def init_app(self, app):
+        self.path = app.config.get("LEAGUE_BASELINES_PATH")
+        self.load()
+
+    def load(self, table=None):
+        if table is None:
+            if not self.path or not os.path.exists(self.path):
+                return
+            try:
+                table = pd.read_parquet(self.path)
+            except Exception as e:
+                print(f"Error loading league baselines: {e}")
+                return
+
+        zone_fg = {}
+        for season, rows in table.groupby("Season", observed=True):
+            rows = rows[rows["Group"].isin(["zone", "type"])]
+            zone_fg[season] = (
+                rows.set_index(rows["Bucket"].astype(str))["FG%"]
+                .astype(float)
+                .rename("League FG%")
+                .to_frame()
+            )
+        self.table = table
+        self._zone_fg = zone_fg
+
+    def compare(self, stats, season):
+        """
+        Join league FG% onto a numeric zone table by Zone and add the
+        player's difference from it as "vs League". Rows without a baseline
+        (free throws, unbuilt seasons) are left NaN.
+        """
+        league = self._zone_fg.get(season)
+        if league is None:
+            return stats
+        stats = stats.join(league, on="Zone")
+        stats["vs League"] = stats["FG%"] - stats["League FG%"]
+        return stats
+
+
+league_baselines = LeagueBaselines()
+
+
+def build_season(season):
+    """Baselines for one season from the shot store, or None if not ingested"""
+    shots_df = shot_store.get_season_shots(
+        season,
+        columns=["SHOT_ZONE_BASIC", "SHOT_TYPE", "SHOT_DISTANCE", "SHOT_MADE_FLAG"],
+    )
+    if shots_df.empty:
+        return None
+    return compute_baselines(shots_df, season)
+
+
+@click.command("build-baselines")
+@click.argument("first_season")
+@click.argument("last_season", required=False)
+@with_appcontext
+def build_baselines_command(first_season, last_season):
+    """Precompute league baselines for FIRST_SEASON..LAST_SEASON from the shot store."""
+    if not shot_store.enabled:
+        raise click.ClickException("No shot store, run flask ingest-shots first")
+
+    seasons = [
+        season
+        for season in season_range(first_season, last_season or first_season)
+        if ShotChart.is_data_available(season)
+    ]
+    built = []
+    for season in seasons:
+        table = build_season(season)
+        if table is None:
+            click.echo(f"{season}: no ingested shots, skipping")
+            continue
+        shots = int(table.loc[table["Group"] == "type", "Attempts"].sum())
+        click.echo(f"{season}: {len(table)} buckets from {shots} shots")
+        built.append(table)
+
+    if not built:
+        raise click.ClickException("No seasons were built")
+
+    # Rebuilt seasons replace their old rows, others are kept
+    path = league_baselines.path
+    frames = built
+    if os.path.exists(path):
+        existing = pd.read_parquet(path)
+        rebuilt = [table["Season"].iloc[0] for table in built]
+        frames = [existing[~existing["Season"].isin(rebuilt)]] + built
+
+    table = compact_baselines(
+        pd.concat(
+            [
+                frame.astype({"Season": str, "Group": str, "Bucket": str})
+                for frame in frames
+            ],
+            ignore_index=True,
+        )
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    table.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+    league_baselines.load(table)
+    click.echo(f"Wrote {len(table)} baseline rows to {path}")
+
+
+def init_app(app):
+    league_baselines.init_app(app)
+    app.cli.add_command(build_baselines_command)
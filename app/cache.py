@@ -0,0 +1,128 @@
+# app/cache.py
+import os
+import threading
+import time
+
+import pandas as pd
+
+
+class ShotCache:
+    """
+    On-disk Parquet cache for ShotChartDetail frames keyed by
+    (player_id, season, game_id).
+
+    Completed seasons never expire; the current season is refetched once its
+    entry is older than the configured TTL. File access times track recency
+    so the least recently read entries are evicted once the cache grows past
+    its size cap. The size is counted once and then kept as a running total
+    of this process's writes; every eviction recounts it from disk.
+    """
+
+    def __init__(self, cache_dir=None, ttl=3600, max_bytes=512 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._size = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.cache_dir = app.config.get("SHOT_CACHE_DIR")
+        self.ttl = app.config.get("SHOT_CACHE_TTL", self.ttl)
+        self.max_bytes = app.config.get("SHOT_CACHE_MAX_BYTES", self.max_bytes)
+        self._size = None
+
+    @property
+    def enabled(self):
+        return bool(self.cache_dir)
+
+    def _path(self, player_id, season, game_id=None):
+        return os.path.join(
+            self.cache_dir, season, f"{player_id}_{game_id or 'all'}.parquet"
+        )
+
+    def _is_fresh(self, path, season):
+        from .models import ShotChart
+
+        if not ShotChart.is_current_season(season):
+            return True
+        return time.time() - os.path.getmtime(path) < self.ttl
+
+    def get(self, player_id, season, game_id=None):
+        """Return the cached frame, or None on a miss or expired entry"""
+        if not self.enabled:
+            return None
+
+        path = self._path(player_id, season, game_id)
+        try:
+            if not self._is_fresh(path, season):
+                return None
+            shots_df = pd.read_parquet(path)
+            # Bump the access time only, mtime keeps recording the write
+            os.utime(path, (time.time(), os.path.getmtime(path)))
+            return shots_df
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Error reading shot cache: {e}")
+            return None
+
+    def set(self, player_id, season, game_id, shots_df):
+        if not self.enabled or shots_df.empty:
+            return
+
+        path = self._path(player_id, season, game_id)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            shots_df.to_parquet(tmp_path, index=False)
+            try:
+                replaced = os.path.getsize(path)
+            except FileNotFoundError:
+                replaced = 0
+            os.replace(tmp_path, path)
+            self._grow(os.path.getsize(path) - replaced)
+        except Exception as e:
+            print(f"Error writing shot cache: {e}")
+
+    def _entries(self):
+        """(atime, size, path) of every cached file"""
+        entries = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith(".parquet"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_atime, stat.st_size, path))
+        return entries
+
+    def _grow(self, added):
+        """Add a write to the running size, evicting once it passes max_bytes"""
+        with self._lock:
+            if self._size is None:
+                # First write: count what earlier runs left, this write included
+                self._size = sum(size for _, size, _ in self._entries())
+            else:
+                self._size += added
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Drop least recently read entries until the cache fits max_bytes"""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+        self._size = total
+
+
+shot_cache = ShotCache()
@@ -0,0 +1,180 @@
+# app/career.py
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from .metrics import metrics
+from .models import ShotChart, normalize_shots
+from .stats import (
+    add_free_throws,
+    format_shot_stats,
+    minutes_played,
+    shooting_totals,
+    zone_counts,
+    zone_table,
+)
+
+# Season value selecting the multi-season view
+CAREER = "career"
+
+
+class SeasonPartial:
+    """
+    One season's shots, in the compact SHOT_SCHEMA layout, plus the additive
+    aggregates (zone counts, games, minutes, free throws) career totals are
+    summed from.
+    """
+
+    def __init__(self, season, shots_df, games_df):
+        self.season = season
+        self.shots = normalize_shots(shots_df)
+        self.made, self.attempts = zone_counts(self.shots)
+        self.shot_games = int(self.shots["GAME_ID"].nunique())
+        self.minutes, self.games_played, _ = minutes_played(games_df)
+        self.fta = int(games_df["FTA"].sum()) if not games_df.empty else 0
+        self.ftm = int(games_df["FTM"].sum()) if not games_df.empty else 0
+
+
+class CareerShots:
+    """Merged view over the per-season partials of a season range"""
+
+    def __init__(self, partials):
+        self.partials = partials
+        self.seasons = [partial.season for partial in partials]
+
+    @property
+    def shots(self):
+        """Every season's shots in one frame with a categorical SEASON"""
+        if not self.partials:
+            return pd.DataFrame()
+        season_dtype = pd.CategoricalDtype(self.seasons, ordered=True)
+        return pd.concat(
+            [
+                partial.shots.assign(
+                    SEASON=pd.Categorical(
+                        [partial.season] * len(partial.shots), dtype=season_dtype
+                    )
+                )
+                for partial in self.partials
+            ],
+            ignore_index=True,
+        )
+
+    def stats(self):
+        """Numeric zone table with free throws, from the summed season counts"""
+        made = sum(partial.made for partial in self.partials)
+        attempts = sum(partial.attempts for partial in self.partials)
+        num_games = sum(partial.shot_games for partial in self.partials)
+        total_minutes = sum(partial.minutes for partial in self.partials)
+        games_played = sum(partial.games_played for partial in self.partials)
+
+        minutes_per_game = total_minutes / games_played if games_played > 0 else 0
+        per36_multiplier = 36 / minutes_per_game if minutes_per_game > 0 else 0
+        stats = zone_table(made, attempts, num_games, per36_multiplier)
+        stats = add_free_throws(
+            stats,
+            sum(partial.ftm for partial in self.partials),
+            sum(partial.fta for partial in self.partials),
+            num_games,
+        )
+        return stats, minutes_per_game > 0
+
+    def zone_stats(self, per36=False):
+        """Display table and summary totals, as build_shot_stats returns them"""
+        stats, has_minutes = self.stats()
+        zone_stats = format_shot_stats(stats, per36=per36 and has_minutes)
+        return zone_stats, shooting_totals(stats)
+
+    def season_rows(self):
+        """Per-season attempts, makes and FG% for the season breakdown"""
+        rows = []
+        for partial in self.partials:
+            made, attempts = int(partial.made.sum()), int(partial.attempts.sum())
+            rows.append(
+                {
+                    "season": partial.season,
+                    "games": partial.shot_games,
+                    "made": made,
+                    "attempts": attempts,
+                    "fg_pct": round(made / attempts * 100, 1) if attempts else 0.0,
+                }
+            )
+        return rows
+
+
+class CareerAggregator:
+    """
+    LRU of per-(player, season) partials. Completed seasons are built once,
+    so widening a career range only fetches and aggregates the seasons that
+    were added; the season in progress is rebuilt on every request.
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._partials = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, key):
+        with self._lock:
+            partial = self._partials.get(key)
+            if partial is not None:
+                self._partials.move_to_end(key)
+            return partial
+
+    def _put(self, key, partial):
+        with self._lock:
+            self._partials[key] = partial
+            self._partials.move_to_end(key)
+            while len(self._partials) > self.max_entries:
+                self._partials.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._partials.clear()
+
+    def aggregate(self, data, player_name, player_id, seasons):
+        """CareerShots for the given seasons, fetching only missing partials"""
+        seasons = sorted(s for s in seasons if ShotChart.is_data_available(s))
+        partials = {season: self._get((player_id, season)) for season in seasons}
+        missing = [season for season, partial in partials.items() if partial is None]
+        for partial in partials.values():
+            metrics.count("career_partials", "miss" if partial is None else "hit")
+
+        # Missing seasons are independent upstream calls, fetch them together
+        data.prefetch(
+            *[(data.player_shots, player_name, season) for season in missing],
+            *[(data.game_log, player_name, season) for season in missing],
+        )
+        with metrics.span("career"):
+            return self._build(data, player_name, player_id, partials, missing)
+
+    def _build(self, data, player_name, player_id, partials, missing):
+        for season in missing:
+            shots_df, _ = data.player_shots(player_name, season)
+            if shots_df.empty:
+                partials[season] = None
+                continue
+            partial = SeasonPartial(
+                season, shots_df, data.game_log(player_name, season)
+            )
+            partials[season] = partial
+            # Failed fetches and live seasons must not be pinned
+            if not ShotChart.is_current_season(season):
+                self._put((player_id, season), partial)
+
+        return CareerShots([p for p in partials.values() if p is not None])
+
+
+career_aggregator = CareerAggregator()
+
+
+def season_window(seasons, first=None, last=None):
+    """Seasons with shot locations, limited to first..last when given"""
+    return [
+        season
+        for season in seasons
+        if ShotChart.is_data_available(season)
+        and (not first or season >= first)
+        and (not last or season <= last)
+    ]
@@ -0,0 +1,150 @@
+# app/compare.py
+import pandas as pd
+
+from .baselines import league_baselines
+from .metrics import metrics
+from .models import normalize_shots
+from .stats import (
+    FREE_THROW_ZONE,
+    SUMMARY_ZONES,
+    ZONES,
+    add_free_throws,
+    grouped_zone_counts,
+    shooting_totals,
+    zone_table,
+)
+
+# Beyond four players an overlaid court is unreadable
+MAX_PLAYERS = 4
+
+# Marker colour of each compared player, in the order they were picked
+PLAYER_COLORS = ["#3498db", "#f1c40f", "#e67e22", "#9b59b6"]
+
+# Every player on one court, or one small court per player
+LAYOUTS = ("overlay", "grid")
+
+
+def fetch_players(data, player_names, season):
+    """
+    Fetch every player's seasons, game log and shots concurrently, so a
+    comparison waits about as long as its slowest player rather than the sum
+    """
+    data.prefetch(
+        *[(data.player_seasons, name) for name in player_names],
+        *[(data.game_log, name, season) for name in player_names],
+        *[(data.player_shots, name, season) for name in player_names],
+    )
+
+
+class Comparison:
+    """
+    Several players' shots over the same season in one frame keyed by a
+    categorical PLAYER column, so zone stats for all of them come from one
+    grouped pass instead of one pass per player.
+    """
+
+    def __init__(self, season, frames):
+        self.season = season
+        self.players = list(frames)
+        player_dtype = pd.CategoricalDtype(self.players, ordered=True)
+        self.shots = pd.concat(
+            [
+                normalize_shots(shots_df).assign(
+                    PLAYER=pd.Categorical([name] * len(shots_df), dtype=player_dtype)
+                )
+                for name, shots_df in frames.items()
+            ],
+            ignore_index=True,
+        )
+        self.games = self.shots.groupby("PLAYER", observed=False)["GAME_ID"].nunique()
+
+    def color(self, player_name):
+        return PLAYER_COLORS[self.players.index(player_name) % len(PLAYER_COLORS)]
+
+    def player_shots(self, player_name):
+        return self.shots[self.shots["PLAYER"] == player_name]
+
+    def stats(self, data):
+        """
+        {player: (numeric zone table with free throws and league FG%, whether
+        minutes were available for per-36 rates)}
+        """
+        with metrics.span("compare"):
+            return self._stats(data)
+
+    def _stats(self, data):
+        player_codes = self.shots["PLAYER"].cat.codes.to_numpy()
+        made, attempts = grouped_zone_counts(
+            self.shots, player_codes, len(self.players)
+        )
+        tables = {}
+        for i, name in enumerate(self.players):
+            total_minutes, games_played, _ = data.player_minutes(name, self.season)
+            minutes_per_game = total_minutes / games_played if games_played > 0 else 0
+            per36_multiplier = 36 / minutes_per_game if minutes_per_game > 0 else 0
+
+            stats = zone_table(made[i], attempts[i], self.games[name], per36_multiplier)
+            fta, ftm = data.player_free_throws(name, self.season)
+            stats = add_free_throws(stats, ftm, fta, self.games[name])
+            tables[name] = (
+                league_baselines.compare(stats, self.season),
+                minutes_per_game > 0,
+            )
+        return tables
+
+    def summary_rows(self, tables):
+        """Games and shooting totals per player, for the summary table"""
+        return [
+            {
+                "player": name,
+                "color": self.color(name),
+                "games": int(self.games[name]),
+                **shooting_totals(stats),
+            }
+            for name, (stats, _) in tables.items()
+        ]
+
+    def zone_rows(self, tables, per36=False):
+        """
+        Side-by-side zone rows: for each zone any player shot from, one cell
+        per player with made-attempted, attempts per game (or per 36), FG%
+        and the difference from the league, formatted for display
+        """
+        by_zone = {name: stats.set_index("Zone") for name, (stats, _) in tables.items()}
+        zones = [
+            zone
+            for zone in ZONES + SUMMARY_ZONES + [FREE_THROW_ZONE]
+            if any(zone in stats.index for stats in by_zone.values())
+        ]
+
+        rows = []
+        for zone in zones:
+            cells = []
+            for name, (_, has_minutes) in tables.items():
+                stats = by_zone[name]
+                if zone not in stats.index:
+                    cells.append(None)
+                    continue
+                row = stats.loc[zone]
+                rate = row["AttemptsPerGame"]
+                if per36 and has_minutes and pd.notna(row["AttemptsPer36"]):
+                    rate = row["AttemptsPer36"]
+                vs_league = row.get("vs League")
+                cells.append(
+                    {
+                        "made_attempts": f"{int(row['Made'])}-{int(row['Attempts'])}",
+                        "rate": f"{rate:.1f}",
+                        "fg_pct": f"{row['FG%']:.1f}",
+                        "vs_league": (
+                            "" if pd.isna(vs_league) else f"{vs_league:+.1f}"
+                        ),
+                    }
+                )
+            rows.append(
+                {
+                    "zone": zone,
+                    "summary": zone in SUMMARY_ZONES or zone == FREE_THROW_ZONE,
+                    "cells": cells,
+                }
+            )
+        return rows
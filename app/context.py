@@ -0,0 +1,119 @@
+# app/context.py
+import contextvars
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+
+from flask import g
+from .models import ShotChart
+
+
+class FetchPool:
+    """
+    Process-wide thread pool that bounds how many upstream nba_api calls run
+    concurrently across all requests in a worker.
+    """
+
+    def __init__(self, max_workers=4):
+        self.max_workers = max_workers
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.max_workers = app.config.get("UPSTREAM_MAX_CONCURRENCY", self.max_workers)
+
+    def reset(self):
+        """Drop an executor inherited across fork; its threads did not come along"""
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix="nba-fetch"
+                    )
+        # Run in a copy of the caller's context so request-scoped state such
+        # as Server-Timing spans is visible from the pool thread
+        return self._executor.submit(contextvars.copy_context().run, fn, *args)
+
+
+fetch_pool = FetchPool()
+
+
+class RequestData:
+    """
+    Per-request view over ShotChart that fetches each upstream endpoint at
+    most once per (player, season, game) and hands every consumer the same
+    DataFrame.
+    """
+
+    def __init__(self):
+        self._memo = {}
+        self._lock = threading.Lock()
+
+    def _get(self, key, loader):
+        # Memoize futures so a prefetch already in flight is joined, not repeated
+        with self._lock:
+            future = self._memo.get(key)
+            owner = future is None
+            if owner:
+                future = self._memo[key] = Future()
+
+        if owner:
+            try:
+                future.set_result(loader())
+            except Exception as e:
+                future.set_exception(e)
+        return future.result()
+
+    def prefetch(self, *calls):
+        """
+        Run independent fetches, given as (method, *args) tuples, concurrently
+        on the fetch pool and return once all of them are memoized
+        """
+        wait([fetch_pool.submit(method, *args) for method, *args in calls])
+
+    def player_seasons(self, player_name):
+        return self._get(
+            ("seasons", player_name),
+            lambda: ShotChart.get_player_seasons(player_name),
+        )
+
+    def game_log(self, player_name, season):
+        return self._get(
+            ("gamelog", player_name, season),
+            lambda: ShotChart.get_game_log(player_name, season),
+        )
+
+    def player_shots(self, player_name, season, game_id=None):
+        return self._get(
+            ("shots", player_name, season, game_id),
+            lambda: ShotChart.get_player_shots(player_name, season, game_id),
+        )
+
+    # Game log consumers share a single PlayerGameLog fetch
+    def player_games(self, player_name, season):
+        return self._get(
+            ("games", player_name, season),
+            lambda: ShotChart.get_player_games(
+                player_name, season, games_df=self.game_log(player_name, season)
+            ),
+        )
+
+    def player_free_throws(self, player_name, season, game_id=None):
+        return ShotChart.get_player_free_throws(
+            player_name, season, game_id, games_df=self.game_log(player_name, season)
+        )
+
+    def player_minutes(self, player_name, season):
+        return ShotChart.get_player_minutes(
+            player_name, season, games_df=self.game_log(player_name, season)
+        )
+
+
+def get_request_data():
+    """Return the RequestData bound to the current request, creating it once"""
+    if "request_data" not in g:
+        g.request_data = RequestData()
+    return g.request_data
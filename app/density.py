@@ -0,0 +1,171 @@
+# app/density.py
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from .metrics import metrics
+from .models import ShotChart
+from .store import shot_store
+
+# Hex radius in court units (tenths of feet)
+HEX_SIZE = 12
+SQRT3 = np.sqrt(3)
+
+# Axial hex coordinates are offset into a positive range and packed into one
+# int64 key, so binning is a single np.unique over the packed keys
+_OFFSET = 1 << 15
+_STRIDE = 1 << 16
+
+BIN_COLUMNS = ["X", "Y", "Attempts", "Made", "FGPercent", "LeagueFGPercent", "Diff"]
+
+
+def _hex_keys(loc_x, loc_y, size):
+    """Packed axial (q, r) keys of the pointy-top hexes containing each shot"""
+    x = np.asarray(loc_x, dtype=float)
+    y = np.asarray(loc_y, dtype=float)
+    q = (SQRT3 / 3 * x - y / 3) / size
+    r = (2 / 3 * y) / size
+
+    # Round fractional cube coordinates to the nearest hex
+    s = -q - r
+    rq, rr, rs = np.round(q), np.round(r), np.round(s)
+    dq, dr, ds = np.abs(rq - q), np.abs(rr - r), np.abs(rs - s)
+    fix_q = (dq > dr) & (dq > ds)
+    fix_r = ~fix_q & (dr > ds)
+    rq = np.where(fix_q, -rr - rs, rq)
+    rr = np.where(fix_r, -rq - rs, rr)
+
+    return (rq.astype(np.int64) + _OFFSET) * _STRIDE + (rr.astype(np.int64) + _OFFSET)
+
+
+def _hex_centers(keys, size):
+    q = keys // _STRIDE - _OFFSET
+    r = keys % _STRIDE - _OFFSET
+    return size * SQRT3 * (q + r / 2), size * 1.5 * r
+
+
+def hexbin(loc_x, loc_y, made, size=HEX_SIZE):
+    """
+    Bin shots into hexagonal cells in one pass: attempts, makes and FG% per
+    occupied cell, indexed by the packed hex key.
+    """
+    keys = _hex_keys(loc_x, loc_y, size)
+    cells, inverse = np.unique(keys, return_inverse=True)
+    attempts = np.bincount(inverse, minlength=len(cells))
+    makes = np.bincount(
+        inverse, weights=np.asarray(made, dtype=float), minlength=len(cells)
+    )
+    x, y = _hex_centers(cells, size)
+    return pd.DataFrame(
+        {
+            "X": x,
+            "Y": y,
+            "Attempts": attempts,
+            "Made": makes.astype(np.int64),
+            "FGPercent": makes / attempts * 100,
+        },
+        index=pd.Index(cells, name="Cell"),
+    )
+
+
+def _has_grid(grid):
+    return grid is not None
+
+
+class DensityCache:
+    """
+    LRU of binned grids; only completed seasons are cached, and only grids
+    that `cacheable` accepts. A missing league grid is not cached, so the
+    league comparison appears once `flask ingest-shots` fills the store.
+    """
+
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_or_build(self, key, season, build, cacheable=_has_grid):
+        if ShotChart.is_current_season(season):
+            return build()
+
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                metrics.count("density", "hit")
+                return self._entries[key]
+
+        metrics.count("density", "miss")
+        grid = build()
+        if not cacheable(grid):
+            return grid
+        with self._lock:
+            self._entries[key] = grid
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return grid
+
+
+density_cache = DensityCache()
+
+
+def league_bins(season, size=HEX_SIZE):
+    """League-wide bins for a season from the shot store, or None if not ingested"""
+    if not shot_store.enabled:
+        return None
+
+    def build():
+        league_df = shot_store.get_season_shots(
+            season, columns=["LOC_X", "LOC_Y", "SHOT_MADE_FLAG"]
+        )
+        if league_df.empty:
+            return None
+        return hexbin(
+            league_df["LOC_X"], league_df["LOC_Y"], league_df["SHOT_MADE_FLAG"], size
+        )
+
+    return density_cache.get_or_build(("league", season, size), season, build)
+
+
+def shot_density(shots_df, player_id, season, game_id=None, size=HEX_SIZE):
+    """
+    Hex bins for a player's shots with league-relative efficiency. Diff is
+    the player's FG% minus the league's FG% from the same cell, when the
+    season has been ingested into the shot store.
+    """
+
+    def build():
+        bins = hexbin(
+            shots_df["LOC_X"], shots_df["LOC_Y"], shots_df["SHOT_MADE_FLAG"], size
+        )
+        league = league_bins(season, size)
+        bins["LeagueFGPercent"] = (
+            league["FGPercent"].reindex(bins.index) if league is not None else np.nan
+        )
+        bins["Diff"] = bins["FGPercent"] - bins["LeagueFGPercent"]
+        return bins[BIN_COLUMNS]
+
+    # Bins built before the season was ingested would never get their Diff
+    return density_cache.get_or_build(
+        ("player", player_id, season, game_id, size),
+        season,
+        build,
+        cacheable=lambda bins: bins["LeagueFGPercent"].notna().any(),
+    )
+
+
+def density_columns(bins):
+    """Columnar JSON payload for a bin table"""
+    return {
+        "x": bins["X"].round(1).tolist(),
+        "y": bins["Y"].round(1).tolist(),
+        "attempts": bins["Attempts"].tolist(),
+        "made": bins["Made"].tolist(),
+        "fg_pct": bins["FGPercent"].round(1).tolist(),
+        "diff": [None if pd.isna(v) else round(v, 1) for v in bins["Diff"]],
+    }
@@ -0,0 +1,346 @@
+# app/export.py
+import base64
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from importlib.util import find_spec
+from multiprocessing import get_context
+
+import click
+import plotly
+import plotly.io as pio
+from flask import current_app
+from flask.cli import with_appcontext
+
+from .models import ShotChart
+from .player_index import unknown_player_message
+from .routes import chart_figure, chart_filename, chart_title
+from .transport import UpstreamError, transport
+from .utils import COURT_IMAGE, COURT_STYLES, court_layout
+
+FORMATS = ("png", "svg", "html")
+
+# Records, under "files", the fingerprint of the figure each chart file was
+# rendered from and, under "jobs", which file and render settings each
+# completed-season chart request produced, so those are skipped unfetched
+MANIFEST = ".export-manifest.json"
+
+# Game id placeholder for "the player's most recent game of the season"
+LATEST_GAME = "latest"
+
+
+@lru_cache(maxsize=None)
+def court_image_uri(static_folder):
+    """The raster court inlined as a data URI, since exports have no server"""
+    with open(os.path.join(static_folder, COURT_IMAGE), "rb") as f:
+        return "data:image/png;base64," + base64.b64encode(f.read()).decode()
+
+
+def team_roster(abbreviation, season):
+    """Names of the players on a team's roster for a season"""
+    from nba_api.stats.endpoints import commonteamroster
+    from nba_api.stats.static import teams
+
+    team = teams.find_team_by_abbreviation(abbreviation.upper())
+    if team is None:
+        raise ValueError(f"Unknown team {abbreviation}")
+    roster = transport.call(
+        commonteamroster.CommonTeamRoster, team_id=team["id"], season=season
+    )
+    return roster.get_data_frames()[0]["PLAYER"].tolist()
+
+
+def figure_fingerprint(figure, fmt, width, height, scale):
+    """Hash of everything a rendered file depends on"""
+    digest = hashlib.sha1(pio.to_json(figure, validate=False).encode())
+    digest.update(f"{fmt}:{width}x{height}@{scale}:{plotly.__version__}".encode())
+    return digest.hexdigest()
+
+
+def settings_fingerprint(view, court, image_url, fmt, width, height, scale):
+    """Hash of everything a rendered file depends on besides its shots"""
+    layout = court_layout(court, image_url)
+    digest = hashlib.sha1(pio.to_json(layout, validate=False).encode())
+    digest.update(
+        f"{view}:{fmt}:{width}x{height}@{scale}:{plotly.__version__}".encode()
+    )
+    return digest.hexdigest()
+
+
+def job_key(player_id, season, game_id, view):
+    return f"{player_id}:{season}:{game_id or ''}:{view}"
+
+
+def is_unchanged(manifest, out_dir, player_name, season, game_id, view, settings):
+    """
+    Whether a completed season's chart was already rendered with the same
+    settings. Their shots no longer change, so this needs no fetch; the
+    season in progress and latest-game charts are always fetched.
+    """
+    if game_id == LATEST_GAME or ShotChart.is_current_season(season):
+        return False
+    player_id = ShotChart.get_player_id(player_name)
+    if player_id is None:
+        return False
+    job = manifest["jobs"].get(job_key(player_id, season, game_id, view))
+    return (
+        job is not None
+        and job["settings"] == settings
+        and job["file"] in manifest["files"]
+        and os.path.exists(os.path.join(out_dir, job["file"]))
+    )
+
+
+def prepare_chart(player_name, season, game_id, view, court, image_url):
+    """
+    (file name without extension, figure) for one chart, or None if there are
+    no shots to draw. Fetches through the same caches as the web views.
+    """
+    player_id = ShotChart.get_player_id(player_name)
+    if player_id is None:
+        raise ValueError(unknown_player_message(player_name))
+
+    games = ShotChart.get_player_games(player_name, season) if game_id else []
+    if game_id == LATEST_GAME:
+        # Most recent first
+        if not games:
+            return None
+        game_id = games[0]["id"]
+
+    shots_df, _ = ShotChart.get_player_shots(player_name, season, game_id)
+    if shots_df.empty:
+        return None
+
+    figure = chart_figure(
+        shots_df,
+        chart_title(player_name, season, game_id, games),
+        view,
+        player_id,
+        season,
+        game_id,
+        court=court,
+        image_url=image_url,
+        webgl=False,
+    )
+    return chart_filename(player_name, season, game_id, games), figure
+
+
+def render_chart(figure, path, fmt, width, height, scale):
+    """Write one figure to a file; runs in an export worker process"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    if fmt == "html":
+        pio.write_html(figure, tmp_path, include_plotlyjs="cdn", validate=False)
+    else:
+        pio.write_image(
+            figure,
+            tmp_path,
+            format=fmt,
+            width=width,
+            height=height,
+            scale=scale,
+            validate=False,
+        )
+    os.replace(tmp_path, path)
+
+
+def load_manifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, MANIFEST)) as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, ValueError):
+        manifest = {}
+    if "files" not in manifest:
+        # Older manifests held only the file fingerprints
+        manifest = {"files": manifest, "jobs": {}}
+    return manifest
+
+
+def save_manifest(out_dir, manifest):
+    path = os.path.join(out_dir, MANIFEST)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def export_charts(
+    jobs,
+    out_dir,
+    fmt="png",
+    view="shots",
+    court="vector",
+    width=800,
+    height=700,
+    scale=2,
+    workers=4,
+    force=False,
+    log=print,
+):
+    """
+    Render (player_name, season, game_id) charts into out_dir. Data is
+    fetched on a thread pool and figures are rendered on a process pool, as
+    each image engine call is CPU bound. Charts whose figure is unchanged
+    since the last export are skipped unless force is set, completed seasons
+    without fetching their data again. Must run in an app context. Returns
+    (rendered, skipped, failed).
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format {fmt}")
+    if court not in COURT_STYLES:
+        raise ValueError(f"Unknown court style {court}")
+    if fmt != "html" and find_spec("kaleido") is None:
+        raise RuntimeError(f"{fmt} export needs the kaleido package")
+
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = load_manifest(out_dir)
+    image_url = (
+        court_image_uri(current_app.static_folder) if court == "raster" else None
+    )
+    settings = settings_fingerprint(view, court, image_url, fmt, width, height, scale)
+    rendered = skipped = failed = 0
+    if not force:
+        unchanged = [
+            job for job in jobs if is_unchanged(manifest, out_dir, *job, view, settings)
+        ]
+        skipped += len(unchanged)
+        jobs = [job for job in jobs if job not in unchanged]
+
+    # Spawned workers: forking would copy the fetch threads' locks mid-use
+    with ThreadPoolExecutor(
+        max_workers=current_app.config.get("UPSTREAM_MAX_CONCURRENCY", 4)
+    ) as fetchers, ProcessPoolExecutor(
+        max_workers=workers, mp_context=get_context("spawn")
+    ) as renderers:
+        prepared = {
+            fetchers.submit(prepare_chart, *job, view, court, image_url): job
+            for job in jobs
+        }
+        renders = {}
+        try:
+            # Rendering starts as soon as each chart's data is in
+            for future in as_completed(prepared):
+                player_name, season, game_id = prepared[future]
+                label = " ".join(filter(None, (player_name, season, game_id)))
+                try:
+                    chart = future.result()
+                except (UpstreamError, ValueError) as e:
+                    failed += 1
+                    log(f"{label}: {e}")
+                    continue
+                if chart is None:
+                    skipped += 1
+                    log(f"{label}: no shots, skipping")
+                    continue
+
+                name, figure = chart
+                filename = f"{name}.{fmt}"
+                path = os.path.join(out_dir, filename)
+                fingerprint = figure_fingerprint(figure, fmt, width, height, scale)
+                key = job_key(
+                    ShotChart.get_player_id(player_name), season, game_id, view
+                )
+                if (
+                    not force
+                    and manifest["files"].get(filename) == fingerprint
+                    and os.path.exists(path)
+                ):
+                    manifest["jobs"][key] = {"file": filename, "settings": settings}
+                    skipped += 1
+                    continue
+                future = renderers.submit(
+                    render_chart, figure, path, fmt, width, height, scale
+                )
+                renders[future] = (key, filename, fingerprint)
+
+            for future in as_completed(renders):
+                key, filename, fingerprint = renders[future]
+                try:
+                    future.result()
+                except Exception as e:
+                    failed += 1
+                    log(f"{filename}: {e}")
+                    continue
+                manifest["files"][filename] = fingerprint
+                manifest["jobs"][key] = {"file": filename, "settings": settings}
+                rendered += 1
+                log(f"Wrote {filename}")
+        finally:
+            # Keep what was rendered if the run is interrupted
+            save_manifest(out_dir, manifest)
+
+    return rendered, skipped, failed
+
+
+@click.command("export-charts")
+@click.argument("out_dir", type=click.Path(file_okay=False))
+@click.option("--player", "players", multiple=True, help="Player full name.")
+@click.option("--team", "team_names", multiple=True, help="Team abbreviation.")
+@click.option("--season", help="Season, e.g. 2023-24 (default: current).")
+@click.option("--game", "games", multiple=True, help="Game id, one chart per game.")
+@click.option("--latest-game", is_flag=True, help="Chart each player's latest game.")
+@click.option("--format", "fmt", type=click.Choice(FORMATS), default="png")
+@click.option("--view", type=click.Choice(["shots", "density"]), default="shots")
+@click.option("--court", type=click.Choice(COURT_STYLES), default="vector")
+@click.option("--width", default=800, show_default=True)
+@click.option("--height", default=700, show_default=True)
+@click.option("--scale", default=2.0, show_default=True)
+@click.option("--workers", default=4, show_default=True, help="Render processes.")
+@click.option("--force", is_flag=True, help="Re-render unchanged charts.")
+@with_appcontext
+def export_charts_command(
+    out_dir,
+    players,
+    team_names,
+    season,
+    games,
+    latest_game,
+    fmt,
+    view,
+    court,
+    width,
+    height,
+    scale,
+    workers,
+    force,
+):
+    """Render shot charts for players and team rosters to files in OUT_DIR."""
+    season = season or ShotChart.current_season()
+    names = list(players)
+    try:
+        for team in team_names:
+            names += team_roster(team, season)
+    except (UpstreamError, ValueError) as e:
+        raise click.ClickException(f"Could not load roster: {e}")
+    if not names:
+        raise click.UsageError("Give at least one --player or --team")
+
+    game_ids = list(games) or [LATEST_GAME if latest_game else None]
+    jobs = [
+        (name, season, game_id) for name in dict.fromkeys(names) for game_id in game_ids
+    ]
+    try:
+        rendered, skipped, failed = export_charts(
+            jobs,
+            out_dir,
+            fmt,
+            view,
+            court,
+            width,
+            height,
+            scale,
+            workers,
+            force,
+            log=click.echo,
+        )
+    except RuntimeError as e:
+        raise click.ClickException(str(e))
+
+    click.echo(f"{rendered} rendered, {skipped} skipped, {failed} failed")
+    if failed:
+        raise click.ClickException(f"{failed} charts failed")
+
+
+def init_app(app):
+    app.cli.add_command(export_charts_command)
@@ -0,0 +1,132 @@
+# app/ingest.py
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+import click
+from flask.cli import with_appcontext
+
+from .models import ShotChart
+from .store import shot_store
+from .transport import UpstreamError, transport
+
+
+def season_range(first_season, last_season):
+    """Every season string from first_season through last_season inclusive"""
+    first, last = int(first_season[:4]), int(last_season[:4])
+    return [f"{year}-{str(year + 1)[-2:]}" for year in range(first, last + 1)]
+
+
+def season_finished_at(season):
+    """Timestamp after which a season's regular season and playoffs are over"""
+    return datetime(int(season[:4]) + 1, 7, 1).timestamp()
+
+
+def season_player_ids(season):
+    """Ids of every player who logged a game in the season"""
+    from nba_api.stats.endpoints import leaguedashplayerstats
+
+    stats = transport.call(leaguedashplayerstats.LeagueDashPlayerStats, season=season)
+    return stats.get_data_frames()[0]["PLAYER_ID"].astype(int).tolist()
+
+
+def fetch_player_shots(player_id, season, since=None):
+    """ShotChartDetail for a player's season, from the YYYYMMDD date since onwards"""
+    from nba_api.stats.endpoints import shotchartdetail
+
+    date_from = f"{since[4:6]}/{since[6:8]}/{since[:4]}" if since else ""
+    shot_chart = transport.call(
+        shotchartdetail.ShotChartDetail,
+        team_id=0,
+        player_id=player_id,
+        season_nullable=season,
+        context_measure_simple="FGA",
+        date_from_nullable=date_from,
+    )
+    return shot_chart.get_data_frames()[0]
+
+
+def ingest_season(season, workers=4, full=False, log=print):
+    """
+    Pull every player's shots for a season into the shot store. Rate
+    limiting and retries come from the shared upstream transport.
+
+    Players already checkpointed after the season finished are skipped, so
+    an interrupted run resumes where it stopped. Other checkpointed players
+    are updated incrementally from their last stored game date. Returns
+    (players fetched, shots stored, failures).
+    """
+    progress = {} if full else shot_store.progress(season)
+    finished_at = season_finished_at(season)
+
+    player_ids = season_player_ids(season)
+    jobs = {}
+    for player_id in player_ids:
+        checkpoint = progress.get(player_id)
+        if checkpoint is not None:
+            last_game_date, updated_at = checkpoint
+            if updated_at >= finished_at:
+                continue
+            jobs[player_id] = last_game_date
+        else:
+            jobs[player_id] = None
+
+    log(f"{season}: {len(jobs)} of {len(player_ids)} players to fetch")
+    fetched = shots = failures = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(fetch_player_shots, player_id, season, since): player_id
+            for player_id, since in jobs.items()
+        }
+        # Results are written from this thread only, SQLite has a single writer
+        for future in as_completed(futures):
+            player_id = futures[future]
+            try:
+                shots_df = future.result()
+            except Exception as e:
+                failures += 1
+                log(f"{season}: player {player_id} failed: {e}")
+                continue
+
+            with shot_store.connect() as conn:
+                shot_store.save_player_season(conn, season, player_id, shots_df)
+            fetched += 1
+            shots += len(shots_df)
+
+    log(f"{season}: fetched {fetched} players, {shots} shots, {failures} failures")
+    return fetched, shots, failures
+
+
+@click.command("ingest-shots")
+@click.argument("first_season")
+@click.argument("last_season", required=False)
+@click.option("--workers", default=4, show_default=True, help="Concurrent fetches.")
+@click.option(
+    "--rate", default=1.0, show_default=True, help="Max upstream calls per second."
+)
+@click.option("--retries", default=4, show_default=True, help="Retries per player.")
+@click.option("--full", is_flag=True, help="Ignore checkpoints and refetch everything.")
+@with_appcontext
+def ingest_shots_command(first_season, last_season, workers, rate, retries, full):
+    """Ingest league-wide shots for FIRST_SEASON..LAST_SEASON into the shot store."""
+    # Evenly spaced calls rather than bursts, with patient backoff
+    transport.configure(rate=rate, burst=1, retries=retries, backoff=2.0)
+
+    total_failures = 0
+    for season in season_range(first_season, last_season or first_season):
+        if not ShotChart.is_data_available(season):
+            click.echo(f"{season}: no shot location data, skipping")
+            continue
+        try:
+            _, _, failures = ingest_season(season, workers, full, log=click.echo)
+        except UpstreamError as e:
+            raise click.ClickException(f"{season}: could not list players: {e}")
+        total_failures += failures
+
+    if total_failures:
+        raise click.ClickException(
+            f"{total_failures} players failed, rerun to resume from the checkpoint"
+        )
+
+
+def init_app(app):
+    app.cli.add_command(ingest_shots_command)
@@ -0,0 +1,165 @@
+# app/metrics.py
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+from flask import Response, g, has_request_context, request
+
+# Latency histogram bucket upper bounds in seconds
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Event counters besides cache lookups, exported as shotchart_<name>
+EVENT_COUNTERS = {
+    "singleflight_joins_total": (
+        "Fetches that reused another call's result instead of calling upstream, "
+        "by fetch and scope (worker or shared across workers)."
+    ),
+    "incremental_refresh_total": (
+        "Current-season refreshes by kind and result "
+        "(full season or delta since the last game)."
+    ),
+}
+
+
+def _labels(labels):
+    inner = ",".join(f'{name}="{value}"' for name, value in labels)
+    return f"{{{inner}}}" if inner else ""
+
+
+class Metrics:
+    """
+    In-process registry of stage latency histograms, cache counters and
+    event counters, exposed in the Prometheus text format at /metrics. Each
+    worker process keeps its own registry, so scrape every worker (or sum
+    across them).
+    """
+
+    def __init__(self):
+        self.server_timing = False
+        self._histograms = {}
+        self._counters = {}
+        self._events = {}
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.server_timing = app.config.get("SERVER_TIMING", False)
+        app.before_request(self._start_request)
+        app.after_request(self._finish_request)
+        app.add_url_rule("/metrics", "metrics", self.export)
+
+    def observe(self, stage, seconds):
+        with self._lock:
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = [[0] * len(BUCKETS), 0, 0.0]
+            counts = histogram[0]
+            index = bisect.bisect_left(BUCKETS, seconds)
+            if index < len(BUCKETS):
+                counts[index] += 1
+            histogram[1] += 1
+            histogram[2] += seconds
+
+    def count(self, cache, result):
+        """Count a cache lookup, e.g. count("shot_cache", "hit")"""
+        with self._lock:
+            key = (cache, result)
+            self._counters[key] = self._counters.get(key, 0) + 1
+
+    def increment(self, name, **labels):
+        """
+        Count an event on one of EVENT_COUNTERS, e.g.
+        increment("incremental_refresh_total", kind="shots", result="delta")
+        """
+        if name not in EVENT_COUNTERS:
+            raise ValueError(f"Unknown counter {name}")
+        with self._lock:
+            key = (name, tuple(sorted(labels.items())))
+            self._events[key] = self._events.get(key, 0) + 1
+
+    def record(self, stage, start):
+        """
+        Record the time since a time.perf_counter() start into the stage
+        histogram and the current request's Server-Timing
+        """
+        elapsed = time.perf_counter() - start
+        self.observe(stage, elapsed)
+        if has_request_context() and "timings" in g:
+            g.timings.append((stage, elapsed))
+
+    @contextmanager
+    def span(self, stage):
+        """Time a block as a stage"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, start)
+
+    def _start_request(self):
+        g.timings = []
+        g.request_started = time.perf_counter()
+
+    def _finish_request(self, response):
+        if "request_started" not in g:
+            return response
+        elapsed = time.perf_counter() - g.request_started
+        self.observe(f"request.{request.endpoint}", elapsed)
+
+        if self.server_timing:
+            # Repeated stages (e.g. several upstream calls) are summed
+            totals = {}
+            for stage, seconds in g.timings + [("total", elapsed)]:
+                totals[stage] = totals.get(stage, 0.0) + seconds
+            response.headers["Server-Timing"] = ", ".join(
+                f"{stage.replace('.', '-')};dur={seconds * 1000:.1f}"
+                for stage, seconds in totals.items()
+            )
+        return response
+
+    def export(self):
+        lines = [
+            "# HELP shotchart_stage_seconds Time spent per request stage.",
+            "# TYPE shotchart_stage_seconds histogram",
+        ]
+        with self._lock:
+            histograms = {
+                stage: (list(counts), total, seconds)
+                for stage, (counts, total, seconds) in self._histograms.items()
+            }
+            counters = dict(self._counters)
+            events = dict(self._events)
+
+        for stage, (counts, total, seconds) in sorted(histograms.items()):
+            cumulative = 0
+            for bound, count in zip(BUCKETS, counts):
+                cumulative += count
+                labels = _labels([("stage", stage), ("le", bound)])
+                lines.append(f"shotchart_stage_seconds_bucket{labels} {cumulative}")
+            labels = _labels([("stage", stage), ("le", "+Inf")])
+            lines.append(f"shotchart_stage_seconds_bucket{labels} {total}")
+            labels = _labels([("stage", stage)])
+            lines.append(f"shotchart_stage_seconds_sum{labels} {seconds:.6f}")
+            lines.append(f"shotchart_stage_seconds_count{labels} {total}")
+
+        lines += [
+            "# HELP shotchart_cache_lookups_total Cache lookups by cache and result.",
+            "# TYPE shotchart_cache_lookups_total counter",
+        ]
+        for (cache, result), count in sorted(counters.items()):
+            labels = _labels([("cache", cache), ("result", result)])
+            lines.append(f"shotchart_cache_lookups_total{labels} {count}")
+
+        for name, help_text in EVENT_COUNTERS.items():
+            lines += [
+                f"# HELP shotchart_{name} {help_text}",
+                f"# TYPE shotchart_{name} counter",
+            ]
+            for (event, labels), count in sorted(events.items()):
+                if event == name:
+                    lines.append(f"shotchart_{name}{_labels(labels)} {count}")
+
+        return Response("\n".join(lines) + "\n", mimetype="text/plain; version=0.0.4")
+
+
+metrics = Metrics()
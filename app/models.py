@@ -1,12 +1,64 @@
 # app/models.py
-from nba_api.stats.endpoints import shotchartdetail
-from nba_api.stats.static import players
+import numpy as np
 import pandas as pd
-from nba_api.stats.endpoints import commonplayerinfo
-from nba_api.stats.endpoints import playergamelog
-from nba_api.stats.endpoints import playerdashptshots
-from nba_api.stats.endpoints import playercareerstats  # Add this import
-from nba_api.stats.endpoints import leaguedashplayerstats  # Add this import
+from nba_api.stats.library.http import NBAStatsHTTP
+from datetime import date
+from .cache import shot_cache
+from .store import shot_store
+from .player_index import normalize_name, player_index
+from .stats import SHOT_TYPES, ZONES, minutes_played
+from .metrics import metrics
+from .refresh import season_refresh
+from .singleflight import single_flight
+from .transport import UpstreamError, transport
+
+# Compact schema for shot frames: only the columns charts and stats read,
+# with repeated strings as categoricals over fixed categories (so frames
+# from different seasons concatenate without falling back to object) and
+# numbers downcast to the smallest type that holds them.
+SHOT_SCHEMA = {
+    "GAME_ID": np.int32,
+    "LOC_X": np.int16,
+    "LOC_Y": np.int16,
+    "SHOT_DISTANCE": np.int16,
+    "SHOT_ZONE_BASIC": pd.CategoricalDtype(ZONES),
+    "SHOT_TYPE": pd.CategoricalDtype(SHOT_TYPES),
+    "SHOT_MADE_FLAG": bool,
+}
+
+
+def normalize_shots(shots_df):
+    """Project a ShotChartDetail frame onto SHOT_SCHEMA; idempotent"""
+    if shots_df.empty:
+        return pd.DataFrame(
+            {col: pd.Series(dtype=dtype) for col, dtype in SHOT_SCHEMA.items()}
+        )
+    return pd.DataFrame(
+        {
+            col: (
+                pd.to_numeric(shots_df[col]).astype(dtype)
+                if col == "GAME_ID"
+                else shots_df[col].astype(dtype)
+            )
+            for col, dtype in SHOT_SCHEMA.items()
+        }
+    )
+
+
+def player_flight(player_name, *args, **kwargs):
+    """
+    Single-flight key for fetches by player name: names that resolve to the
+    same player (case, accents, spacing) share one flight
+    """
+    return normalize_name(player_name), args, tuple(sorted(kwargs.items()))
+
+
+def init_app(app):
+    """Point nba_api at NBA_STATS_BASE_URL, e.g. a local stub server in tests"""
+    base_url = app.config.get("NBA_STATS_BASE_URL")
+    if base_url:
+        NBAStatsHTTP.base_url = base_url.rstrip("/") + "/{endpoint}"
+    transport.init_app(app)
 
 
 class ShotChart:
@@ -16,7 +68,10 @@ class ShotChart:
         "basic": "1983-84",  # Basic shot data without locations
     }
 
+    # Upstream fetches are single-flighted: concurrent requests for the same
+    # arguments share one call
     @staticmethod
+    @single_flight("shots", key=player_flight)
     def get_player_shots(player_name, season="2023-24", game_id=None):
         try:
             # Get basic stats if before shot tracking era
@@ -26,22 +81,66 @@ class ShotChart:
                     player_name, season, game_id
                 )
 
-            players_list = players.find_players_by_full_name(player_name)
-            if not players_list:
+            player_id = ShotChart.get_player_id(player_name)
+            if player_id is None:
                 raise ValueError(f"Player {player_name} not found")
 
-            player_dict = players_list[0]
-            player_id = player_dict["id"]
+            current = ShotChart.is_current_season(season)
+            stored = shot_store.has_player_season(player_id, season)
 
-            shot_chart = shotchartdetail.ShotChartDetail(
-                team_id=0,
-                player_id=player_id,
-                season_nullable=season,
-                context_measure_simple="FGA",
-                game_id_nullable=game_id,
-            )
-            return shot_chart.get_data_frames()[0], None
+            def from_store():
+                metrics.count("shot_store", "hit")
+                # GAME_DATE sets the incremental refresh's watermark
+                return shot_store.get_shots(
+                    player_id, season, game_id, columns=[*SHOT_SCHEMA, "GAME_DATE"]
+                )
+
+            # Completed seasons ingested into the local shot store never hit
+            # the API. The store is behind on the season in progress until the
+            # next ingest, so there it only seeds the incremental refresh.
+            if stored and not current:
+                return normalize_shots(from_store()), None
+
+            # Serve from the on-disk cache before touching the network
+            cached = shot_cache.get(player_id, season, game_id)
+            metrics.count("shot_cache", "miss" if cached is None else "hit")
+            if cached is not None:
+                return normalize_shots(cached), None
+
+            def fetch(date_from):
+                from nba_api.stats.endpoints import shotchartdetail
+
+                shot_chart = transport.call(
+                    shotchartdetail.ShotChartDetail,
+                    team_id=0,
+                    player_id=player_id,
+                    season_nullable=season,
+                    context_measure_simple="FGA",
+                    game_id_nullable=game_id,
+                    date_from_nullable=date_from,
+                )
+                return shot_chart.get_data_frames()[0]
+
+            if game_id is None and current:
+                # Only games since the last refresh, or since the last
+                # ingested game, are downloaded
+                shots_df = season_refresh.refresh(
+                    "shots",
+                    player_id,
+                    season,
+                    fetch,
+                    game_column="GAME_ID",
+                    prepare=normalize_shots,
+                    seed=from_store if stored else None,
+                )
+            else:
+                shots_df = normalize_shots(fetch(""))
+            shot_cache.set(player_id, season, game_id, shots_df)
+            return shots_df, None
 
+        except UpstreamError:
+            # Let callers tell an upstream outage apart from "no shots"
+            raise
         except Exception as e:
             print(f"Error getting shot chart: {e}")
             return (
@@ -50,18 +149,20 @@ class ShotChart:
             )  # Return empty DataFrame and no basic stats on error
 
     @staticmethod
+    @single_flight("basic_stats", key=player_flight)
     def get_basic_stats(player_name, season, game_id=None):
         """Get basic shooting stats without shot locations for older seasons"""
         try:
-            players_list = players.find_players_by_full_name(player_name)
-            if not players_list:
+            player_id = ShotChart.get_player_id(player_name)
+            if player_id is None:
                 return None
 
-            player_dict = players_list[0]
-            player_id = player_dict["id"]
-
             # Get career stats
-            career_stats = playercareerstats.PlayerCareerStats(player_id=player_id)
+            from nba_api.stats.endpoints import playercareerstats
+
+            career_stats = transport.call(
+                playercareerstats.PlayerCareerStats, player_id=player_id
+            )
             season_stats = career_stats.get_data_frames()[0]
 
             # Filter for requested season
@@ -84,6 +185,8 @@ class ShotChart:
 
             return stats
 
+        except UpstreamError:
+            raise
         except Exception as e:
             print(f"Error getting basic stats: {e}")
             return None
@@ -97,26 +200,46 @@ class ShotChart:
         except:
             return False
 
+    @staticmethod
+    def current_season(today=None):
+        """Season string (e.g. "2024-25") in progress on the given date"""
+        today = today or date.today()
+        # Seasons tip off in October, so earlier months belong to last year's
+        start_year = today.year if today.month >= 10 else today.year - 1
+        return f"{start_year}-{str(start_year + 1)[-2:]}"
+
+    @staticmethod
+    def is_current_season(season):
+        """Check if season may still gain new games"""
+        return season == ShotChart.current_season()
+
+    @staticmethod
+    def get_player_id(player_name):
+        """Resolve a player's full name to their NBA id through the shared index"""
+        return player_index.find_id(player_name)
+
     @staticmethod
     def get_active_players():
         try:
-            # Get all players from NBA API
-            all_players = players.get_players()
-            # Sort by name, include all players
-            return sorted(all_players, key=lambda x: x["full_name"])
+            # Pre-sorted once when the player index is built
+            return player_index.all_players()
         except Exception as e:
             print(f"Error fetching players: {e}")
             return []
 
     @staticmethod
+    @single_flight("seasons", key=player_flight)
     def get_player_seasons(player_name):
         try:
-            players_list = players.find_players_by_full_name(player_name)
-            if not players_list:
+            player_id = ShotChart.get_player_id(player_name)
+            if player_id is None:
                 return []
 
-            player_dict = players_list[0]
-            player_info = commonplayerinfo.CommonPlayerInfo(player_id=player_dict["id"])
+            from nba_api.stats.endpoints import commonplayerinfo
+
+            player_info = transport.call(
+                commonplayerinfo.CommonPlayerInfo, player_id=player_id
+            )
             headers = player_info.get_data_frames()[0]
 
             from_year = int(headers["FROM_YEAR"].iloc[0])
@@ -128,22 +251,55 @@ class ShotChart:
                 seasons.append(season)
 
             return list(reversed(seasons))  # Most recent first
+        except UpstreamError:
+            raise
         except Exception as e:
             print(f"Error getting player seasons: {e}")
             return []
 
     @staticmethod
-    def get_player_games(player_name, season):
+    @single_flight("game_log", key=player_flight)
+    def get_game_log(player_name, season):
+        """Fetch the raw PlayerGameLog frame for a player's season"""
         try:
-            players_list = players.find_players_by_full_name(player_name)
-            if not players_list:
-                return []
+            player_id = ShotChart.get_player_id(player_name)
+            if player_id is None:
+                return pd.DataFrame()
+
+            def fetch(date_from):
+                from nba_api.stats.endpoints import playergamelog
+
+                game_log = transport.call(
+                    playergamelog.PlayerGameLog,
+                    player_id=player_id,
+                    season=season,
+                    date_from_nullable=date_from,
+                )
+                return game_log.get_data_frames()[0]
+
+            if ShotChart.is_current_season(season):
+                # Most recent first, like the full game log
+                return season_refresh.refresh(
+                    "game_log",
+                    player_id,
+                    season,
+                    fetch,
+                    game_column="Game_ID",
+                    newest_first=True,
+                )
+            return fetch("")
 
-            player_dict = players_list[0]
-            game_log = playergamelog.PlayerGameLog(
-                player_id=player_dict["id"], season=season
-            )
-            games_df = game_log.get_data_frames()[0]
+        except UpstreamError:
+            raise
+        except Exception as e:
+            print(f"Error getting game log: {e}")
+            return pd.DataFrame()
+
+    @staticmethod
+    def get_player_games(player_name, season, games_df=None):
+        try:
+            if games_df is None:
+                games_df = ShotChart.get_game_log(player_name, season)
 
             # Format games for dropdown with points
             games = []
@@ -158,26 +314,20 @@ class ShotChart:
 
             return games
 
+        except UpstreamError:
+            raise
         except Exception as e:
             print(f"Error getting player games: {e}")
             return []
 
     @staticmethod
-    def get_player_free_throws(player_name, season, game_id=None):
+    def get_player_free_throws(player_name, season, game_id=None, games_df=None):
         try:
-            players_list = players.find_players_by_full_name(player_name)
-            if not players_list:
+            if games_df is None:
+                games_df = ShotChart.get_game_log(player_name, season)
+            if games_df.empty:
                 return 0, 0  # FTA, FTM
 
-            player_dict = players_list[0]
-            player_id = player_dict["id"]
-
-            # Get game log data
-            game_log = playergamelog.PlayerGameLog(
-                player_id=player_dict["id"], season=season
-            )
-            games_df = game_log.get_data_frames()[0]
-
             if game_id:
                 # Get specific game stats
                 game_stats = games_df[games_df["Game_ID"] == game_id]
@@ -188,40 +338,23 @@ class ShotChart:
                 # Get season totals
                 return games_df["FTA"].sum(), games_df["FTM"].sum()
 
+        except UpstreamError:
+            raise
         except Exception as e:
             print(f"Error getting free throws: {e}")
             return 0, 0
 
     @staticmethod
-    def get_player_minutes(player_name, season):
+    def get_player_minutes(player_name, season, games_df=None):
+        """Total minutes, games played and per-game minutes for a season"""
         try:
-            players_list = players.find_players_by_full_name(player_name)
-            if not players_list:
-                return 0
-
-            player_dict = players_list[0]
+            if games_df is None:
+                games_df = ShotChart.get_game_log(player_name, season)
 
-            # Get game log data
-            game_log = playergamelog.PlayerGameLog(
-                player_id=player_dict["id"], season=season
-            )
-            games_df = game_log.get_data_frames()[0]
-
-            # Convert minutes from "MM:SS" format to decimal minutes
-            total_minutes = 0
-            for min_str in games_df["MIN"]:
-                try:
-                    if ":" in str(min_str):
-                        mins, secs = map(int, str(min_str).split(":"))
-                        total_minutes += mins + (secs / 60)
-                    else:
-                        total_minutes += float(min_str)
-                except (ValueError, AttributeError):
-                    continue
-
-            print(f"Total minutes: {total_minutes}, Games played: {len(games_df)}")
-            return total_minutes, len(games_df)
+            return minutes_played(games_df)
 
+        except UpstreamError:
+            raise
         except Exception as e:
             print(f"Error getting player minutes: {e}")
-            return 0, 0
+            return 0, 0, np.zeros(0)
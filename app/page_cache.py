@@ -0,0 +1,189 @@
+# app/page_cache.py
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from functools import wraps
+
+from flask import current_app, g, make_response, request
+
+from .career import CAREER
+from .models import ShotChart
+from .metrics import metrics
+from .player_index import normalize_name
+from .transport import UpstreamError
+
+
+class PageEntry:
+    def __init__(self, body, mimetype, season, fresh_for):
+        self.body = body
+        self.mimetype = mimetype
+        self.created = time.time()
+        self.expires = self.created + fresh_for
+        self.last_modified = datetime.fromtimestamp(self.created, timezone.utc)
+        self.etag = hashlib.sha1(body).hexdigest()
+        self.season = season
+
+
+class PageCache:
+    """
+    In-memory cache of rendered shot chart pages keyed by the normalized
+    (player, season, game, per36, view, career range) query.
+
+    Fresh entries are served directly. Once an entry goes stale it is still
+    served for up to stale_ttl seconds while a background thread re-renders
+    it (stale-while-revalidate); past that window an expired entry is still
+    served if re-rendering fails upstream. Responses carry ETag/Last-Modified
+    so browsers can revalidate with a 304.
+    """
+
+    def __init__(self, max_entries=256, ttl=300, historical_ttl=86400, stale_ttl=3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.historical_ttl = historical_ttl
+        self.stale_ttl = stale_ttl
+        self._entries = OrderedDict()
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.max_entries = app.config.get("PAGE_CACHE_MAX_ENTRIES", self.max_entries)
+        self.ttl = app.config.get("PAGE_CACHE_TTL", self.ttl)
+        self.historical_ttl = app.config.get(
+            "PAGE_CACHE_HISTORICAL_TTL", self.historical_ttl
+        )
+        self.stale_ttl = app.config.get("PAGE_CACHE_STALE_TTL", self.stale_ttl)
+
+    @property
+    def enabled(self):
+        return self.max_entries > 0
+
+    @staticmethod
+    def make_key(args):
+        return (
+            normalize_name(args.get("player", "Stephen Curry")),
+            args.get("season", "2015-16"),
+            args.get("game") or None,
+            args.get("per36") == "on",
+            args.get("view", "shots"),
+            args.get("from") or None,
+            args.get("to") or None,
+        )
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def _put(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _render(self, view, args, kwargs):
+        """Run the view and build an entry, or None if the page shouldn't be cached"""
+        response = make_response(view(*args, **kwargs))
+        if response.status_code != 200 or g.get("skip_page_cache"):
+            return response, None
+
+        season = request.args.get("season", "2015-16")
+        # Career pages may include the season in progress
+        live = season == CAREER or ShotChart.is_current_season(season)
+        fresh_for = self.ttl if live else self.historical_ttl
+        entry = PageEntry(response.get_data(), response.mimetype, season, fresh_for)
+        return response, entry
+
+    def _refresh(self, app, key, path, query, view, args, kwargs):
+        try:
+            with app.test_request_context(path, query_string=query):
+                _, entry = self._render(view, args, kwargs)
+                if entry is not None:
+                    self._put(key, entry)
+        except Exception:
+            # Nobody waits on this thread, so the traceback must reach the log
+            app.logger.exception("Error refreshing cached page %s", path)
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _schedule_refresh(self, key, view, args, kwargs):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        threading.Thread(
+            target=self._refresh,
+            args=(
+                current_app._get_current_object(),
+                key,
+                request.path,
+                # Multi-valued, decoded args: the raw query string is bytes,
+                # which test_request_context rejects
+                request.args.to_dict(flat=False),
+                view,
+                args,
+                kwargs,
+            ),
+            daemon=True,
+        ).start()
+
+    def _respond(self, entry, status):
+        metrics.count("page_cache", status.lower())
+        now = time.time()
+        response = make_response(entry.body)
+        response.mimetype = entry.mimetype
+        response.set_etag(entry.etag)
+        response.last_modified = entry.last_modified
+        response.headers["Cache-Control"] = (
+            f"public, max-age={max(int(entry.expires - now), 0)}, "
+            f"stale-while-revalidate={self.stale_ttl}"
+        )
+        response.headers["X-Page-Cache"] = status
+        return response.make_conditional(request)
+
+    def cached(self, view):
+        """Decorator putting the stale-while-revalidate cache in front of a view"""
+
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not self.enabled:
+                return view(*args, **kwargs)
+
+            key = self.make_key(request.args)
+            entry = self._get(key)
+            now = time.time()
+
+            if entry is not None and now < entry.expires:
+                return self._respond(entry, "HIT")
+
+            if entry is not None and now < entry.expires + self.stale_ttl:
+                self._schedule_refresh(key, view, args, kwargs)
+                return self._respond(entry, "STALE")
+
+            try:
+                response, fresh = self._render(view, args, kwargs)
+            except UpstreamError:
+                # Serve the last good page, however old, over an error page
+                if entry is None:
+                    raise
+                return self._respond(entry, "STALE")
+            if fresh is None:
+                metrics.count("page_cache", "uncacheable")
+                return response
+            self._put(key, fresh)
+            return self._respond(fresh, "MISS")
+
+        return wrapper
+
+
+page_cache = PageCache()
@@ -0,0 +1,151 @@
+# app/player_index.py
+import threading
+import unicodedata
+from bisect import bisect_left
+from collections import Counter
+
+from nba_api.stats.static import players
+
+
+def normalize_name(name):
+    """Lowercase and strip accents so "Nikola Jokić" matches "nikola jokic" """
+    decomposed = unicodedata.normalize("NFKD", str(name))
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(stripped.lower().split())
+
+
+def _trigrams(text):
+    padded = f"  {text} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class PlayerIndex:
+    """
+    In-memory lookup structures over the static NBA player list.
+
+    Built once per process: exact name->id and id->record dicts for O(1)
+    resolution, a sorted token list for prefix search and a trigram index
+    for fuzzy search.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loaded = False
+        self.by_name = {}
+        self.by_id = {}
+        self.sorted_players = []
+        self._tokens = []
+        self._trigrams = {}
+
+    def load(self, records=None):
+        """Build the index, from the nba_api static list unless records given"""
+        with self._lock:
+            if self._loaded and records is None:
+                return self
+
+            records = records if records is not None else players.get_players()
+            by_name, by_id, trigrams, tokens = {}, {}, {}, []
+            for record in records:
+                name = normalize_name(record["full_name"])
+                # Keep the first record for duplicate names, as the old
+                # players_list[0] lookup did
+                by_name.setdefault(name, record["id"])
+                by_id[record["id"]] = record
+                for token in {name, *name.split()}:
+                    tokens.append((token, record["id"]))
+                for gram in _trigrams(name):
+                    trigrams.setdefault(gram, set()).add(record["id"])
+
+            self.by_name = by_name
+            self.by_id = by_id
+            self.sorted_players = sorted(by_id.values(), key=lambda x: x["full_name"])
+            self._tokens = sorted(tokens)
+            self._trigrams = trigrams
+            self._loaded = True
+        return self
+
+    def _ensure_loaded(self):
+        if not self._loaded:
+            self.load()
+
+    def find_id(self, player_name):
+        """
+        Resolve a full name to a player id, ignoring case and accents. Near
+        misses resolve to None rather than to some other player; use
+        suggest() to offer the close matches instead.
+        """
+        self._ensure_loaded()
+        return self.by_name.get(normalize_name(player_name))
+
+    def suggest(self, player_name, limit=3):
+        """Full names of the players closest to a name that did not resolve"""
+        if not normalize_name(player_name):
+            return []
+        return [player["full_name"] for player in self.search(player_name, limit)]
+
+    def get(self, player_id):
+        self._ensure_loaded()
+        return self.by_id.get(player_id)
+
+    def all_players(self):
+        """All players sorted by full name"""
+        self._ensure_loaded()
+        return self.sorted_players
+
+    def _prefix_ids(self, prefix):
+        ids = []
+        start = bisect_left(self._tokens, (prefix,))
+        for token, player_id in self._tokens[start:]:
+            if not token.startswith(prefix):
+                break
+            ids.append(player_id)
+        return ids
+
+    def search(self, query, limit=None):
+        """
+        Players matching query, prefix matches on the full name or any name
+        token first, then fuzzy trigram matches
+        """
+        self._ensure_loaded()
+        query = normalize_name(query)
+        if not query:
+            return self.sorted_players[:limit] if limit else self.sorted_players
+
+        ranked = {}
+        if query in self.by_name:
+            ranked[self.by_name[query]] = 3.0
+        for player_id in self._prefix_ids(query):
+            ranked.setdefault(player_id, 2.0)
+
+        # Trigram overlap ranks typos and partial names after prefix hits
+        grams = _trigrams(query)
+        counts = Counter()
+        for gram in grams:
+            counts.update(self._trigrams.get(gram, ()))
+        for player_id, shared in counts.items():
+            score = shared / len(grams)
+            if score >= 0.5:
+                ranked.setdefault(player_id, score)
+
+        results = sorted(
+            ranked,
+            key=lambda player_id: (
+                -ranked[player_id],
+                self.by_id[player_id]["full_name"],
+            ),
+        )
+        if limit:
+            results = results[:limit]
+        return [self.by_id[player_id] for player_id in results]
+
+
+player_index = PlayerIndex()
+
+
+def unknown_player_message(player_name):
+    """Error text for a name that did not resolve, with any close matches"""
+    message = f"Player {player_name} not found."
+    suggestions = player_index.suggest(player_name)
+    if suggestions:
+        message += f" Did you mean {', '.join(suggestions)}?"
+    return message
@@ -0,0 +1,101 @@
+# app/refresh.py
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from .metrics import metrics
+
+
+def last_game_date(dates):
+    """
+    Latest date in a PlayerGameLog ("OCT 27, 2015") or ShotChartDetail
+    ("20151027") date column, or None if there are none
+    """
+    if len(dates) == 0:
+        return None
+    return pd.to_datetime(dates, format="mixed").max()
+
+
+class IncrementalRefresh:
+    """
+    Current-season frames held per (kind, player, season) together with a
+    watermark: the date of the last game they contain. A refresh asks the
+    endpoint only for games on or after the watermark and swaps those games
+    in, so one new game costs a one-game transfer rather than the season.
+    The watermark day itself is refetched in case a game was still live.
+    """
+
+    def __init__(self, enabled=True, max_entries=512):
+        self.enabled = enabled
+        self.max_entries = max_entries
+        self._held = OrderedDict()
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.enabled = app.config.get("INCREMENTAL_REFRESH", self.enabled)
+
+    def _get(self, key):
+        with self._lock:
+            held = self._held.get(key)
+            if held is not None:
+                self._held.move_to_end(key)
+            return held
+
+    def _put(self, key, held):
+        with self._lock:
+            self._held[key] = held
+            self._held.move_to_end(key)
+            while len(self._held) > self.max_entries:
+                self._held.popitem(last=False)
+
+    def refresh(
+        self,
+        kind,
+        player_id,
+        season,
+        fetch,
+        game_column,
+        date_column="GAME_DATE",
+        prepare=None,
+        newest_first=False,
+        seed=None,
+    ):
+        """
+        Frame for a player's season, fetched through fetch(date_from) where
+        date_from is "" for the whole season or an MM/DD/YYYY date. prepare
+        is applied to every fetched frame, after its dates were read. seed()
+        may return a frame held elsewhere (e.g. the shot store) to refresh
+        from when nothing is held yet.
+        """
+        prepare = prepare or (lambda frame: frame)
+        key = (kind, player_id, season)
+        held = self._get(key) if self.enabled else None
+
+        if held is None and seed is not None:
+            raw = seed()
+            if not raw.empty:
+                held = prepare(raw), last_game_date(raw[date_column])
+
+        if held is None:
+            metrics.increment("incremental_refresh_total", kind=kind, result="full")
+            raw = fetch("")
+            frame, watermark = prepare(raw), last_game_date(raw[date_column])
+        else:
+            metrics.increment("incremental_refresh_total", kind=kind, result="delta")
+            frame, watermark = held
+            raw = fetch(f"{watermark:%m/%d/%Y}")
+            if not raw.empty:
+                delta = prepare(raw)
+                kept = frame[~frame[game_column].isin(delta[game_column])]
+                parts = [delta, kept] if newest_first else [kept, delta]
+                frame = pd.concat(parts, ignore_index=True)
+                watermark = max(watermark, last_game_date(raw[date_column]))
+
+        # Nothing to measure a delta from until a game has been played
+        if self.enabled and watermark is not None:
+            self._put(key, (frame, watermark))
+        return frame
+
+
+season_refresh = IncrementalRefresh()
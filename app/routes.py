@@ -1,42 +1,595 @@
 # app/routes.py
-from flask import Blueprint, render_template, request, jsonify, url_for
+from flask import (
+    Blueprint,
+    g,
+    jsonify,
+    current_app,
+    make_response,
+    render_template,
+    request,
+    url_for,
+)
 from .models import ShotChart
-from .utils import draw_court  # Add this import
-import plotly.express as px
+from .context import get_request_data
+from .page_cache import page_cache
+from .player_index import player_index, unknown_player_message
+from .assets import plotlyjs_url
+from .stats import (
+    add_free_throws,
+    compute_shot_stats,
+    format_shot_stats,
+    shooting_totals,
+)
+from .utils import COURT_IMAGE, court_figure
+from .density import BIN_COLUMNS, density_columns, shot_density
+from .career import CAREER, career_aggregator, season_window
+from .compare import LAYOUTS, MAX_PLAYERS, Comparison, fetch_players
+from .baselines import league_baselines
+from .transport import UpstreamError
+from .metrics import metrics
+import plotly.graph_objects as go
+import plotly.io as pio
+import numpy as np
 import pandas as pd
+import re
+import time
+from datetime import datetime
 
 main = Blueprint("main", __name__)
 
+PLAYERS_PER_PAGE = 30
+
+# Anything but letters, digits, dots, dashes and underscores in file names
+UNSAFE_FILENAME_CHARS = re.compile(r"[^\w.-]+")
+
+
+def render_plot(fig, config=None, div_id="shot-chart", include_plotlyjs=True):
+    """
+    Render a figure as a div that loads the shared, cached plotly.js bundle.
+    Pages with several charts include the bundle with the first one only.
+    """
+    with metrics.span("to_html"):
+        # Figure dicts are built from validated parts, skip revalidating them
+        return pio.to_html(
+            fig,
+            validate=False,
+            full_html=False,
+            include_plotlyjs=plotlyjs_url() if include_plotlyjs else False,
+            config=config,
+            div_id=div_id,
+        )
+
+
+def render_page(template="index.html", **context):
+    """Render a page template as a timed stage"""
+    with metrics.span("template"):
+        return render_template(template, **context)
+
+
+def cacheable_json(payload, season):
+    """JSON response with an ETag, cached briefly while the season is in progress"""
+    response = jsonify(payload)
+    response.cache_control.public = True
+    response.cache_control.max_age = (
+        60 if ShotChart.is_current_season(season) else 24 * 60 * 60
+    )
+    response.add_etag()
+    return response.make_conditional(request)
+
+
+def chart_title(player_name, season, game_id, available_games):
+    title = f"{player_name}'s Shot Chart ({season})"
+    if game_id:
+        game = next((g for g in available_games if g["id"] == game_id), None)
+        if game:
+            title += f" - {game['display']}"
+    return title
+
+
+def chart_filename(player_name, season, game_id, available_games):
+    """
+    Download name for a chart, without extension. A game is named by its
+    ISO date, or its id if the date is unknown.
+    """
+    filename = f"{UNSAFE_FILENAME_CHARS.sub('_', player_name)}_{season}"
+    if game_id:
+        game = next((g for g in available_games if g["id"] == game_id), None)
+        try:
+            # Game logs date games as "NOV 12, 2015"
+            filename += f"_{datetime.strptime(game['date'], '%b %d, %Y'):%Y-%m-%d}"
+        except (TypeError, ValueError):
+            filename += f"_{game_id}"
+    return filename + "_shot_chart"
+
+
+def chart_figure(
+    shots_df,
+    title,
+    view,
+    player_id,
+    season,
+    game_id,
+    court="raster",
+    image_url=None,
+    webgl=True,
+):
+    """
+    Shot chart figure dict for a player's shots (or their density bins) on
+    the shared court layout, as the page and static exports draw it. Static
+    exports pass webgl=False so large charts stay vector in SVG output.
+    """
+    if view == "density":
+        # Only per-cell aggregates are sent, however many shots there are
+        with metrics.span("density"):
+            bins = shot_density(shots_df, player_id, season, game_id)
+        traces = [density_trace(bins).to_plotly_json()]
+    else:
+        traces = shot_traces(shots_df, webgl)
+
+    # The court layout is built once per process, only the traces are new
+    return court_figure(
+        traces,
+        court=court,
+        image_url=image_url,
+        title={"text": title},
+        showlegend=view != "density",
+    )
+
+
+def shot_columns(shots_df):
+    """Columnar shot payload, with zones sent as codes into a zone name list"""
+    if shots_df.empty:
+        return {"LOC_X": [], "LOC_Y": [], "made": [], "distance": [], "zone": []}, []
+
+    zones = shots_df["SHOT_ZONE_BASIC"].astype("category")
+    columns = {
+        "LOC_X": shots_df["LOC_X"].tolist(),
+        "LOC_Y": shots_df["LOC_Y"].tolist(),
+        "made": shots_df["SHOT_MADE_FLAG"].astype(int).tolist(),
+        "distance": shots_df["SHOT_DISTANCE"].tolist(),
+        "zone": zones.cat.codes.tolist(),
+    }
+    return columns, zones.cat.categories.tolist()
+
+
+def build_basic_stats(basic_stats):
+    """Stats table and summary totals from season totals (pre-1996 seasons)"""
+    # Create basic stats table
+    stats_data = {
+        "Zone": ["2PT Field Goals", "3PT Field Goals", "Free Throws"],
+        "Made": [basic_stats["fg2m"], basic_stats["fg3m"], basic_stats["ftm"]],
+        "Attempts": [basic_stats["fg2a"], basic_stats["fg3a"], basic_stats["fta"]],
+        "FG%": [
+            (
+                f"{(basic_stats['fg2m']/basic_stats['fg2a']*100):.1f}"
+                if basic_stats["fg2a"] > 0
+                else "0.0"
+            ),
+            (
+                f"{(basic_stats['fg3m']/basic_stats['fg3a']*100):.1f}"
+                if basic_stats["fg3a"] > 0
+                else "0.0"
+            ),
+            (
+                f"{(basic_stats['ftm']/basic_stats['fta']*100):.1f}"
+                if basic_stats["fta"] > 0
+                else "0.0"
+            ),
+        ],
+    }
+    zone_stats = pd.DataFrame(stats_data)
+
+    # Calculate totals for pre-1996 seasons
+    total_shots = basic_stats["fg2a"] + basic_stats["fg3a"]
+    total_points = (
+        (basic_stats["fg2m"] * 2) + (basic_stats["fg3m"] * 3) + basic_stats["ftm"]
+    )
+    ts_percent = (
+        (total_points / (2 * (total_shots + 0.44 * basic_stats["fta"]))) * 100
+        if (total_shots + basic_stats["fta"]) > 0
+        else 0
+    )
+
+    return zone_stats, {
+        "ts_percent": f"{ts_percent:.1f}",
+        "total_points": int(total_points),
+        "total_shots": int(total_shots),
+    }
+
+
+def build_shot_stats(data, player_name, season, game_id, shots_df, per36=False):
+    """Zone, 2PT/3PT and free throw table plus summary totals for a shot frame"""
+    with metrics.span("stats"):
+        return _build_shot_stats(data, player_name, season, game_id, shots_df, per36)
+
+
+def _build_shot_stats(data, player_name, season, game_id, shots_df, per36):
+    # Get number of games for per-game calculations
+    num_games = shots_df["GAME_ID"].nunique() if not game_id else 1
+
+    # Get minutes played data when showing season stats
+    minutes_per_game = 0
+    if not game_id:
+        total_minutes, games_played, _ = data.player_minutes(player_name, season)
+        minutes_per_game = total_minutes / games_played if games_played > 0 else 0
+
+    # Calculate per 36 multiplier
+    per36_multiplier = 36 / minutes_per_game if minutes_per_game > 0 else 0
+
+    stats = compute_shot_stats(shots_df, num_games, per36_multiplier)
+
+    # Get free throw data
+    fta, ftm = data.player_free_throws(player_name, season, game_id)
+    stats = add_free_throws(stats, ftm, fta, num_games)
+    stats = league_baselines.compare(stats, season)
+
+    # Only show per36 stats if toggle is on and we have valid minutes data
+    zone_stats = format_shot_stats(
+        stats, per_game=not game_id, per36=per36 and minutes_per_game > 0
+    )
+    return zone_stats, shooting_totals(stats)
+
+
+def career_label(career_shots):
+    """Season span of a career aggregate, e.g. 2009-10 to 2015-16"""
+    seasons = career_shots.seasons
+    return seasons[0] if len(seasons) == 1 else f"{seasons[0]} to {seasons[-1]}"
+
+
+def shot_traces(shots_df, webgl=True, player_name=None, player_color=None):
+    """
+    Made and missed marker traces, drawn as the page's shotTrace draws them.
+    Comparisons name the player and give both traces the player's colour,
+    leaving the marker symbol to tell made from missed.
+    """
+    made = shots_df["SHOT_MADE_FLAG"].to_numpy(dtype=bool)
+    trace_type = "scattergl" if webgl and len(shots_df) > 1000 else "scatter"
+    traces = []
+    for flag, label, symbol, color in (
+        (True, "Made", "circle", "#2ecc71"),
+        (False, "Missed", "x", "#e74c3c"),
+    ):
+        rows = made == flag
+        hover = f"%{{customdata}}ft - {label}"
+        trace = dict(
+            type=trace_type,
+            mode="markers",
+            name=label,
+            x=shots_df["LOC_X"].to_numpy()[rows],
+            y=shots_df["LOC_Y"].to_numpy()[rows],
+            customdata=shots_df["SHOT_DISTANCE"].to_numpy()[rows],
+            hovertemplate=f"{hover}<extra></extra>",
+            marker=dict(
+                symbol=symbol,
+                size=10,
+                color=player_color or color,
+                line=dict(width=1, color="white"),
+            ),
+        )
+        if player_name:
+            trace.update(
+                name=f"{player_name} - {label}",
+                legendgroup=player_name,
+                hovertemplate=f"{player_name}: {hover}<extra></extra>",
+            )
+        traces.append(trace)
+    return traces
+
+
+def density_trace(bins):
+    """
+    Hexagon markers sized by attempts and coloured by FG%, relative to the
+    league when league bins are available
+    """
+    relative = bins["Diff"].notna().any()
+    sizes = 4 + 26 * np.sqrt(bins["Attempts"] / bins["Attempts"].max())
+    hover = (
+        bins["Made"].astype(str)
+        + "/"
+        + bins["Attempts"].astype(str)
+        + " ("
+        + bins["FGPercent"].map("{:.1f}%".format)
+        + ")"
+    )
+    if relative:
+        hover = hover + bins["Diff"].map(
+            lambda d: "" if pd.isna(d) else f" {d:+.1f} vs league"
+        )
+
+    return go.Scatter(
+        x=bins["X"],
+        y=bins["Y"],
+        mode="markers",
+        name="Shot Density",
+        text=hover,
+        hovertemplate="%{text}<extra></extra>",
+        marker=dict(
+            symbol="hexagon",
+            size=sizes,
+            color=bins["Diff"].fillna(0) if relative else bins["FGPercent"],
+            colorscale="RdYlGn",
+            cmin=-15 if relative else 20,
+            cmax=15 if relative else 70,
+            colorbar=dict(title="FG% vs League" if relative else "FG%"),
+            line=dict(width=0),
+        ),
+    )
+
+
+def stats_table_html(zone_stats):
+    """Render a stats table, highlighting the 2PT/3PT summary rows"""
+    return zone_stats.to_html(
+        classes="stats-table",
+        index=False,
+        escape=False,
+        formatters={
+            "Zone": lambda x: (
+                x
+                if "Field Goals" not in x
+                else f'<span class="field-goal-type">{x}</span>'
+            ),
+            "Made": lambda x: str(x),
+            "Attempts": lambda x: str(x),
+            "FG%": lambda x: str(x),
+            "vs League": lambda x: str(x),
+        },
+    )
+
+
+@main.errorhandler(UpstreamError)
+def upstream_unavailable(error):
+    """503 with Retry-After, so an upstream outage never renders as no data"""
+    current_app.logger.warning("Error reaching stats.nba.com: %s", error)
+    message = "NBA stats are temporarily unavailable, please try again shortly."
+    if request.endpoint == "main.compare":
+        response = make_response(
+            render_page(
+                "compare.html",
+                players=request.args.getlist("player")[:MAX_PLAYERS],
+                seasons=[],
+                selected_season=request.args.get("season", "2015-16"),
+                layout=request.args.get("layout", "overlay"),
+                per36=request.args.get("per36") == "on",
+                max_players=MAX_PLAYERS,
+                plots=[],
+                error_message=message,
+            )
+        )
+    elif request.endpoint != "main.home":
+        response = jsonify({"error": message})
+    else:
+        player_name = request.args.get("player", "Stephen Curry")
+        response = make_response(
+            render_page(
+                plot="",
+                stats="<p>No statistics available</p>",
+                selected_player=player_name,
+                selected_player_id=player_index.find_id(player_name),
+                view="shots",
+                seasons=[],
+                selected_season=request.args.get("season", "2015-16"),
+                games=[],
+                selected_game=None,
+                error_message=message,
+            )
+        )
+    response.status_code = 503
+    response.headers["Retry-After"] = str(int(error.retry_after or 30))
+    return response
+
+
+@main.route("/api/players")
+def search_players():
+    """Paginated player search in the shape Select2's AJAX mode expects"""
+    query = request.args.get("q", "")
+    page = max(request.args.get("page", 1, type=int), 1)
+
+    matches = player_index.search(query)
+    start = (page - 1) * PLAYERS_PER_PAGE
+    results = [
+        {
+            "id": player["full_name"],
+            "text": player["full_name"],
+            "player_id": player["id"],
+        }
+        for player in matches[start : start + PLAYERS_PER_PAGE]
+    ]
+    return jsonify(
+        {
+            "results": results,
+            "pagination": {"more": start + PLAYERS_PER_PAGE < len(matches)},
+        }
+    )
+
 
 @main.route("/get_seasons/<player_name>")
 def get_seasons(player_name):
-    seasons = ShotChart.get_player_seasons(player_name)
+    seasons = get_request_data().player_seasons(player_name)
     return jsonify({"seasons": seasons})
 
 
 @main.route("/get_games/<player_name>/<season>")
 def get_games(player_name, season):
-    games = ShotChart.get_player_games(player_name, season)
+    games = get_request_data().player_games(player_name, season)
     return jsonify({"games": games})
 
 
+@main.route("/api/shots/<int:player_id>/<season>")
+def api_shots(player_id, season):
+    player = player_index.get(player_id)
+    if player is None:
+        return jsonify({"error": f"Player {player_id} not found"}), 404
+
+    game_id = request.args.get("game") or None
+    data = get_request_data()
+    data.prefetch(
+        (data.game_log, player["full_name"], season),
+        (data.player_shots, player["full_name"], season, game_id),
+    )
+    shots_df, _ = data.player_shots(player["full_name"], season, game_id)
+    available_games = data.player_games(player["full_name"], season)
+
+    columns, zones = shot_columns(shots_df)
+    return cacheable_json(
+        {
+            "player_id": player_id,
+            "season": season,
+            "game_id": game_id,
+            "title": chart_title(player["full_name"], season, game_id, available_games),
+            "columns": columns,
+            "zones": zones,
+        },
+        season,
+    )
+
+
+@main.route("/api/stats/<int:player_id>/<season>")
+def api_stats(player_id, season):
+    player = player_index.get(player_id)
+    if player is None:
+        return jsonify({"error": f"Player {player_id} not found"}), 404
+
+    game_id = request.args.get("game") or None
+    per36 = request.args.get("per36") == "on"
+    data = get_request_data()
+    data.prefetch(
+        (data.game_log, player["full_name"], season),
+        (data.player_shots, player["full_name"], season, game_id),
+    )
+    shots_df, basic_stats = data.player_shots(player["full_name"], season, game_id)
+
+    if shots_df.empty and basic_stats:
+        zone_stats, totals = build_basic_stats(basic_stats)
+    elif shots_df.empty:
+        zone_stats, totals = pd.DataFrame(), {}
+    else:
+        zone_stats, totals = build_shot_stats(
+            data, player["full_name"], season, game_id, shots_df, per36
+        )
+
+    return cacheable_json(
+        {"rows": zone_stats.to_dict(orient="records"), **totals}, season
+    )
+
+
+@main.route("/api/density/<int:player_id>/<season>")
+def api_density(player_id, season):
+    player = player_index.get(player_id)
+    if player is None:
+        return jsonify({"error": f"Player {player_id} not found"}), 404
+
+    game_id = request.args.get("game") or None
+    data = get_request_data()
+    data.prefetch(
+        (data.game_log, player["full_name"], season),
+        (data.player_shots, player["full_name"], season, game_id),
+    )
+    shots_df, _ = data.player_shots(player["full_name"], season, game_id)
+    available_games = data.player_games(player["full_name"], season)
+
+    with metrics.span("density"):
+        bins = (
+            shot_density(shots_df, player_id, season, game_id)
+            if not shots_df.empty
+            else pd.DataFrame(columns=BIN_COLUMNS)
+        )
+    return cacheable_json(
+        {
+            "player_id": player_id,
+            "season": season,
+            "game_id": game_id,
+            "title": chart_title(player["full_name"], season, game_id, available_games),
+            "bins": density_columns(bins),
+        },
+        season,
+    )
+
+
+@main.route("/api/career/<int:player_id>")
+def api_career(player_id):
+    player = player_index.get(player_id)
+    if player is None:
+        return jsonify({"error": f"Player {player_id} not found"}), 404
+
+    per36 = request.args.get("per36") == "on"
+    data = get_request_data()
+    seasons = season_window(
+        data.player_seasons(player["full_name"]),
+        request.args.get("from"),
+        request.args.get("to"),
+    )
+    career_shots = career_aggregator.aggregate(
+        data, player["full_name"], player_id, seasons
+    )
+    if not career_shots.partials:
+        return jsonify({"error": "No shot data available for these seasons"}), 404
+
+    columns, zones = shot_columns(career_shots.shots)
+    zone_stats, totals = career_shots.zone_stats(per36)
+    return cacheable_json(
+        {
+            "player_id": player_id,
+            "seasons": career_shots.season_rows(),
+            "title": f"{player['full_name']}'s Shot Chart "
+            f"(Career {career_label(career_shots)})",
+            "zones": zones,
+            "columns": columns,
+            "rows": zone_stats.to_dict(orient="records"),
+            **totals,
+        },
+        career_shots.seasons[-1],
+    )
+
+
 @main.route("/")
+@page_cache.cached
 def home():
     player_name = request.args.get("player", "Stephen Curry")
     season = request.args.get("season", "2015-16")
     game_id = request.args.get("game", None)
+    view = request.args.get("view", "shots")
+    data = get_request_data()
+    player_id = ShotChart.get_player_id(player_name)
+    if player_id is not None:
+        # The page cache keys on the normalized name, so render the canonical
+        # one rather than whichever casing was cached first
+        player_name = player_index.get(player_id)["full_name"]
+    career = season == CAREER
+
+    if career:
+        # Career charts merge per-season partials; density bins are per season
+        game_id, view = None, "shots"
+        available_seasons = data.player_seasons(player_name)
+        available_games = []
+        career_shots = career_aggregator.aggregate(
+            data,
+            player_name,
+            player_id,
+            season_window(
+                available_seasons, request.args.get("from"), request.args.get("to")
+            ),
+        )
+        shots_df, basic_stats = career_shots.shots, None
+    else:
+        # The upstream endpoints are independent, so fetch them in parallel
+        data.prefetch(
+            (data.player_seasons, player_name),
+            (data.game_log, player_name, season),
+            (data.player_shots, player_name, season, game_id),
+        )
 
-    # Get data availability status and players/seasons lists
-    data_available = ShotChart.is_data_available(season)
-    active_players = ShotChart.get_active_players()
-    available_seasons = ShotChart.get_player_seasons(player_name)
-    available_games = ShotChart.get_player_games(player_name, season)
+        # Get players/seasons lists
+        available_seasons = data.player_seasons(player_name)
+        available_games = data.player_games(player_name, season)
 
-    # First try to get shot location data
-    shots_df, basic_stats = ShotChart.get_player_shots(player_name, season, game_id)
+        # First try to get shot location data
+        shots_df, basic_stats = data.player_shots(player_name, season, game_id)
 
     # If we have basic stats but no shot locations (pre-1996 season)
     if shots_df.empty and basic_stats:
+        # Only pre-tracking and empty pages use plotly.express, import it here
+        import plotly.express as px
+
         fig = px.scatter(title=f"{player_name}'s Shot Chart ({season})")
         fig.update_layout(
             showlegend=False,
@@ -52,147 +605,47 @@ def home():
             width=800,
         )
 
-        # Create basic stats table
-        stats_data = {
-            "Zone": ["2PT Field Goals", "3PT Field Goals", "Free Throws"],
-            "Made": [basic_stats["fg2m"], basic_stats["fg3m"], basic_stats["ftm"]],
-            "Attempts": [basic_stats["fg2a"], basic_stats["fg3a"], basic_stats["fta"]],
-            "FG%": [
-                (
-                    f"{(basic_stats['fg2m']/basic_stats['fg2a']*100):.1f}"
-                    if basic_stats["fg2a"] > 0
-                    else "0.0"
-                ),
-                (
-                    f"{(basic_stats['fg3m']/basic_stats['fg3a']*100):.1f}"
-                    if basic_stats["fg3a"] > 0
-                    else "0.0"
-                ),
-                (
-                    f"{(basic_stats['ftm']/basic_stats['fta']*100)::.1f}"
-                    if basic_stats["fta"] > 0
-                    else "0.0"
-                ),
-            ],
-        }
-        zone_stats = pd.DataFrame(stats_data)
-
-        # Calculate totals for pre-1996 seasons
-        total_shots = basic_stats["fg2a"] + basic_stats["fg3a"]
-        total_points = (
-            (basic_stats["fg2m"] * 2) + (basic_stats["fg3m"] * 3) + basic_stats["ftm"]
-        )
-        ts_percent = (
-            (total_points / (2 * (total_shots + 0.44 * basic_stats["fta"]))) * 100
-            if (total_shots + basic_stats["fta"]) > 0
-            else 0
-        )
+        zone_stats, totals = build_basic_stats(basic_stats)
 
-        return render_template(
-            "index.html",
-            plot=fig.to_html(),
-            stats=zone_stats.to_html(classes="stats-table", index=False),
-            players=active_players,
+        return render_page(
+            plot=render_plot(fig),
+            stats=stats_table_html(zone_stats),
             selected_player=player_name,
+            selected_player_id=player_id,
+            view=view,
             seasons=available_seasons,
             selected_season=season,
             games=available_games,
             selected_game=game_id,
-            ts_percent=f"{ts_percent:.1f}",
-            total_points=total_points,
-            total_shots=total_shots,
+            **totals,
             error_message="Shot location data is not available, showing basic statistics only.",
         )
 
     # Add data availability check
-    data_available = ShotChart.is_data_available(season)
+    data_available = career or ShotChart.is_data_available(season)
     error_message = (
         None
         if data_available
         else "Shot location data is only available from the 1996-97 season onwards."
     )
+    if player_id is None:
+        # A mistyped name gets suggestions, never another player's chart
+        error_message = unknown_player_message(player_name)
     per36 = request.args.get("per36") == "on"  # Add this line
 
-    active_players = ShotChart.get_active_players()
-    available_seasons = ShotChart.get_player_seasons(player_name)
-    available_games = ShotChart.get_player_games(player_name, season)
-    shots_df, basic_stats = ShotChart.get_player_shots(player_name, season, game_id)
-
-    # Handle pre-1996 seasons with basic stats
-    if shots_df.empty and basic_stats:
-        # Create empty plot with message
-        fig = px.scatter(title=f"{player_name}'s Basic Stats ({season})")
-        fig.update_layout(
-            showlegend=False,
-            xaxis=dict(
-                showgrid=False, zeroline=False, showticklabels=False, showline=False
-            ),
-            yaxis=dict(
-                showgrid=False, zeroline=False, showticklabels=False, showline=False
-            ),
-        )
-
-        # Create basic stats table
-        stats_data = {
-            "Zone": ["2PT Field Goals", "3PT Field Goals", "Free Throws"],
-            "Made": [basic_stats["fg2m"], basic_stats["fg3m"], basic_stats["ftm"]],
-            "Attempts": [basic_stats["fg2a"], basic_stats["fg3a"], basic_stats["fta"]],
-            "FG%": [
-                (
-                    f"{(basic_stats['fg2m']/basic_stats['fg2a']*100):.1f}"
-                    if basic_stats["fg2a"] > 0
-                    else "0.0"
-                ),
-                (
-                    f"{(basic_stats['fg3m']/basic_stats['fg3a']*100):.1f}"
-                    if basic_stats["fg3a"] > 0
-                    else "0.0"
-                ),
-                (
-                    f"{(basic_stats['ftm']/basic_stats['fta']*100):.1f}"
-                    if basic_stats["fta"] > 0
-                    else "0.0"
-                ),
-            ],
-        }
-
-        zone_stats = pd.DataFrame(stats_data)
-
-        # Calculate totals
-        total_shots = basic_stats["fg2a"] + basic_stats["fg3a"]
-        total_points = (
-            (basic_stats["fg2m"] * 2) + (basic_stats["fg3m"] * 3) + basic_stats["ftm"]
-        )
-        ts_percent = (
-            (total_points / (2 * (total_shots + 0.44 * basic_stats["fta"]))) * 100
-            if (total_shots + basic_stats["fta"]) > 0
-            else 0
-        )
-
-        return render_template(
-            "index.html",
-            plot=fig.to_html(),
-            stats=zone_stats.to_html(classes="stats-table", index=False),
-            players=active_players,
-            selected_player=player_name,
-            seasons=available_seasons,
-            selected_season=season,
-            games=available_games,
-            selected_game=game_id,
-            ts_percent=f"{ts_percent:.1f}",
-            total_points=total_points,
-            total_shots=total_shots,
-            error_message="Shot location data is not available, showing basic statistics only.",
-        )
-
     # Check if we have valid shot data
     if shots_df.empty:
+        # Don't pin a failed or empty upstream fetch in the page cache
+        g.skip_page_cache = True
+
         # Create empty plot with message
         message = (
             error_message
             if error_message
             else f"No shot data available for {player_name} ({season})"
         )
+        import plotly.express as px
+
         fig = px.scatter(title=message)
         fig.update_layout(
             showlegend=False,
@@ -211,12 +664,12 @@ def home():
                 title="",
             ),
         )
-        return render_template(
-            "index.html",
-            plot=fig.to_html(),
+        return render_page(
+            plot=render_plot(fig),
             stats="<p>No statistics available</p>",
-            players=active_players,
             selected_player=player_name,
+            selected_player_id=player_id,
+            view=view,
             seasons=available_seasons,
             selected_season=season,
             games=available_games,
@@ -224,85 +677,24 @@ def home():
             error_message=error_message,
         )
 
-    # Create hover text with shot distance
-    shots_df["SHOT_RESULT"] = shots_df["SHOT_MADE_FLAG"].map({1: "Made", 0: "Missed"})
-    shots_df["HOVER_TEXT"] = (
-        shots_df["SHOT_DISTANCE"].astype(str) + "ft - " + shots_df["SHOT_RESULT"]
-    )
-
     # Update title to include game info if selected
-    title = f"{player_name}'s Shot Chart ({season})"
-    if game_id:
-        game = next((g for g in available_games if g["id"] == game_id), None)
-        if game:
-            title += f" - {game['display']}"
+    if career:
+        title = f"{player_name}'s Shot Chart (Career {career_label(career_shots)})"
+    else:
+        title = chart_title(player_name, season, game_id, available_games)
 
-    # Create scatter plot
-    fig = px.scatter(
+    figure_started = time.perf_counter()
+    fig = chart_figure(
         shots_df,
-        x="LOC_X",
-        y="LOC_Y",
-        color="SHOT_RESULT",
-        color_discrete_map={
-            "Made": "#2ecc71",  # Green for made shots
-            "Missed": "#e74c3c",  # Red for missed shots
-        },
-        title=title,
-        custom_data=["HOVER_TEXT"],
-        hover_data=None,  # Disable default hover data
-        labels={"LOC_X": "", "LOC_Y": ""},  # Remove axis labels
-    )
-
-    # Generate filename for downloads
-    filename = f"{player_name.replace(' ', '_')}_{season}"
-    if game_id:
-        game = next((g for g in available_games if g["id"] == game_id), None)
-        if game:
-            filename += f"_{game['date']}"
-    filename += "_shot_chart"
-
-    # Add court image as background
-    fig.add_layout_image(
-        dict(
-            source=url_for("static", filename="images/shot_chart.png"),
-            xref="x",
-            yref="y",
-            x=-250,
-            y=422.5,
-            sizex=500,
-            sizey=470,
-            sizing="stretch",
-            opacity=1,
-            layer="below",
-        )
-    )
-
-    # Update layout with proper dimensions (remove toImageButtonOptions)
-    fig.update_layout(
-        showlegend=True,
-        legend_title_text="Shot Outcome",
-        xaxis=dict(
-            showgrid=False,
-            zeroline=False,
-            showticklabels=False,
-            showline=False,
-            range=[-250, 250],  # NBA coordinates are in tenths of feet
-            scaleanchor="y",
-            scaleratio=1,
-        ),
-        yaxis=dict(
-            showgrid=False,
-            zeroline=False,
-            showticklabels=False,
-            showline=False,
-            range=[-47.5, 422.5],  # NBA coordinates are in tenths of feet
-        ),
-        paper_bgcolor="#1e1e1e",
-        plot_bgcolor="rgba(0,0,0,0)",  # Transparent background
-        margin=dict(l=0, r=0, t=30, b=0),
-        height=700,  # Fixed height
-        width=800,  # Fixed width
+        title,
+        view,
+        player_id,
+        season,
+        game_id,
+        court=current_app.config.get("COURT_STYLE", "raster"),
+        image_url=url_for("static", filename=COURT_IMAGE),
     )
+    filename = chart_filename(player_name, season, game_id, available_games)
 
     # Create custom configuration for downloads
     config = {
@@ -313,204 +705,150 @@ def home():
             "scale": 2,  # Higher quality image
         }
     }
+    metrics.record("figure", figure_started)
 
-    # Update markers and hover template
-    fig.update_traces(
-        selector=dict(name="Made"),
-        marker=dict(symbol="circle", size=10, line=dict(width=1, color="white")),
-        hovertemplate="%{customdata[0]}<extra></extra>",  # Show only custom hover text
-    )
-
-    fig.update_traces(
-        selector=dict(name="Missed"),
-        marker=dict(symbol="x", size=10, line=dict(width=1, color="white")),
-        hovertemplate="%{customdata[0]}<extra></extra>",  # Show only custom hover text
-    )
-
-    # Get number of games for per-game calculations
-    num_games = len(set(shots_df["GAME_ID"])) if not game_id else 1
-
-    # Calculate shot types first
-    two_pt_shots = shots_df[shots_df["SHOT_TYPE"] == "2PT Field Goal"]
-    three_pt_shots = shots_df[shots_df["SHOT_TYPE"] == "3PT Field Goal"]
-
-    # Calculate zone statistics with better column names
-    zone_stats = (
-        shots_df[shots_df["SHOT_ZONE_BASIC"] != "Backcourt"]
-        .groupby("SHOT_ZONE_BASIC")
-        .agg(
-            Made=("SHOT_MADE_FLAG", "sum"),
-            Attempts=("SHOT_MADE_FLAG", "count"),
-            FGPercent=("SHOT_MADE_FLAG", lambda x: f"{(x.mean() * 100):.1f}"),
-        )
-    ).reset_index()
-    zone_stats.columns = ["Zone", "Made", "Attempts", "FG%"]
-
-    # Get minutes played data when showing season stats
-    if not game_id:
-        total_minutes, games_played = ShotChart.get_player_minutes(player_name, season)
-        print(f"Total minutes: {total_minutes}, Games: {games_played}")
-
-        # Calculate minutes per game
-        minutes_per_game = total_minutes / games_played if games_played > 0 else 0
-        print(f"Minutes per game: {minutes_per_game}")
-
-        # Calculate per 36 multiplier
-        if minutes_per_game > 0:
-            per36_multiplier = 36 / minutes_per_game
-            print(f"Per36 multiplier: {per36_multiplier}")
-        else:
-            per36_multiplier = 0
-
-        # Add per-game and per36 stats
-        def format_stats(row, stat_name):
-            value = row[stat_name]
-            per_game = value / num_games
-            per36_value = per_game * per36_multiplier if minutes_per_game > 0 else 0
-
-            # Only show per36 stats if toggle is on and we have valid minutes data
-            if per36 and minutes_per_game > 0:
-                return f"{value} ({per_game:.1f}/game | {per36_value:.1f}/36m)"
-            return f"{value} ({per_game:.1f}/game)"
-
-        # Update both columns for all rows
-        for col in ["Made", "Attempts"]:
-            zone_stats[col] = zone_stats.apply(
-                lambda row: format_stats(row, col), axis=1
-            )
-
-        # Use the same formatting function for summary stats
-        def format_stats_with_per36(
-            value_total, num_games, per36_multiplier, minutes_per_game
-        ):
-            per_game = value_total / num_games
-            per36_value = per_game * per36_multiplier if minutes_per_game > 0 else 0
-
-            # Only show per36 stats if toggle is on and we have valid minutes data
-            if per36 and minutes_per_game > 0:
-                return f"{value_total} ({per_game:.1f}/game | {per36_value:.1f}/36m)"
-            return f"{value_total} ({per_game:.1f}/game)"
-
-        # Create summary rows for 2PT and 3PT with per36 stats
-        two_pt_made = two_pt_shots["SHOT_MADE_FLAG"].sum()
-        two_pt_attempts = len(two_pt_shots)
-        three_pt_made = three_pt_shots["SHOT_MADE_FLAG"].sum()
-        three_pt_attempts = len(three_pt_shots)
-
-        summary_stats = pd.DataFrame(
-            {
-                "Zone": ["2PT Field Goals", "3PT Field Goals"],
-                "Made": [
-                    format_stats_with_per36(
-                        two_pt_made, num_games, per36_multiplier, minutes_per_game
-                    ),
-                    format_stats_with_per36(
-                        three_pt_made, num_games, per36_multiplier, minutes_per_game
-                    ),
-                ],
-                "Attempts": [
-                    format_stats_with_per36(
-                        two_pt_attempts, num_games, per36_multiplier, minutes_per_game
-                    ),
-                    format_stats_with_per36(
-                        three_pt_attempts, num_games, per36_multiplier, minutes_per_game
-                    ),
-                ],
-                "FG%": [
-                    f"{(two_pt_shots['SHOT_MADE_FLAG'].mean() * 100):.1f}",
-                    f"{(three_pt_shots['SHOT_MADE_FLAG'].mean() * 100):.1f}",
-                ],
-            }
-        )
-
-    else:
-        summary_stats = pd.DataFrame(
-            {
-                "Zone": ["2PT Field Goals", "3PT Field Goals"],
-                "Made": [
-                    two_pt_shots["SHOT_MADE_FLAG"].sum(),
-                    three_pt_shots["SHOT_MADE_FLAG"].sum(),
-                ],
-                "Attempts": [
-                    len(two_pt_shots),
-                    len(three_pt_shots),
-                ],
-                "FG%": [
-                    f"{(two_pt_shots['SHOT_MADE_FLAG'].mean() * 100):.1f}",
-                    f"{(three_pt_shots['SHOT_MADE_FLAG'].mean() * 100)::.1f}",
-                ],
-            }
-        )
-
-    # Get free throw data
-    fta, ftm = ShotChart.get_player_free_throws(player_name, season, game_id)
-
-    # Create free throw row with swapped column order
-    if not game_id:
-        ft_stats = pd.DataFrame(
-            {
-                "Zone": ["Free Throws"],
-                "Made": [f"{ftm} ({(ftm/num_games):.1f}/game)"],
-                "Attempts": [f"{fta} ({(fta/num_games):.1f}/game)"],
-                "FG%": [f"{(ftm/fta * 100):.1f}" if fta > 0 else "0.0"],
-            }
-        )
+    if career:
+        zone_stats, totals = career_shots.zone_stats(per36)
     else:
-        ft_stats = pd.DataFrame(
-            {
-                "Zone": ["Free Throws"],
-                "Made": [ftm],
-                "Attempts": [fta],
-                "FG%": [f"{(ftm/fta * 100):.1f}" if fta > 0 else "0.0"],
-            }
+        zone_stats, totals = build_shot_stats(
+            data, player_name, season, game_id, shots_df, per36
         )
 
-    # Combine all stats
-    zone_stats = pd.concat([zone_stats, summary_stats, ft_stats], ignore_index=True)
-
-    # Calculate final totals
-    total_shots = len(shots_df)
-    made_shots = shots_df["SHOT_MADE_FLAG"].sum()
-    total_points = (
-        (two_pt_shots["SHOT_MADE_FLAG"].sum() * 2)
-        + (three_pt_shots["SHOT_MADE_FLAG"].sum() * 3)
-        + ftm
-    )
-
-    # Calculate True Shooting %
-    ts_percent = (
-        (total_points / (2 * (total_shots + 0.44 * fta))) * 100
-        if (total_shots + fta) > 0
-        else 0
-    )
-
     # Pass the config when converting to HTML
-    return render_template(
-        "index.html",
-        plot=fig.to_html(config=config),
-        stats=zone_stats.to_html(
-            classes="stats-table",
-            index=False,
-            escape=False,
-            formatters={
-                "Zone": lambda x: (
-                    x
-                    if "Field Goals" not in x
-                    else f'<span class="field-goal-type">{x}</span>'
-                ),
-                "Made": lambda x: str(x),
-                "Attempts": lambda x: str(x),
-                "FG%": lambda x: str(x),
-            },
-        ),
-        players=active_players,
+    return render_page(
+        plot=render_plot(fig, config=config),
+        stats=stats_table_html(zone_stats),
         selected_player=player_name,
+        selected_player_id=player_id,
+        view=view,
         seasons=available_seasons,
         selected_season=season,
         games=available_games,
         selected_game=game_id,
         per36=per36,  # Add this line
-        ts_percent=f"{ts_percent:.1f}",
-        total_points=total_points,
-        total_shots=total_shots,
+        career_seasons=career_shots.season_rows() if career else None,
+        **totals,
+    )
+
+
+def comparison_figures(comparison, layout, court, image_url):
+    """
+    One court with every player's shots in their own colour, or for the grid
+    layout a smaller court per player, all on the shared court layout
+    """
+    title = f"Shot Chart Comparison ({comparison.season})"
+    if layout == "overlay":
+        traces = []
+        for name in comparison.players:
+            traces += shot_traces(
+                comparison.player_shots(name),
+                player_name=name,
+                player_color=comparison.color(name),
+            )
+        return [
+            court_figure(
+                traces,
+                court=court,
+                image_url=image_url,
+                title={"text": title},
+                showlegend=True,
+            )
+        ]
+
+    return [
+        court_figure(
+            shot_traces(comparison.player_shots(name)),
+            court=court,
+            image_url=image_url,
+            title={"text": f"{name} ({comparison.season})"},
+            showlegend=False,
+            width=400,
+            height=350,
+        )
+        for name in comparison.players
+    ]
+
+
+@main.route("/compare")
+def compare():
+    season = request.args.get("season", "2015-16")
+    layout = request.args.get("layout", "overlay")
+    layout = layout if layout in LAYOUTS else "overlay"
+    per36 = request.args.get("per36") == "on"
+    data = get_request_data()
+
+    # Canonical names, in the order picked, without repeats
+    players, messages = [], []
+    for name in dict.fromkeys(filter(None, request.args.getlist("player"))):
+        player = player_index.get(ShotChart.get_player_id(name))
+        if player is None:
+            messages.append(unknown_player_message(name))
+        elif player["full_name"] not in players:
+            players.append(player["full_name"])
+    if len(players) > MAX_PLAYERS:
+        messages.append(f"Showing the first {MAX_PLAYERS} players.")
+        players = players[:MAX_PLAYERS]
+
+    # Every player's calls are in flight at once, bounded by the fetch pool
+    fetch_players(data, players, season)
+    # Seasons every compared player played in
+    seasons = [
+        s
+        for s in (data.player_seasons(players[0]) if players else [])
+        if all(s in data.player_seasons(name) for name in players[1:])
+    ]
+
+    frames = {}
+    for name in players:
+        shots_df, _ = data.player_shots(name, season)
+        if shots_df.empty:
+            messages.append(f"No shot data available for {name} ({season}).")
+        else:
+            frames[name] = shots_df
+    if not ShotChart.is_data_available(season):
+        messages = [
+            "Shot location data is only available from the 1996-97 season onwards."
+        ]
+
+    context = dict(
+        players=players,
+        seasons=seasons,
+        selected_season=season,
+        layout=layout,
+        per36=per36,
+        max_players=MAX_PLAYERS,
+        error_message=" ".join(messages) or None,
+    )
+    if not frames:
+        return render_page("compare.html", plots=[], **context)
+
+    comparison = Comparison(season, frames)
+    figure_started = time.perf_counter()
+    figures = comparison_figures(
+        comparison,
+        layout,
+        court=current_app.config.get("COURT_STYLE", "raster"),
+        image_url=url_for("static", filename=COURT_IMAGE),
+    )
+    metrics.record("figure", figure_started)
+    tables = comparison.stats(data)
+
+    return render_page(
+        "compare.html",
+        plots=[
+            render_plot(fig, div_id=f"shot-chart-{i}", include_plotlyjs=i == 0)
+            for i, fig in enumerate(figures)
+        ],
+        compared=[
+            {
+                "name": name,
+                "color": comparison.color(name),
+                # Players without minutes in their game log stay per game
+                "per36": per36 and tables[name][1],
+            }
+            for name in comparison.players
+        ],
+        summary_rows=comparison.summary_rows(tables),
+        zone_rows=comparison.zone_rows(tables, per36),
+        **context,
     )
@@ -0,0 +1,142 @@
+# app/singleflight.py
+import hashlib
+import os
+import pickle
+import threading
+import time
+from concurrent.futures import Future
+from functools import wraps
+
+from .metrics import metrics
+
+try:
+    import fcntl
+except ImportError:  # Windows: coalesce within a worker only
+    fcntl = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key: the first caller runs the
+    fetch and every caller that arrives while it is in flight waits for and
+    shares its result (or exception). A successful result is also handed to
+    callers arriving up to share_ttl seconds after it landed, since requests
+    queued behind the fetch pool would otherwise just miss the flight.
+
+    With a lock directory configured, flights are also coalesced across
+    worker processes: the leader in each worker takes a per-key file lock,
+    and a worker that had to wait reuses the result the previous holder
+    left behind if it is younger than share_ttl seconds.
+    """
+
+    # Shared results older than share_ttl are swept every this many flights
+    SWEEP_EVERY = 100
+
+    def __init__(self, lock_dir=None, share_ttl=10):
+        self.lock_dir = lock_dir
+        self.share_ttl = share_ttl
+        self._flights = {}
+        self._shared_flights = 0
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.lock_dir = app.config.get("SINGLEFLIGHT_DIR")
+        self.share_ttl = app.config.get("SINGLEFLIGHT_SHARE_TTL", self.share_ttl)
+
+    @property
+    def shared(self):
+        return bool(self.lock_dir) and fcntl is not None
+
+    def do(self, key, fn):
+        now = time.monotonic()
+        with self._lock:
+            # {key: (future, landed_at)}, landed_at is None while in flight
+            for old_key, (_, landed) in list(self._flights.items()):
+                if landed is not None and now - landed >= self.share_ttl:
+                    del self._flights[old_key]
+            flight, _ = self._flights.get(key, (None, None))
+            leader = flight is None
+            if leader:
+                flight = Future()
+                self._flights[key] = (flight, None)
+        if not leader:
+            metrics.increment("singleflight_joins_total", fetch=key[0], scope="worker")
+
+        if leader:
+            try:
+                flight.set_result(self._run_shared(key, fn) if self.shared else fn())
+                with self._lock:
+                    self._flights[key] = (flight, time.monotonic())
+            except Exception as e:
+                flight.set_exception(e)
+                # Failures are shared with waiters only, the next call retries
+                with self._lock:
+                    del self._flights[key]
+        return flight.result()
+
+    def _run_shared(self, key, fn):
+        os.makedirs(self.lock_dir, exist_ok=True)
+        path = os.path.join(self.lock_dir, hashlib.sha1(repr(key).encode()).hexdigest())
+        with open(f"{path}.lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                # Another worker may have finished this flight while we waited
+                try:
+                    if time.time() - os.path.getmtime(path) < self.share_ttl:
+                        with open(path, "rb") as f:
+                            result = pickle.load(f)
+                        metrics.increment(
+                            "singleflight_joins_total", fetch=key[0], scope="shared"
+                        )
+                        return result
+                except (OSError, pickle.PickleError, EOFError):
+                    pass
+
+                result = fn()
+                tmp_path = f"{path}.{os.getpid()}.tmp"
+                with open(tmp_path, "wb") as f:
+                    pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, path)
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+        with self._lock:
+            self._shared_flights += 1
+            sweep = self._shared_flights % self.SWEEP_EVERY == 0
+        if sweep:
+            self._sweep()
+        return result
+
+    def _sweep(self):
+        # Lock files stay: removing one another worker holds would split the lock
+        cutoff = time.time() - self.share_ttl
+        for entry in os.scandir(self.lock_dir):
+            try:
+                if not entry.name.endswith(".lock") and entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+            except OSError:
+                pass
+
+    def __call__(self, name, key=None):
+        """
+        Decorator coalescing calls to fn by (name, arguments), or by (name,
+        key(*args, **kwargs)) when calls that differ in their arguments
+        fetch the same thing
+        """
+
+        def decorator(fn):
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                flight = (
+                    key(*args, **kwargs)
+                    if key is not None
+                    else (args, tuple(sorted(kwargs.items())))
+                )
+                return self.do((name, flight), lambda: fn(*args, **kwargs))
+
+            return wrapper
+
+        return decorator
+
+
+single_flight = SingleFlight()
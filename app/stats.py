@@ -0,0 +1,202 @@
+# app/stats.py
+import numpy as np
+import pandas as pd
+
+SHOT_TYPES = ["2PT Field Goal", "3PT Field Goal"]
+# Every SHOT_ZONE_BASIC value ShotChartDetail reports, in sorted order
+ZONES = [
+    "Above the Break 3",
+    "Backcourt",
+    "In The Paint (Non-RA)",
+    "Left Corner 3",
+    "Mid-Range",
+    "Restricted Area",
+    "Right Corner 3",
+]
+SUMMARY_ZONES = ["2PT Field Goals", "3PT Field Goals"]
+FREE_THROW_ZONE = "Free Throws"
+EXCLUDED_ZONES = ["Backcourt"]
+
+STAT_COLUMNS = ["Zone", "Made", "Attempts", "FG%"]
+
+
+def parse_minutes(minutes):
+    """
+    Decimal minutes for a game log MIN column holding numbers and/or "MM:SS"
+    strings. Unparseable entries count as zero minutes.
+    """
+    values = pd.Series(minutes)
+    if pd.api.types.is_numeric_dtype(values):
+        return values.fillna(0).to_numpy(dtype=float)
+
+    numeric = pd.to_numeric(values, errors="coerce")
+    clock = values.astype(str).str.extract(r"^\s*(\d+):(\d+)\s*$").astype(float)
+    parsed = numeric.fillna(clock[0] + clock[1] / 60)
+    return parsed.fillna(0).to_numpy(dtype=float)
+
+
+def minutes_played(games_df):
+    """Total minutes, games played and the per-game minutes array of a game log"""
+    if games_df.empty:
+        return 0.0, 0, np.zeros(0)
+    per_game = parse_minutes(games_df["MIN"])
+    return float(per_game.sum()), len(per_game), per_game
+
+
+def _fg_percent(made, attempts):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(attempts > 0, made / attempts * 100, 0.0)
+
+
+def zone_counts(shots_df):
+    """
+    Made and attempted shots per zone x shot type, as two (len(ZONES), 2)
+    arrays. Zone and shot type are folded into one integer key so a single
+    bincount over the made flags yields every cell. Counts are additive, so
+    tables for several frames can be built from their summed counts.
+    """
+    made, attempts = grouped_zone_counts(shots_df, np.zeros(len(shots_df), int), 1)
+    return made[0], attempts[0]
+
+
+def grouped_zone_counts(shots_df, groups, num_groups):
+    """
+    zone_counts for several groups of rows in one pass, as two
+    (num_groups, len(ZONES), 2) arrays. groups holds each row's group code
+    in 0..num_groups - 1 and is folded into the bincount key above the zone
+    and shot type.
+    """
+    zone_codes = pd.Categorical(shots_df["SHOT_ZONE_BASIC"], categories=ZONES).codes
+    is_three = (shots_df["SHOT_TYPE"] == SHOT_TYPES[1]).to_numpy(dtype=np.int64)
+    made_flags = shots_df["SHOT_MADE_FLAG"].to_numpy(dtype=np.int64)
+
+    known = zone_codes >= 0
+    cells = len(ZONES) * 2
+    keys = (
+        np.asarray(groups, dtype=np.int64)[known] * cells
+        + zone_codes[known].astype(np.int64) * 2
+        + is_three[known]
+    )
+    shape = (num_groups, len(ZONES), 2)
+    attempts = np.bincount(keys, minlength=cells * num_groups).reshape(shape)
+    made = np.bincount(keys, weights=made_flags[known], minlength=cells * num_groups)
+    return made.astype(np.int64).reshape(shape), attempts
+
+
+def zone_table(made, attempts, num_games=1, per36_multiplier=0.0):
+    """
+    Numeric zone and 2PT/3PT summary table from zone_counts arrays. Zone rows
+    and shot type rows are sums along each axis; per-game and per-36 values
+    are derived from the totals as whole columns.
+    """
+    num_games = max(num_games, 1)
+
+    # Backcourt heaves count toward 2PT/3PT totals but get no zone row
+    keep = (attempts.sum(axis=1) > 0) & ~np.isin(ZONES, EXCLUDED_ZONES)
+    zone_names = np.asarray(ZONES)[keep]
+    row_made = np.concatenate([made.sum(axis=1)[keep], made.sum(axis=0)])
+    row_attempts = np.concatenate([attempts.sum(axis=1)[keep], attempts.sum(axis=0)])
+
+    per_game_made = row_made / num_games
+    per_game_attempts = row_attempts / num_games
+    return pd.DataFrame(
+        {
+            "Zone": np.concatenate([zone_names, SUMMARY_ZONES]),
+            "Made": row_made,
+            "Attempts": row_attempts,
+            "FG%": _fg_percent(row_made, row_attempts),
+            "MadePerGame": per_game_made,
+            "AttemptsPerGame": per_game_attempts,
+            "MadePer36": per_game_made * per36_multiplier,
+            "AttemptsPer36": per_game_attempts * per36_multiplier,
+        }
+    )
+
+
+def compute_shot_stats(shots_df, num_games=None, per36_multiplier=0.0):
+    """Numeric zone and 2PT/3PT summary table for a shot frame"""
+    if num_games is None:
+        num_games = shots_df["GAME_ID"].nunique()
+    made, attempts = zone_counts(shots_df)
+    return zone_table(made, attempts, num_games, per36_multiplier)
+
+
+def add_free_throws(stats, ftm, fta, num_games=1):
+    """Append the free throw row; free throws carry no per-36 figures"""
+    num_games = max(num_games, 1)
+    ft_row = pd.DataFrame(
+        {
+            "Zone": [FREE_THROW_ZONE],
+            "Made": [int(ftm)],
+            "Attempts": [int(fta)],
+            "FG%": _fg_percent(np.array([ftm]), np.array([fta])),
+            "MadePerGame": [ftm / num_games],
+            "AttemptsPerGame": [fta / num_games],
+            "MadePer36": [np.nan],
+            "AttemptsPer36": [np.nan],
+        }
+    )
+    return pd.concat([stats, ft_row], ignore_index=True)
+
+
+def shooting_totals(stats):
+    """Total points, field goal attempts and true shooting % from a stats table"""
+    by_zone = stats.set_index("Zone")
+    fg2m, fg3m = by_zone.loc[SUMMARY_ZONES, "Made"]
+    total_shots = int(by_zone.loc[SUMMARY_ZONES, "Attempts"].sum())
+    if FREE_THROW_ZONE in by_zone.index:
+        ftm = by_zone.at[FREE_THROW_ZONE, "Made"]
+        fta = by_zone.at[FREE_THROW_ZONE, "Attempts"]
+    else:
+        ftm = fta = 0
+
+    total_points = int(fg2m * 2 + fg3m * 3 + ftm)
+    ts_percent = (
+        (total_points / (2 * (total_shots + 0.44 * fta))) * 100
+        if (total_shots + fta) > 0
+        else 0
+    )
+    return {
+        "ts_percent": f"{ts_percent:.1f}",
+        "total_points": total_points,
+        "total_shots": total_shots,
+    }
+
+
+def _with_rates(totals, per_game, per36, show_per36):
+    per_game_text = per_game.map("{:.1f}".format)
+    per36_text = per36.map("{:.1f}".format)
+    text = totals.astype(str) + " (" + per_game_text + "/game"
+    if show_per36:
+        text = text.where(per36.isna(), text + " | " + per36_text + "/36m")
+    return text + ")"
+
+
+def format_shot_stats(stats, per_game=True, per36=False):
+    """
+    Display table with Zone, Made, Attempts and FG% columns, plus vs League
+    when league baselines were joined on.
+
+    Season views annotate Made/Attempts with per-game (and optionally
+    per-36) rates; single-game views show the raw counts.
+    """
+    table = pd.DataFrame(
+        {"Zone": stats["Zone"], "FG%": stats["FG%"].map("{:.1f}".format)}
+    )
+    if per_game:
+        table["Made"] = _with_rates(
+            stats["Made"], stats["MadePerGame"], stats["MadePer36"], per36
+        )
+        table["Attempts"] = _with_rates(
+            stats["Attempts"], stats["AttemptsPerGame"], stats["AttemptsPer36"], per36
+        )
+    else:
+        table["Made"] = stats["Made"]
+        table["Attempts"] = stats["Attempts"]
+
+    if "vs League" not in stats:
+        return table[STAT_COLUMNS]
+    table["vs League"] = (
+        stats["vs League"].map("{:+.1f}".format).where(stats["vs League"].notna(), "")
+    )
+    return table[STAT_COLUMNS + ["vs League"]]
@@ -0,0 +1,219 @@
+# app/store.py
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+
+# ShotChartDetail columns, stored verbatim so frames round-trip unchanged
+SHOT_COLUMNS = [
+    "GRID_TYPE",
+    "GAME_ID",
+    "GAME_EVENT_ID",
+    "PLAYER_ID",
+    "PLAYER_NAME",
+    "TEAM_ID",
+    "TEAM_NAME",
+    "PERIOD",
+    "MINUTES_REMAINING",
+    "SECONDS_REMAINING",
+    "EVENT_TYPE",
+    "ACTION_TYPE",
+    "SHOT_TYPE",
+    "SHOT_ZONE_BASIC",
+    "SHOT_ZONE_AREA",
+    "SHOT_ZONE_RANGE",
+    "SHOT_DISTANCE",
+    "LOC_X",
+    "LOC_Y",
+    "SHOT_ATTEMPTED_FLAG",
+    "SHOT_MADE_FLAG",
+    "GAME_DATE",
+    "HTM",
+    "VTM",
+]
+
+INTEGER_COLUMNS = {
+    "GAME_EVENT_ID",
+    "PLAYER_ID",
+    "TEAM_ID",
+    "PERIOD",
+    "MINUTES_REMAINING",
+    "SECONDS_REMAINING",
+    "SHOT_DISTANCE",
+    "LOC_X",
+    "LOC_Y",
+    "SHOT_ATTEMPTED_FLAG",
+    "SHOT_MADE_FLAG",
+}
+
+COLUMN_DEFS = ", ".join(
+    f"{col} {'INTEGER' if col in INTEGER_COLUMNS else 'TEXT'}" for col in SHOT_COLUMNS
+)
+
+# Leading the primary key with SEASON clusters each season's rows together
+# (WITHOUT ROWID tables are stored in primary key order), which is how the
+# store is partitioned by season.
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS shots (
+    SEASON TEXT NOT NULL,
+    {COLUMN_DEFS},
+    PRIMARY KEY (SEASON, PLAYER_ID, GAME_ID, GAME_EVENT_ID)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS ingest_progress (
+    SEASON TEXT NOT NULL,
+    PLAYER_ID INTEGER NOT NULL,
+    LAST_GAME_DATE TEXT,
+    SHOTS INTEGER NOT NULL DEFAULT 0,
+    UPDATED_AT REAL NOT NULL,
+    PRIMARY KEY (SEASON, PLAYER_ID)
+) WITHOUT ROWID;
+"""
+
+
+class ShotStore:
+    """
+    Local SQLite store of league-wide shot data filled by the ingestion
+    pipeline (flask ingest-shots). ingest_progress doubles as the resume
+    checkpoint and as the per-(season, player) date watermark for
+    incremental updates.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+
+    def init_app(self, app):
+        self.path = app.config.get("SHOT_STORE_PATH")
+        self._schema_ready = False
+
+    @property
+    def enabled(self):
+        return bool(self.path) and os.path.exists(self.path)
+
+    @contextmanager
+    def connect(self):
+        """Connection that commits on success, rolls back on error and closes"""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            if not self._schema_ready:
+                with self._schema_lock:
+                    conn.executescript(SCHEMA)
+                    self._schema_ready = True
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def progress(self, season):
+        """
+        {player_id: (last_game_date, updated_at)} for every player ingested
+        in a season
+        """
+        with self.connect() as conn:
+            rows = conn.execute(
+                "SELECT PLAYER_ID, LAST_GAME_DATE, UPDATED_AT FROM ingest_progress "
+                "WHERE SEASON = ?",
+                (season,),
+            ).fetchall()
+        return {
+            player_id: (last_date, updated) for player_id, last_date, updated in rows
+        }
+
+    def has_player_season(self, player_id, season):
+        if not self.enabled:
+            return False
+        with self.connect() as conn:
+            row = conn.execute(
+                "SELECT 1 FROM ingest_progress WHERE SEASON = ? AND PLAYER_ID = ?",
+                (season, player_id),
+            ).fetchone()
+        return row is not None
+
+    def seasons(self):
+        """Seasons with at least one ingested player, most recent first"""
+        if not self.enabled:
+            return []
+        with self.connect() as conn:
+            rows = conn.execute(
+                "SELECT DISTINCT SEASON FROM ingest_progress ORDER BY SEASON DESC"
+            ).fetchall()
+        return [season for (season,) in rows]
+
+    def save_player_season(self, conn, season, player_id, shots_df):
+        """
+        Append a player's shots and advance their checkpoint. Runs inside the
+        caller's transaction so rows and watermark commit together.
+        """
+        if not shots_df.empty:
+            rows = shots_df.reindex(columns=SHOT_COLUMNS).astype(object)
+            rows = rows.where(rows.notna(), None)
+            placeholders = ", ".join("?" * (len(SHOT_COLUMNS) + 1))
+            conn.executemany(
+                f"INSERT OR IGNORE INTO shots (SEASON, {', '.join(SHOT_COLUMNS)}) "
+                f"VALUES ({placeholders})",
+                ([season, *row] for row in rows.itertuples(index=False, name=None)),
+            )
+
+        last_game_date = shots_df["GAME_DATE"].max() if not shots_df.empty else None
+        conn.execute(
+            """
+            INSERT INTO ingest_progress
+                (SEASON, PLAYER_ID, LAST_GAME_DATE, SHOTS, UPDATED_AT)
+            VALUES (
+                :season,
+                :player_id,
+                :last_game_date,
+                (SELECT COUNT(*) FROM shots
+                 WHERE SEASON = :season AND PLAYER_ID = :player_id),
+                :updated_at
+            )
+            ON CONFLICT (SEASON, PLAYER_ID) DO UPDATE SET
+                LAST_GAME_DATE = COALESCE(excluded.LAST_GAME_DATE, LAST_GAME_DATE),
+                SHOTS = excluded.SHOTS,
+                UPDATED_AT = excluded.UPDATED_AT
+            """,
+            {
+                "season": season,
+                "player_id": player_id,
+                "last_game_date": last_game_date,
+                "updated_at": time.time(),
+            },
+        )
+
+    def get_shots(self, player_id, season, game_id=None, columns=None):
+        """
+        Shots for a player's season (or one game) in ShotChartDetail layout,
+        optionally limited to some columns
+        """
+        columns = columns or SHOT_COLUMNS
+        query = (
+            f"SELECT {', '.join(columns)} FROM shots "
+            "WHERE SEASON = ? AND PLAYER_ID = ?"
+        )
+        params = [season, player_id]
+        if game_id:
+            query += " AND GAME_ID = ?"
+            params.append(game_id)
+        query += " ORDER BY GAME_DATE, GAME_ID, GAME_EVENT_ID"
+
+        with self.connect() as conn:
+            return pd.read_sql_query(query, conn, params=params)
+
+    def get_season_shots(self, season, columns=None):
+        """Every stored shot for a season, optionally limited to some columns"""
+        columns = columns or SHOT_COLUMNS
+        with self.connect() as conn:
+            return pd.read_sql_query(
+                f"SELECT {', '.join(columns)} FROM shots WHERE SEASON = ?",
+                conn,
+                params=[season],
+            )
+
+
+shot_store = ShotStore()
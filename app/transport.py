@@ -0,0 +1,229 @@
+# app/transport.py
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from nba_api.library.http import NBAHTTP
+
+from .metrics import metrics
+
+# Read timeouts in seconds for endpoints that are slower than the default
+ENDPOINT_TIMEOUTS = {
+    "shotchartdetail": 20,
+    "leaguedashplayerstats": 30,
+    "playercareerstats": 15,
+}
+
+
+class UpstreamError(Exception):
+    """An upstream stats call failed after its retries, or its circuit is open"""
+
+    def __init__(self, endpoint, message, retry_after=None):
+        super().__init__(f"{endpoint}: {message}")
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """
+    Allows bursts of up to `burst` calls, refilled at `rate` calls per second
+    and shared by every thread in the process. A rate of 0 disables limiting.
+    Processes don't share buckets; see Transport.init_app.
+    """
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.burst, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+
+
+class CircuitBreaker:
+    """
+    Opens after `threshold` consecutive failures so calls fail fast for
+    `reset_after` seconds, then lets a single trial call through (half-open)
+    to decide whether to close again.
+    """
+
+    def __init__(self, threshold, reset_after):
+        self.threshold = threshold
+        self.reset_after = reset_after
+        self._failures = 0
+        self._opened_at = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Seconds until the circuit may close if calls are blocked, else None"""
+        with self._lock:
+            if self._opened_at is None:
+                return None
+            remaining = self._opened_at + self.reset_after - time.monotonic()
+            if remaining > 0 or self._trial:
+                return max(remaining, 1.0)
+            self._trial = True
+            return None
+
+    def record(self, ok):
+        with self._lock:
+            self._trial = False
+            if ok:
+                self._failures = 0
+                self._opened_at = None
+                return
+            self._failures += 1
+            if self._opened_at is not None or self._failures >= self.threshold:
+                self._opened_at = time.monotonic()
+
+
+class Transport:
+    """
+    Shared path for every nba_api call: one pooled keep-alive session, a
+    process-wide token bucket holding this worker's share of the rate,
+    per-endpoint timeouts, bounded retries with jittered exponential backoff
+    and a circuit breaker per endpoint.
+    """
+
+    def __init__(
+        self,
+        rate=3.0,
+        burst=6,
+        retries=2,
+        backoff=0.5,
+        timeout=10,
+        breaker_threshold=5,
+        breaker_reset=30,
+        pool_size=10,
+    ):
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.breaker_threshold = breaker_threshold
+        self.breaker_reset = breaker_reset
+        self.pool_size = pool_size
+        self.bucket = TokenBucket(rate, burst)
+        self._breakers = {}
+        self._lock = threading.Lock()
+        self.session = None
+
+    def init_app(self, app):
+        # Buckets are per process, so every worker takes an equal share of
+        # the configured rate and burst to keep the deployment within them
+        workers = max(app.config.get("UPSTREAM_WORKERS", 1), 1)
+        self.configure(
+            rate=app.config.get("UPSTREAM_RATE", self.bucket.rate) / workers,
+            burst=app.config.get("UPSTREAM_BURST", self.bucket.burst) / workers,
+            retries=app.config.get("UPSTREAM_RETRIES", self.retries),
+            backoff=app.config.get("UPSTREAM_BACKOFF", self.backoff),
+            timeout=app.config.get("UPSTREAM_TIMEOUT", self.timeout),
+            pool_size=app.config.get("UPSTREAM_MAX_CONCURRENCY", self.pool_size),
+        )
+        self.breaker_threshold = app.config.get(
+            "UPSTREAM_BREAKER_THRESHOLD", self.breaker_threshold
+        )
+        self.breaker_reset = app.config.get(
+            "UPSTREAM_BREAKER_RESET", self.breaker_reset
+        )
+
+    def configure(
+        self,
+        rate=None,
+        burst=None,
+        retries=None,
+        backoff=None,
+        timeout=None,
+        pool_size=None,
+    ):
+        if rate is not None or burst is not None:
+            self.bucket = TokenBucket(
+                self.bucket.rate if rate is None else rate,
+                self.bucket.burst if burst is None else burst,
+            )
+        if retries is not None:
+            self.retries = retries
+        if backoff is not None:
+            self.backoff = backoff
+        if timeout is not None:
+            self.timeout = timeout
+        if pool_size is not None:
+            self.pool_size = pool_size
+        self.install_session()
+
+    def install_session(self):
+        """Route every nba_api request through one pooled keep-alive session"""
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_size, pool_maxsize=self.pool_size
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        self.session = session
+        NBAHTTP.set_session(session)
+
+    def breaker(self, endpoint):
+        with self._lock:
+            if endpoint not in self._breakers:
+                self._breakers[endpoint] = CircuitBreaker(
+                    self.breaker_threshold, self.breaker_reset
+                )
+            return self._breakers[endpoint]
+
+    def timeout_for(self, endpoint):
+        return max(ENDPOINT_TIMEOUTS.get(endpoint, 0), self.timeout)
+
+    def call(self, endpoint_cls, **params):
+        """
+        Construct (and so request) an nba_api endpoint, returning it once its
+        response parsed. Raises UpstreamError instead of returning nothing.
+        """
+        endpoint = endpoint_cls.endpoint
+        breaker = self.breaker(endpoint)
+        retry_after = breaker.allow()
+        if retry_after is not None:
+            raise UpstreamError(endpoint, "circuit open", retry_after)
+
+        for attempt in range(self.retries + 1):
+            self.bucket.acquire()
+            try:
+                # Throttled or failed responses are not JSON with the
+                # expected result sets, so they fail while parsing
+                with metrics.span(f"upstream.{endpoint}"):
+                    result = endpoint_cls(**params, timeout=self.timeout_for(endpoint))
+                breaker.record(ok=True)
+                return result
+            except (requests.RequestException, ValueError, KeyError) as e:
+                error = e
+            except Exception:
+                # Not worth retrying, but still a failure: a half-open trial
+                # that is never recorded would keep the circuit open for good
+                breaker.record(ok=False)
+                raise
+            if attempt < self.retries:
+                time.sleep(self.backoff * 2**attempt * random.uniform(0.5, 1.5))
+
+        breaker.record(ok=False)
+        raise UpstreamError(
+            endpoint, f"failed after {self.retries + 1} attempts: {error}"
+        )
+
+
+transport = Transport()
@@ -1,79 +1,151 @@
+# app/utils.py
+from functools import lru_cache
+
+import numpy as np
+import plotly.graph_objects as go
+
+# Court geometry in the ShotChartDetail coordinate system: tenths of feet,
+# with the rim at the origin and the baseline at y=-47.5
+COURT_X = (-250, 250)
+COURT_Y = (-47.5, 422.5)
+KEY_WIDTH = 160
+KEY_HEIGHT = 190
+FREE_THROW_CIRCLE_RADIUS = 60
+RESTRICTED_RADIUS = 40
+RIM_RADIUS = 7.5
+BACKBOARD_WIDTH = 60
+BACKBOARD_Y = -7.5
+THREE_POINT_RADIUS = 237.5
+THREE_POINT_CORNER_X = 220
+CENTER_CIRCLE_RADIUS = 60
+
+COURT_STYLES = ("raster", "vector")
+COURT_IMAGE = "images/shot_chart.png"
+
+
+def _arc_path(radius, start, end, center=(0, 0), points=64):
+    """SVG path approximating an arc from the start to the end angle, in radians"""
+    angles = np.linspace(start, end, points)
+    xs = center[0] + radius * np.cos(angles)
+    ys = center[1] + radius * np.sin(angles)
+    return "M " + " L ".join(f"{x:.1f} {y:.1f}" for x, y in zip(xs, ys))
+
+
+@lru_cache(maxsize=None)
+def court_shapes(line_color="white", line_width=2):
+    """Court lines as layout shapes, computed once per line style"""
+    line = dict(color=line_color, width=line_width)
+
+    def shape(**kwargs):
+        return dict(xref="x", yref="y", line=line, layer="below", **kwargs)
+
+    # The arc meets the corner threes where |x| = THREE_POINT_CORNER_X
+    corner = np.arccos(THREE_POINT_CORNER_X / THREE_POINT_RADIUS)
+    three_point = _arc_path(THREE_POINT_RADIUS, np.pi - corner, corner)
+    x0, x1 = COURT_X
+    y0, y1 = COURT_Y
+
+    return (
+        shape(type="rect", x0=x0, y0=y0, x1=x1, y1=y1),
+        shape(
+            type="path",
+            path=(
+                f"M {-THREE_POINT_CORNER_X} {y0} "
+                f"{three_point.replace('M', 'L', 1)} L {THREE_POINT_CORNER_X} {y0}"
+            ),
+        ),
+        shape(
+            type="rect",
+            x0=-KEY_WIDTH / 2,
+            y0=y0,
+            x1=KEY_WIDTH / 2,
+            y1=y0 + KEY_HEIGHT,
+        ),
+        shape(
+            type="circle",
+            x0=-FREE_THROW_CIRCLE_RADIUS,
+            y0=y0 + KEY_HEIGHT - FREE_THROW_CIRCLE_RADIUS,
+            x1=FREE_THROW_CIRCLE_RADIUS,
+            y1=y0 + KEY_HEIGHT + FREE_THROW_CIRCLE_RADIUS,
+        ),
+        shape(type="path", path=_arc_path(RESTRICTED_RADIUS, np.pi, 0)),
+        shape(
+            type="line",
+            x0=-BACKBOARD_WIDTH / 2,
+            y0=BACKBOARD_Y,
+            x1=BACKBOARD_WIDTH / 2,
+            y1=BACKBOARD_Y,
+        ),
+        shape(
+            type="circle",
+            x0=-RIM_RADIUS,
+            y0=-RIM_RADIUS,
+            x1=RIM_RADIUS,
+            y1=RIM_RADIUS,
+        ),
+        shape(
+            type="path", path=_arc_path(CENTER_CIRCLE_RADIUS, np.pi, 2 * np.pi, (0, y1))
+        ),
+    )
+
+
 def draw_court(fig, line_color="white", line_width=2):
     """
-    Returns a figure with basketball court lines
+    Returns a figure with basketball court lines, in shot chart coordinates
     """
-    # Court dimensions (in feet, NBA coordinate system)
-    court_width = 50
-    key_width = 16
-    backboard_width = 6
-    rim_radius = 0.75
-    three_point_radius = 23.75
-    three_point_side_radius = 22
-    key_height = 19
-    free_throw_circle_radius = 6
-    restricted_circle_radius = 4
-
-    # Draw the three point arc
-    fig.add_shape(
-        type="path",
-        path=f"M {-three_point_side_radius} 0 L {-three_point_side_radius} {14} A {three_point_radius} {three_point_radius} 0 1 1 {three_point_side_radius} {14} L {three_point_side_radius} 0",
-        line=dict(color=line_color, width=line_width),
-        layer="below",
-    )
-
-    # Draw key box
-    fig.add_shape(
-        type="rect",
-        x0=-key_width / 2,
-        y0=0,
-        x1=key_width / 2,
-        y1=key_height,
-        line=dict(color=line_color, width=line_width),
-        layer="below",
-    )
+    fig.update_layout(shapes=fig.layout.shapes + court_shapes(line_color, line_width))
+    return fig
 
-    # Draw free throw circle
-    fig.add_shape(
-        type="circle",
-        x0=-free_throw_circle_radius,
-        y0=key_height - free_throw_circle_radius,
-        x1=free_throw_circle_radius,
-        y1=key_height + free_throw_circle_radius,
-        line=dict(color=line_color, width=line_width),
-        layer="below",
-    )
 
-    # Draw restricted area
-    fig.add_shape(
-        type="circle",
-        x0=-restricted_circle_radius,
-        y0=-restricted_circle_radius,
-        x1=restricted_circle_radius,
-        y1=restricted_circle_radius,
-        line=dict(color=line_color, width=line_width),
-        layer="below",
-    )
+@lru_cache(maxsize=None)
+def court_layout(court="raster", image_url=None):
+    """
+    Shot chart layout (axes, colours, size and the court as a background
+    image or as vector shapes) validated once per court style and returned as
+    a plain dict, with the default plotly template resolved into it. It is
+    shared by every request, so treat it as read-only.
+    """
+    if court not in COURT_STYLES:
+        raise ValueError(f"Unknown court style {court!r}")
 
-    # Draw backboard
-    fig.add_shape(
-        type="line",
-        x0=-backboard_width / 2,
-        y0=4,
-        x1=backboard_width / 2,
-        y1=4,
-        line=dict(color=line_color, width=line_width),
-        layer="below",
+    axis = dict(showgrid=False, zeroline=False, showticklabels=False, showline=False)
+    layout = go.Layout(
+        legend_title_text="Shot Outcome",
+        xaxis=dict(axis, range=list(COURT_X), scaleanchor="y", scaleratio=1),
+        yaxis=dict(axis, range=list(COURT_Y)),
+        paper_bgcolor="#1e1e1e",
+        plot_bgcolor="rgba(0,0,0,0)",  # Transparent background
+        margin=dict(l=0, r=0, t=30, b=0),
+        height=700,  # Fixed height
+        width=800,  # Fixed width
     )
+    if court == "vector":
+        layout.shapes = court_shapes()
+    else:
+        layout.images = [
+            dict(
+                source=image_url,
+                xref="x",
+                yref="y",
+                x=COURT_X[0],
+                y=COURT_Y[1],
+                sizex=COURT_X[1] - COURT_X[0],
+                sizey=COURT_Y[1] - COURT_Y[0],
+                sizing="stretch",
+                opacity=1,
+                layer="below",
+            )
+        ]
+    return go.Figure(layout=layout).to_plotly_json()["layout"]
 
-    # Draw rim
-    fig.add_shape(
-        type="circle",
-        x0=-rim_radius,
-        y0=-rim_radius,
-        x1=rim_radius,
-        y1=rim_radius,
-        line=dict(color=line_color, width=line_width),
-        layer="below",
-    )
 
-    return fig
+def court_figure(traces, court="raster", image_url=None, **layout):
+    """
+    Figure dict of the given trace dicts on the shared court layout. Only
+    the top level of the layout is copied; per-figure keys such as title
+    replace the shared values instead of modifying them.
+    """
+    return {
+        "data": list(traces),
+        "layout": {**court_layout(court, image_url), **layout},
+    }
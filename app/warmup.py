@@ -0,0 +1,104 @@
+# app/warmup.py
+import importlib
+import threading
+import time
+
+from flask import jsonify, url_for
+
+from .density import league_bins
+from .models import ShotChart
+from .player_index import player_index
+from .store import shot_store
+from .utils import COURT_IMAGE, court_layout
+
+# Heavy modules the app imports on first use rather than at startup. A
+# preloading master imports them once here for every worker to share.
+LAZY_IMPORTS = ("nba_api.stats.endpoints", "plotly.express")
+
+
+def _libraries(app):
+    for name in LAZY_IMPORTS:
+        importlib.import_module(name)
+
+
+def _player_index(app):
+    player_index.load()
+
+
+def _court(app):
+    # The same arguments home() passes, so its first request hits the cache
+    with app.test_request_context():
+        court_layout(
+            app.config.get("COURT_STYLE", "raster"),
+            url_for("static", filename=COURT_IMAGE),
+        )
+
+
+def _templates(app):
+    app.jinja_env.get_template("index.html")
+
+
+def _league_density(app):
+    # Completed seasons only, the density cache never holds the current one
+    for season in shot_store.seasons():
+        if not ShotChart.is_current_season(season):
+            league_bins(season)
+
+
+# League baselines are already loaded by create_app
+STEPS = [
+    ("libraries", _libraries),
+    ("player_index", _player_index),
+    ("court", _court),
+    ("templates", _templates),
+    ("league_density", _league_density),
+]
+
+
+class Warmup:
+    """
+    Builds the state each worker would otherwise build lazily on its first
+    requests. The production entry point runs it in the gunicorn master
+    before workers fork, so they share it copy-on-write; /readyz answers 503
+    until it has finished. A process that never warms up, such as a flask
+    CLI command, builds the state lazily and is ready from the start.
+    """
+
+    def __init__(self):
+        self.steps = {}
+        self.started = False
+        self.finished = False
+
+    def init_app(self, app):
+        app.add_url_rule("/healthz", "healthz", self.healthz)
+        app.add_url_rule("/readyz", "readyz", self.readyz)
+
+    def run(self, app):
+        self.started = True
+        with app.app_context():
+            for name, step in STEPS:
+                start = time.perf_counter()
+                try:
+                    step(app)
+                    self.steps[name] = round(time.perf_counter() - start, 3)
+                except Exception as e:
+                    # A cold cache is slower, not broken, so keep going
+                    print(f"Error warming up {name}: {e}")
+                    self.steps[name] = None
+        self.finished = True
+
+    def start(self, app):
+        """Warm up in the background, for servers that do not preload"""
+        self.started = True
+        threading.Thread(target=self.run, args=(app,), daemon=True).start()
+
+    def healthz(self):
+        return jsonify({"status": "ok"})
+
+    def readyz(self):
+        ready = self.finished or not self.started
+        payload = {"ready": ready, "steps": self.steps}
+        return jsonify(payload), 200 if ready else 503
+
+
+warmup = Warmup()
@@ -0,0 +1,324 @@
+# benchmarks/bench_home.py
+"""
+End-to-end benchmark of the home() page for a single game, a season, a
+multi-season career and a pre-tracking season, and of a three-player
+comparison, replayed offline from recorded stats API responses.
+
+The committed fixtures are synthetic, generated from the test stub server
+with realistic season sizes. They can be regenerated, or replaced with a
+recording of stats.nba.com (needs network access):
+
+    python -m benchmarks.bench_home record --synthetic
+    python -m benchmarks.bench_home record
+
+Then, from the repository root and without network access:
+
+    python -m benchmarks.bench_home run
+    python -m benchmarks.bench_home run --save-baseline
+
+A run writes its results as JSON and compares them with the stored
+baseline, exiting non-zero if any timing or page size regressed by more
+than the threshold.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from importlib.metadata import version
+
+from config import Config
+
+from .replay import FIXTURE_DIR, FixtureRecorder, FixtureServer
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+RESULTS_PATH = os.path.join(BENCH_DIR, "results.json")
+
+# Stands in for the season opener's game id, looked up from the game log
+SEASON_OPENER = object()
+
+SCENARIOS = {
+    "game": {"player": "Stephen Curry", "season": "2015-16", "game": SEASON_OPENER},
+    "season": {"player": "Stephen Curry", "season": "2015-16"},
+    "career": {
+        "player": "Stephen Curry",
+        "season": "career",
+        "from": "2011-12",
+        "to": "2016-17",
+    },
+    "basic": {"player": "Michael Jordan", "season": "1990-91"},
+    "compare": {
+        "path": "/compare",
+        "player": ["Stephen Curry", "LeBron James", "Kevin Durant"],
+        "season": "2015-16",
+    },
+}
+
+# Versions recorded with each run, since they move the numbers most
+PACKAGES = ["flask", "pandas", "numpy", "plotly", "nba_api"]
+
+# Timing increases smaller than this are noise, whatever their ratio
+NOISE_FLOOR_MS = 1.0
+
+# Server-Timing stages reported per scenario, when the page has them
+STAGES = ["career", "stats", "compare", "figure", "to_html", "template"]
+
+# Synthetic fixture sizes, close to a starter's regular season
+SYNTHETIC_GAMES = 80
+SYNTHETIC_SHOTS_PER_GAME = 20
+
+
+class MissingFixtures(RuntimeError):
+    """The replay has no recorded response for a call a scenario makes"""
+
+
+def bench_config(base_url, replay=True):
+    """App config with every cache off, so each request does the full work"""
+
+    class BenchConfig(Config):
+        NBA_STATS_BASE_URL = base_url
+        SHOT_CACHE_DIR = None
+        PAGE_CACHE_MAX_ENTRIES = 0
+        SHOT_STORE_PATH = None
+        LEAGUE_BASELINES_PATH = None
+        SINGLEFLIGHT_DIR = None
+        SINGLEFLIGHT_SHARE_TTL = 0
+        SERVER_TIMING = True
+
+    if replay:
+        BenchConfig.UPSTREAM_RATE = 0
+        BenchConfig.UPSTREAM_RETRIES = 0
+    return BenchConfig
+
+
+def parse_server_timing(header):
+    """{stage: milliseconds} from a Server-Timing header"""
+    stages = {}
+    for entry in filter(None, (part.strip() for part in header.split(","))):
+        name, _, duration = entry.partition(";dur=")
+        stages[name] = float(duration or 0)
+    return stages
+
+
+def scenario_query(client, params):
+    """Query string for a scenario, resolving the season opener's game id"""
+    if params.get("game") is not SEASON_OPENER:
+        return params
+    response = client.get(f"/get_games/{params['player']}/{params['season']}")
+    games = response.get_json()["games"] if response.status_code == 200 else []
+    if not games:
+        raise RuntimeError(f"No games for {params['player']} {params['season']}")
+    # Most recent first
+    return {**params, "game": games[-1]["id"]}
+
+
+def measure(client, query):
+    from app.career import career_aggregator
+
+    # Completed career seasons would otherwise be served from memory
+    career_aggregator.clear()
+    path = query.get("path", "/")
+    query = {key: value for key, value in query.items() if key != "path"}
+    start = time.perf_counter()
+    response = client.get(path, query_string=query)
+    elapsed = time.perf_counter() - start
+    if response.status_code != 200:
+        raise RuntimeError(f"{path} returned {response.status_code} for {query}")
+
+    stages = parse_server_timing(response.headers.get("Server-Timing", ""))
+    sample = {
+        "home_ms": elapsed * 1000,
+        "upstream_ms": sum(
+            duration
+            for stage, duration in stages.items()
+            if stage.startswith("upstream-")
+        ),
+        "html_bytes": len(response.data),
+    }
+    for stage in STAGES:
+        if stage in stages:
+            sample[f"{stage}_ms"] = stages[stage]
+    return sample
+
+
+def environment():
+    return {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        **{package: version(package) for package in PACKAGES},
+    }
+
+
+def run(repeat=5, scenarios=None):
+    """Median of `repeat` cold home() requests per scenario"""
+    from app import create_app
+
+    if not os.path.isdir(FIXTURE_DIR) or not os.listdir(FIXTURE_DIR):
+        raise MissingFixtures(f"No fixtures in {FIXTURE_DIR}")
+
+    server = FixtureServer().start()
+    try:
+        client = create_app(bench_config(server.base_url)).test_client()
+        names = scenarios or list(SCENARIOS)
+        queries = {name: scenario_query(client, SCENARIOS[name]) for name in names}
+
+        samples = {name: [] for name in names}
+        # The first round only warms up imports and lazily built state
+        for round_ in range(repeat + 1):
+            for name, query in queries.items():
+                sample = measure(client, query)
+                if round_:
+                    samples[name].append(sample)
+    except RuntimeError:
+        # Unrecorded calls surface as upstream errors, name them instead
+        if not server.missing:
+            raise
+        server.report_missing()
+        raise MissingFixtures(
+            f"Replay is missing {len(server.missing)} fixtures"
+        ) from None
+    finally:
+        server.stop()
+
+    return {
+        "meta": {**environment(), "repeat": repeat},
+        "scenarios": {
+            name: {
+                metric: round(statistics.median(s[metric] for s in runs), 2)
+                for metric in runs[0]
+            }
+            for name, runs in samples.items()
+        },
+    }
+
+
+def record(upstream=None, synthetic=False):
+    """
+    Fetch every scenario once, saving the responses: from the real upstream,
+    or from the test stub server when synthetic
+    """
+    from app import create_app
+    from app.transport import transport
+
+    stub = None
+    if synthetic:
+        from tests.stub import StubServer
+
+        stub = StubServer(games=SYNTHETIC_GAMES, shots=SYNTHETIC_SHOTS_PER_GAME).start()
+        upstream = stub.base_url
+    try:
+        app = create_app(bench_config(upstream, replay=synthetic))
+        recorder = FixtureRecorder()
+        transport.session.hooks["response"].append(recorder)
+        client = app.test_client()
+        for name, params in SCENARIOS.items():
+            measure(client, scenario_query(client, params))
+            print(f"{name}: recorded")
+    finally:
+        if stub is not None:
+            stub.stop()
+    print(f"Saved {recorder.recorded} responses to {recorder.fixture_dir}")
+
+
+def compare(results, baseline, threshold):
+    """Rows of (scenario, metric, baseline, current, change, regressed)"""
+    rows = []
+    for name, metrics in results["scenarios"].items():
+        previous = baseline["scenarios"].get(name, {})
+        for metric, value in metrics.items():
+            if metric not in previous:
+                continue
+            before = previous[metric]
+            change = (value - before) / before if before else 0.0
+            regressed = change > threshold
+            if metric.endswith("_ms"):
+                regressed = regressed and value - before >= NOISE_FLOOR_MS
+            rows.append((name, metric, before, value, change, regressed))
+    return rows
+
+
+def print_results(results, rows):
+    compared = {(name, metric): row for name, metric, *row in rows}
+    for name, metrics in results["scenarios"].items():
+        print(name)
+        for metric, value in metrics.items():
+            line = f"  {metric:<13} {value:>12,}"
+            if (name, metric) in compared:
+                before, _, change, regressed = compared[(name, metric)]
+                line += f"  baseline {before:>12,}  {change:+7.1%}"
+                line += "  REGRESSED" if regressed else ""
+            print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_home")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = commands.add_parser("record", help="record upstream fixtures")
+    record_parser.add_argument(
+        "--upstream", help="stats host to record from (default: stats.nba.com)"
+    )
+    record_parser.add_argument(
+        "--synthetic",
+        action="store_true",
+        help="record generated responses from the test stub server instead",
+    )
+
+    run_parser = commands.add_parser("run", help="replay fixtures and time home()")
+    run_parser.add_argument("--repeat", type=int, default=5)
+    run_parser.add_argument("--scenario", action="append", choices=list(SCENARIOS))
+    run_parser.add_argument("--output", default=RESULTS_PATH)
+    run_parser.add_argument("--baseline", default=BASELINE_PATH)
+    run_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="relative increase counted as a regression (default: 0.25)",
+    )
+    run_parser.add_argument(
+        "--save-baseline", action="store_true", help="store this run as the baseline"
+    )
+
+    args = parser.parse_args(argv)
+    if args.command == "record":
+        record(args.upstream, args.synthetic)
+        return 0
+
+    try:
+        results = run(args.repeat, args.scenario)
+    except MissingFixtures as e:
+        print(
+            f"{e}. Record them with `python -m benchmarks.bench_home record "
+            "--synthetic` (offline) or `record` (stats.nba.com).",
+            file=sys.stderr,
+        )
+        return 2
+    rows = []
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            rows = compare(results, json.load(f), args.threshold)
+    results["regressions"] = [
+        {"scenario": name, "metric": metric, "baseline": before, "current": value}
+        for name, metric, before, value, _, regressed in rows
+        if regressed
+    ]
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+
+    print_results(results, rows)
+    print(f"Wrote {args.output}")
+    return 1 if results["regressions"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+# benchmarks/bench_import.py
+"""
+Cold start budget: how long a fresh interpreter takes to import the app and
+run create_app(), which every worker restart and flask CLI call pays before
+doing anything else. Also checks that the heavy modules the app imports on
+first use were not pulled in at startup.
+
+From the repository root:
+
+    python -m benchmarks.bench_import
+    python -m benchmarks.bench_import --budget 1.5 --repeat 7
+
+Exits non-zero if the median startup exceeds the budget or a lazily
+imported module was loaded eagerly.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Seconds for import plus create_app(), with pandas, numpy and flask as the
+# bulk of it; leaves headroom for slower machines
+DEFAULT_BUDGET = 1.5
+
+# Modules that must stay out of startup: the endpoint package and
+# plotly.express are imported on first use, and plotly.offline drags in
+# IPython when installed
+EAGER_FORBIDDEN = [
+    "nba_api.stats.endpoints",
+    "plotly.express",
+    "plotly.offline",
+    "IPython",
+]
+
+# Runs in a fresh interpreter with nothing else loaded. The caches and
+# stores stay off so only imports and app setup are timed.
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+from app import create_app
+from config import Config
+
+class ProbeConfig(Config):
+    SHOT_CACHE_DIR = None
+    SHOT_STORE_PATH = None
+    LEAGUE_BASELINES_PATH = None
+    SINGLEFLIGHT_DIR = None
+
+create_app(ProbeConfig)
+elapsed = time.perf_counter() - start
+print(json.dumps({"seconds": elapsed, "modules": sorted(sys.modules)}))
+"""
+
+
+def probe():
+    """(seconds, loaded module names) for one cold start"""
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=ROOT,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    # create_app may print, the probe's result is the last line
+    result = json.loads(output.strip().splitlines()[-1])
+    return result["seconds"], set(result["modules"])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_import")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=DEFAULT_BUDGET,
+        help=f"seconds allowed for the median cold start (default: {DEFAULT_BUDGET})",
+    )
+    args = parser.parse_args(argv)
+
+    timings, eager = [], set()
+    for _ in range(args.repeat):
+        seconds, modules = probe()
+        timings.append(seconds)
+        eager.update(name for name in EAGER_FORBIDDEN if name in modules)
+
+    median = statistics.median(timings)
+    print(f"startup  median {median:.3f}s  min {min(timings):.3f}s  ", end="")
+    print(f"max {max(timings):.3f}s  budget {args.budget:.3f}s")
+
+    failed = False
+    if median > args.budget:
+        print(f"Startup is over budget by {median - args.budget:.3f}s")
+        failed = True
+    for name in sorted(eager):
+        print(f"{name} was imported at startup")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
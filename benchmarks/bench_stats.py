@@ -0,0 +1,75 @@
+# benchmarks/bench_stats.py
+"""
+Micro-benchmark for the zone/summary stats engine.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_stats
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.stats import add_free_throws, compute_shot_stats, format_shot_stats
+
+ZONES = [
+    ("Restricted Area", "2PT Field Goal"),
+    ("In The Paint (Non-RA)", "2PT Field Goal"),
+    ("Mid-Range", "2PT Field Goal"),
+    ("Left Corner 3", "3PT Field Goal"),
+    ("Right Corner 3", "3PT Field Goal"),
+    ("Above the Break 3", "3PT Field Goal"),
+    ("Backcourt", "3PT Field Goal"),
+]
+
+# Single game, a typical season and a full career of shots
+SIZES = [25, 1_500, 25_000]
+
+
+def synthetic_shots(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    zone_idx = rng.integers(0, len(ZONES), rows)
+    return pd.DataFrame(
+        {
+            "GAME_ID": rng.integers(0, max(rows // 20, 1), rows).astype(str),
+            "SHOT_ZONE_BASIC": [ZONES[i][0] for i in zone_idx],
+            "SHOT_TYPE": [ZONES[i][1] for i in zone_idx],
+            "SHOT_MADE_FLAG": (rng.random(rows) < 0.46).astype(int),
+        }
+    )
+
+
+def best_of(func, repeat=20):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run():
+    results = {}
+    for rows in SIZES:
+        shots_df = synthetic_shots(rows)
+
+        def compute():
+            stats = compute_shot_stats(shots_df, per36_multiplier=1.05)
+            return add_free_throws(stats, 120, 140, shots_df["GAME_ID"].nunique())
+
+        stats = compute()
+        results[rows] = {
+            "compute_ms": best_of(compute) * 1000,
+            "format_ms": best_of(lambda: format_shot_stats(stats, per36=True)) * 1000,
+        }
+    return results
+
+
+if __name__ == "__main__":
+    for rows, timings in run().items():
+        print(
+            f"{rows:>7} shots  compute {timings['compute_ms']:7.2f} ms  "
+            f"format {timings['format_ms']:7.2f} ms"
+        )
@@ -0,0 +1,113 @@
+# benchmarks/replay.py
+"""
+Recorded stats API responses for offline benchmarks.
+
+Each response is stored gzipped under benchmarks/fixtures/, keyed by its
+endpoint and query parameters, and served back by a local HTTP server that
+the app reaches through NBA_STATS_BASE_URL.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlparse
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def fixture_key(endpoint, params):
+    """File name for an endpoint call, independent of parameter order"""
+    canonical = json.dumps(sorted(params), separators=(",", ":"))
+    digest = hashlib.sha1(canonical.encode()).hexdigest()[:16]
+    return f"{endpoint.lower()}-{digest}.json.gz"
+
+
+def split_url(url):
+    parsed = urlparse(url)
+    endpoint = parsed.path.rstrip("/").split("/")[-1]
+    return endpoint, parse_qsl(parsed.query, keep_blank_values=True)
+
+
+class FixtureRecorder:
+    """requests response hook saving every successful stats response"""
+
+    def __init__(self, fixture_dir=FIXTURE_DIR):
+        self.fixture_dir = fixture_dir
+        self.recorded = 0
+
+    def __call__(self, response, *args, **kwargs):
+        if response.status_code != 200:
+            return response
+        endpoint, params = split_url(response.url)
+        os.makedirs(self.fixture_dir, exist_ok=True)
+        path = os.path.join(self.fixture_dir, fixture_key(endpoint, params))
+        fixture = {"endpoint": endpoint, "params": params, "body": response.text}
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            json.dump(fixture, f)
+        self.recorded += 1
+        return response
+
+
+class FixtureServer:
+    """
+    Serves recorded responses on 127.0.0.1. A call without a fixture gets a
+    404 and is remembered in `missing`, so a run can tell it replayed an
+    incomplete recording instead of timing error pages.
+    """
+
+    def __init__(self, fixture_dir=FIXTURE_DIR):
+        self.fixture_dir = fixture_dir
+        self.missing = set()
+        self._bodies = {}
+        self._server = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _body(self, endpoint, params):
+        name = fixture_key(endpoint, params)
+        if name not in self._bodies:
+            try:
+                with gzip.open(os.path.join(self.fixture_dir, name), "rb") as f:
+                    self._bodies[name] = json.loads(f.read())["body"].encode()
+            except FileNotFoundError:
+                self.missing.add((endpoint, tuple(params)))
+                return None
+        return self._bodies[name]
+
+    def start(self):
+        fixtures = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = fixtures._body(*split_url(self.path))
+                if body is None:
+                    self.send_error(404, "No recorded fixture")
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def report_missing(self):
+        for endpoint, params in sorted(self.missing):
+            print(f"Missing fixture: {endpoint} {dict(params)}", file=sys.stderr)
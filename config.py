@@ -4,7 +4,73 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+basedir = os.path.abspath(os.path.dirname(__file__))
+
 
 class Config:
     SECRET_KEY = os.environ.get("SECRET_KEY") or "dev-key"
     FLASK_ENV = os.environ.get("FLASK_ENV") or "development"
+
+    # Upstream stats host; point at a local stub server to run offline
+    NBA_STATS_BASE_URL = os.environ.get("NBA_STATS_BASE_URL")
+    # Max nba_api calls in flight at once per worker
+    UPSTREAM_MAX_CONCURRENCY = int(os.environ.get("UPSTREAM_MAX_CONCURRENCY") or 4)
+    # Shared transport: token bucket, retries, timeouts and circuit breaker.
+    # Rate and burst are totals for the deployment; each of the
+    # UPSTREAM_WORKERS processes gets an equal share in its own bucket.
+    UPSTREAM_RATE = float(os.environ.get("UPSTREAM_RATE") or 3.0)
+    UPSTREAM_BURST = int(os.environ.get("UPSTREAM_BURST") or 6)
+    UPSTREAM_WORKERS = int(
+        os.environ.get("UPSTREAM_WORKERS") or os.environ.get("WEB_CONCURRENCY") or 1
+    )
+    UPSTREAM_RETRIES = int(os.environ.get("UPSTREAM_RETRIES") or 2)
+    UPSTREAM_BACKOFF = float(os.environ.get("UPSTREAM_BACKOFF") or 0.5)
+    UPSTREAM_TIMEOUT = float(os.environ.get("UPSTREAM_TIMEOUT") or 10)
+    UPSTREAM_BREAKER_THRESHOLD = int(os.environ.get("UPSTREAM_BREAKER_THRESHOLD") or 5)
+    UPSTREAM_BREAKER_RESET = float(os.environ.get("UPSTREAM_BREAKER_RESET") or 30)
+
+    # Concurrent identical fetches share one call within a worker; with a
+    # directory set, across workers too (file locks, results kept briefly)
+    SINGLEFLIGHT_DIR = os.environ.get("SINGLEFLIGHT_DIR")
+    SINGLEFLIGHT_SHARE_TTL = float(os.environ.get("SINGLEFLIGHT_SHARE_TTL") or 10)
+
+    # On-disk shot chart cache (TTL applies to the current season only)
+    SHOT_CACHE_DIR = os.environ.get("SHOT_CACHE_DIR") or os.path.join(
+        basedir, "cache", "shots"
+    )
+    SHOT_CACHE_TTL = int(os.environ.get("SHOT_CACHE_TTL") or 3600)
+    SHOT_CACHE_MAX_BYTES = int(
+        os.environ.get("SHOT_CACHE_MAX_BYTES") or 512 * 1024 * 1024
+    )
+
+    # Refresh current-season game logs and shots with only the games played
+    # since the last fetch, instead of the whole season
+    INCREMENTAL_REFRESH = os.environ.get("INCREMENTAL_REFRESH", "1").lower() in (
+        "1",
+        "true",
+        "on",
+    )
+
+    # Rendered page cache; set PAGE_CACHE_MAX_ENTRIES=0 to disable
+    PAGE_CACHE_MAX_ENTRIES = int(os.environ.get("PAGE_CACHE_MAX_ENTRIES") or 256)
+    PAGE_CACHE_TTL = int(os.environ.get("PAGE_CACHE_TTL") or 300)
+    PAGE_CACHE_HISTORICAL_TTL = int(
+        os.environ.get("PAGE_CACHE_HISTORICAL_TTL") or 24 * 60 * 60
+    )
+    PAGE_CACHE_STALE_TTL = int(os.environ.get("PAGE_CACHE_STALE_TTL") or 3600)
+
+    # League-wide shot store filled by `flask ingest-shots`
+    SHOT_STORE_PATH = os.environ.get("SHOT_STORE_PATH") or os.path.join(
+        basedir, "data", "shots.db"
+    )
+
+    # League zone/distance baselines written by `flask build-baselines`
+    LEAGUE_BASELINES_PATH = os.environ.get("LEAGUE_BASELINES_PATH") or os.path.join(
+        basedir, "data", "league_baselines.parquet"
+    )
+
+    # Shot chart court: "raster" background image or "vector" line shapes
+    COURT_STYLE = os.environ.get("COURT_STYLE") or "raster"
+
+    # Add a Server-Timing header with per-stage durations to every response
+    SERVER_TIMING = os.environ.get("SERVER_TIMING", "").lower() in ("1", "true", "on")
@@ -0,0 +1,32 @@
+# gunicorn.conf.py
+import multiprocessing
+import os
+
+wsgi_app = "wsgi:app"
+bind = os.environ.get("BIND") or f"0.0.0.0:{os.environ.get('PORT') or 8000}"
+
+# Requests mostly wait on the upstream stats API, so each worker runs threads
+workers = int(os.environ.get("WEB_CONCURRENCY") or multiprocessing.cpu_count() + 1)
+# Each worker limits upstream calls to its share of UPSTREAM_RATE
+os.environ.setdefault("UPSTREAM_WORKERS", str(workers))
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS") or 4)
+
+# Warm up once in the master, then fork workers that share the warm state
+preload_app = True
+
+# Room for upstream retries with backoff on a slow stats API
+timeout = int(os.environ.get("GUNICORN_TIMEOUT") or 60)
+graceful_timeout = 30
+keepalive = 5
+
+accesslog = "-"
+
+
+def post_fork(server, worker):
+    from app.context import fetch_pool
+    from app.transport import transport
+
+    # Thread pools and pooled keep-alive sockets must not be shared by forks
+    fetch_pool.reset()
+    transport.install_session()
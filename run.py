@@ -1,7 +1,12 @@
 # run.py
 from app import create_app
+from app.warmup import warmup
 
 app = create_app()
 
 if __name__ == "__main__":
+    # Development server: warm up in the background, /readyz reports when
+    # done. Not on import, as the flask CLI (FLASK_APP=run.py) imports this
+    # module for every command, which should not pay for a warm-up.
+    warmup.start(app)
     app.run(debug=True)
@@ -0,0 +1,57 @@
+# tests/conftest.py
+import pytest
+
+from app import create_app
+from config import Config
+from tests.stub import StubServer
+
+
+@pytest.fixture(scope="session")
+def stub():
+    server = StubServer().start()
+    yield server
+    server.stop()
+
+
+def offline_config(base_url, **overrides):
+    """App config against the stub server, with every cache and limiter off"""
+
+    class TestConfig(Config):
+        TESTING = True
+        NBA_STATS_BASE_URL = base_url
+        UPSTREAM_RATE = 0
+        UPSTREAM_RETRIES = 0
+        SHOT_CACHE_DIR = None
+        SHOT_STORE_PATH = None
+        LEAGUE_BASELINES_PATH = None
+        SINGLEFLIGHT_DIR = None
+        SINGLEFLIGHT_SHARE_TTL = 0
+        PAGE_CACHE_MAX_ENTRIES = 0
+        INCREMENTAL_REFRESH = False
+
+    for name, value in overrides.items():
+        setattr(TestConfig, name, value)
+    return TestConfig
+
+
+@pytest.fixture
+def make_app(stub):
+    """create_app() against the stub; keyword arguments override the config"""
+    from app.career import career_aggregator
+
+    def make(**overrides):
+        # The aggregator is module-level and outlives any one app
+        career_aggregator.clear()
+        return create_app(offline_config(stub.base_url, **overrides))
+
+    return make
+
+
+@pytest.fixture
+def app(make_app):
+    return make_app()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
@@ -0,0 +1,303 @@
+# tests/stub.py
+"""
+A stand-in for stats.nba.com on 127.0.0.1, serving small synthetic payloads
+in the shapes nba_api parses. The app reaches it through NBA_STATS_BASE_URL.
+"""
+
+import json
+import random
+import threading
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlparse
+
+GAMES_PER_SEASON = 10
+SHOTS_PER_GAME = 20
+
+# (SHOT_ZONE_BASIC, SHOT_ZONE_RANGE, SHOT_TYPE)
+ZONES = [
+    ("Restricted Area", "Less Than 8 ft.", "2PT Field Goal"),
+    ("In The Paint (Non-RA)", "8-16 ft.", "2PT Field Goal"),
+    ("Mid-Range", "16-24 ft.", "2PT Field Goal"),
+    ("Left Corner 3", "24+ ft.", "3PT Field Goal"),
+    ("Right Corner 3", "24+ ft.", "3PT Field Goal"),
+    ("Above the Break 3", "24+ ft.", "3PT Field Goal"),
+    ("Backcourt", "Back Court Shot", "3PT Field Goal"),
+]
+
+SHOT_HEADERS = [
+    "GRID_TYPE",
+    "GAME_ID",
+    "GAME_EVENT_ID",
+    "PLAYER_ID",
+    "PLAYER_NAME",
+    "TEAM_ID",
+    "TEAM_NAME",
+    "PERIOD",
+    "MINUTES_REMAINING",
+    "SECONDS_REMAINING",
+    "EVENT_TYPE",
+    "ACTION_TYPE",
+    "SHOT_TYPE",
+    "SHOT_ZONE_BASIC",
+    "SHOT_ZONE_AREA",
+    "SHOT_ZONE_RANGE",
+    "SHOT_DISTANCE",
+    "LOC_X",
+    "LOC_Y",
+    "SHOT_ATTEMPTED_FLAG",
+    "SHOT_MADE_FLAG",
+    "GAME_DATE",
+    "HTM",
+    "VTM",
+]
+
+GAME_LOG_HEADERS = [
+    "SEASON_ID",
+    "Player_ID",
+    "Game_ID",
+    "GAME_DATE",
+    "MATCHUP",
+    "WL",
+    "MIN",
+    "FGM",
+    "FGA",
+    "FG_PCT",
+    "FG3M",
+    "FG3A",
+    "FG3_PCT",
+    "FTM",
+    "FTA",
+    "FT_PCT",
+    "OREB",
+    "DREB",
+    "REB",
+    "AST",
+    "STL",
+    "BLK",
+    "TOV",
+    "PF",
+    "PTS",
+    "PLUS_MINUS",
+    "VIDEO_AVAILABLE",
+]
+
+CAREER_RESULT_SETS = [
+    "SeasonTotalsRegularSeason",
+    "CareerTotalsRegularSeason",
+    "SeasonTotalsPostSeason",
+    "CareerTotalsPostSeason",
+    "SeasonTotalsAllStarSeason",
+    "CareerTotalsAllStarSeason",
+    "SeasonTotalsCollegeSeason",
+    "CareerTotalsCollegeSeason",
+    "SeasonRankingsRegularSeason",
+    "SeasonRankingsPostSeason",
+]
+
+
+def result_set(name, headers, rows):
+    return {"name": name, "headers": headers, "rowSet": rows}
+
+
+def season_games(season, games=GAMES_PER_SEASON):
+    """(game id, game date) for every game of a season, oldest first"""
+    year = int(season[:4])
+    opener = date(year, 10, 28)
+    return [
+        (f"002{year % 100:02d}{i + 1:05d}", opener + timedelta(days=2 * i))
+        for i in range(games)
+    ]
+
+
+def parse_date_from(value):
+    """DateFrom parameter (MM/DD/YYYY) as a date, or None"""
+    if not value:
+        return None
+    month, day, year = map(int, value.split("/"))
+    return date(year, month, day)
+
+
+def shot_chart(params, games=GAMES_PER_SEASON, shots=SHOTS_PER_GAME):
+    player_id, season = int(params["PlayerID"]), params["Season"]
+    date_from = parse_date_from(params.get("DateFrom"))
+    rng = random.Random(player_id * 10000 + int(season[:4]))
+    rows = []
+    for game_id, game_date in season_games(season, games):
+        for event in range(shots):
+            zone, zone_range, shot_type = rng.choice(ZONES)
+            made = int(rng.random() < 0.45)
+            x, y = rng.randint(-250, 250), rng.randint(-47, 400)
+            if params.get("GameID") and params["GameID"] != game_id:
+                continue
+            if date_from and game_date < date_from:
+                continue
+            rows.append(
+                [
+                    "Shot Chart Detail",
+                    game_id,
+                    event,
+                    player_id,
+                    "Stub Player",
+                    1610612744,
+                    "Golden State Warriors",
+                    1,
+                    5,
+                    30,
+                    "Made Shot" if made else "Missed Shot",
+                    "Jump Shot",
+                    shot_type,
+                    zone,
+                    "Center(C)",
+                    zone_range,
+                    int((x * x + y * y) ** 0.5 / 10),
+                    x,
+                    y,
+                    1,
+                    made,
+                    f"{game_date:%Y%m%d}",
+                    "GSW",
+                    "LAL",
+                ]
+            )
+    return {
+        "resultSets": [
+            result_set("Shot_Chart_Detail", SHOT_HEADERS, rows),
+            result_set("LeagueAverages", ["GRID_TYPE"], []),
+        ]
+    }
+
+
+def game_log(params, games=GAMES_PER_SEASON, **sizes):
+    player_id, season = int(params["PlayerID"]), params["Season"]
+    date_from = parse_date_from(params.get("DateFrom"))
+    rows = []
+    # Most recent first, as the endpoint returns them
+    season_log = enumerate(season_games(season, games))
+    for i, (game_id, game_date) in reversed(list(season_log)):
+        if date_from and game_date < date_from:
+            continue
+        minutes = "34:30" if i % 2 else 33
+        rows.append(
+            [
+                f"2{season[:4]}",
+                player_id,
+                game_id,
+                f"{game_date:%b %d, %Y}".upper(),
+                "GSW vs. LAL",
+                "W",
+                minutes,
+                10,
+                20,
+                0.5,
+                4,
+                9,
+                0.444,
+                6,
+                7,
+                0.857,
+                1,
+                4,
+                5,
+                6,
+                1,
+                0,
+                3,
+                2,
+                30,
+                10,
+                1,
+            ]
+        )
+    return {"resultSets": [result_set("PlayerGameLog", GAME_LOG_HEADERS, rows)]}
+
+
+def player_info(params, **sizes):
+    return {
+        "resultSets": [
+            result_set(
+                "CommonPlayerInfo",
+                ["PERSON_ID", "FROM_YEAR", "TO_YEAR"],
+                [[int(params["PlayerID"]), 2009, 2016]],
+            ),
+            result_set("PlayerHeadlineStats", ["PLAYER_ID"], []),
+            result_set("AvailableSeasons", ["SEASON_ID"], []),
+        ]
+    }
+
+
+def career_stats(params, **sizes):
+    headers = ["SEASON_ID", "GP", "FGM", "FGA", "FG3M", "FG3A", "FTM", "FTA"]
+    rows = [["2199091", 82, 990, 1837, 29, 93, 571, 671]]
+    return {
+        "resultSets": [
+            result_set(
+                name, headers, rows if name.startswith("SeasonTotalsReg") else []
+            )
+            for name in CAREER_RESULT_SETS
+        ]
+    }
+
+
+ENDPOINTS = {
+    "shotchartdetail": shot_chart,
+    "playergamelog": game_log,
+    "commonplayerinfo": player_info,
+    "playercareerstats": career_stats,
+}
+
+
+class StubServer:
+    """
+    Serves ENDPOINTS on 127.0.0.1 and records every call as (endpoint,
+    params), so tests can assert what the app asked for. Seasons have
+    `games` games of `shots` shots each.
+    """
+
+    def __init__(self, games=GAMES_PER_SEASON, shots=SHOTS_PER_GAME):
+        self.sizes = {"games": games, "shots": shots}
+        self.calls = []
+        self._lock = threading.Lock()
+        self._server = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def endpoint_calls(self, endpoint):
+        with self._lock:
+            return [params for name, params in self.calls if name == endpoint]
+
+    def start(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                endpoint = url.path.rstrip("/").split("/")[-1].lower()
+                params = dict(parse_qsl(url.query, keep_blank_values=True))
+                with stub._lock:
+                    stub.calls.append((endpoint, params))
+                if endpoint not in ENDPOINTS:
+                    self.send_error(404, "Unknown endpoint")
+                    return
+                payload = ENDPOINTS[endpoint](params, **stub.sizes)
+                body = json.dumps(payload).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
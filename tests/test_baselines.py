@@ -0,0 +1,153 @@
+# tests/test_baselines.py
+import os
+
+import pandas as pd
+import pytest
+
+from app.baselines import (
+    BASELINE_COLUMNS,
+    DISTANCE_LABELS,
+    build_season,
+    compute_baselines,
+    league_baselines,
+)
+from app.models import normalize_shots
+from app.stats import FREE_THROW_ZONE, add_free_throws, compute_shot_stats
+from app.store import shot_store
+from tests.stub import shot_chart
+
+SEASON = "2015-16"
+PLAYER_IDS = (201939, 2544, 201142)
+
+
+def stub_frame(player_id, season=SEASON):
+    result = shot_chart({"PlayerID": player_id, "Season": season})
+    shots = result["resultSets"][0]
+    return pd.DataFrame(shots["rowSet"], columns=shots["headers"])
+
+
+@pytest.fixture(autouse=True)
+def no_baselines():
+    yield
+    league_baselines.path = None
+    league_baselines.table = None
+    league_baselines._zone_fg = {}
+
+
+@pytest.fixture
+def store_app(make_app, tmp_path):
+    """An app whose shot store holds three players' SEASON"""
+    app = make_app(
+        SHOT_STORE_PATH=str(tmp_path / "shots.db"),
+        LEAGUE_BASELINES_PATH=str(tmp_path / "baselines.parquet"),
+    )
+    with shot_store.connect() as conn:
+        for player_id in PLAYER_IDS:
+            shot_store.save_player_season(
+                conn, SEASON, player_id, stub_frame(player_id)
+            )
+    yield app
+    shot_store.path = None
+
+
+def test_compute_baselines_by_zone_type_and_distance():
+    shots_df = pd.DataFrame(
+        {
+            "SHOT_ZONE_BASIC": ["Restricted Area"] * 3 + ["Left Corner 3"],
+            "SHOT_TYPE": ["2PT Field Goal"] * 3 + ["3PT Field Goal"],
+            "SHOT_DISTANCE": [0, 2, 5, 23],
+            "SHOT_MADE_FLAG": [1, 1, 0, 1],
+        }
+    )
+
+    table = compute_baselines(shots_df, SEASON)
+
+    assert list(table.columns) == BASELINE_COLUMNS
+    rows = table.set_index(["Group", "Bucket"])
+    rim = rows.loc[("zone", "Restricted Area")]
+    assert rim["Attempts"] == 3
+    assert rim["FG%"] == pytest.approx(200 / 3)
+    assert rim["AttemptRate"] == pytest.approx(0.75)
+    assert rim["PointsPerShot"] == pytest.approx(4 / 3)
+    # Shot types are keyed by the zone table's summary row names
+    assert rows.loc[("type", "3PT Field Goals"), "PointsPerShot"] == 3
+    # Distance buckets are left-closed, empty ones are dropped
+    distance = rows.loc["distance"]
+    assert distance["Attempts"].to_dict() == {"0-3 ft": 2, "4-9 ft": 1, "16-23 ft": 1}
+    assert set(distance.index) <= set(DISTANCE_LABELS)
+
+
+def test_build_season_from_the_store(store_app):
+    table = build_season(SEASON)
+
+    everyone = pd.concat([stub_frame(player_id) for player_id in PLAYER_IDS])
+    expected = compute_baselines(everyone.reset_index(drop=True), SEASON)
+    pd.testing.assert_frame_equal(table, expected)
+    assert build_season("2014-15") is None
+
+
+def test_build_baselines_command_keeps_other_seasons(store_app):
+    runner = store_app.test_cli_runner()
+
+    result = runner.invoke(args=["build-baselines", SEASON])
+
+    assert result.exit_code == 0, result.output
+    assert os.path.exists(league_baselines.path)
+    written = pd.read_parquet(league_baselines.path)
+    assert set(written["Season"].astype(str)) == {SEASON}
+
+    with shot_store.connect() as conn:
+        shot_store.save_player_season(conn, "2014-15", 1, stub_frame(1, "2014-15"))
+    result = runner.invoke(args=["build-baselines", "2014-15"])
+
+    assert result.exit_code == 0, result.output
+    written = pd.read_parquet(league_baselines.path)
+    assert set(written["Season"].astype(str)) == {"2014-15", SEASON}
+
+
+def test_build_baselines_command_needs_ingested_shots(store_app):
+    result = store_app.test_cli_runner().invoke(args=["build-baselines", "2013-14"])
+
+    assert result.exit_code != 0
+    assert "No seasons were built" in result.output
+
+
+def player_stats(player_id=PLAYER_IDS[0]):
+    shots_df = normalize_shots(stub_frame(player_id))
+    stats = compute_shot_stats(shots_df)
+    return add_free_throws(stats, 35, 40, shots_df["GAME_ID"].nunique())
+
+
+def test_compare_joins_league_fg_by_zone(store_app):
+    table = build_season(SEASON)
+    league_baselines.load(table)
+    stats = player_stats()
+
+    compared = league_baselines.compare(stats, SEASON).set_index("Zone")
+
+    league = table[table["Group"].isin(["zone", "type"])]
+    league = league.set_index(league["Bucket"].astype(str))["FG%"]
+    for zone, row in compared.drop(FREE_THROW_ZONE).iterrows():
+        assert row["League FG%"] == pytest.approx(league[zone])
+        assert row["vs League"] == pytest.approx(row["FG%"] - league[zone])
+    # Free throws have no baseline
+    assert compared.loc[FREE_THROW_ZONE, ["League FG%", "vs League"]].isna().all()
+    # The join keeps the zone table's rows and order
+    assert compared.index.tolist() == stats["Zone"].tolist()
+
+
+def test_compare_leaves_unbuilt_seasons_alone(store_app):
+    league_baselines.load(build_season(SEASON))
+    stats = player_stats()
+
+    pd.testing.assert_frame_equal(league_baselines.compare(stats, "2014-15"), stats)
+
+
+def test_baselines_load_from_the_configured_path(store_app, make_app):
+    store_app.test_cli_runner().invoke(args=["build-baselines", SEASON])
+    path = league_baselines.path
+    league_baselines._zone_fg = {}
+
+    make_app(LEAGUE_BASELINES_PATH=path, SHOT_STORE_PATH=shot_store.path)
+
+    assert "League FG%" in league_baselines.compare(player_stats(), SEASON)
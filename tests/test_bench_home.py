@@ -0,0 +1,20 @@
+# tests/test_bench_home.py
+from benchmarks import bench_home
+
+
+def test_committed_fixtures_cover_every_scenario():
+    results = bench_home.run(repeat=1)
+
+    assert set(results["scenarios"]) == set(bench_home.SCENARIOS)
+
+
+def test_missing_fixtures_exit_with_a_message(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(bench_home, "FIXTURE_DIR", str(tmp_path / "fixtures"))
+
+    status = bench_home.main(["run", "--output", str(tmp_path / "results.json")])
+
+    assert status == 2
+    error = capsys.readouterr().err
+    assert "No fixtures in" in error
+    assert "record --synthetic" in error
+    assert not (tmp_path / "results.json").exists()
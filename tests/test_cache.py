@@ -0,0 +1,122 @@
+# tests/test_cache.py
+import os
+import time
+
+import pandas as pd
+import pytest
+
+from app.cache import ShotCache
+from app.models import ShotChart, normalize_shots
+from tests.stub import shot_chart
+
+SEASON = "2015-16"
+
+
+def stub_frame(player_id, season=SEASON):
+    result = shot_chart({"PlayerID": player_id, "Season": season})
+    shots = result["resultSets"][0]
+    return pd.DataFrame(shots["rowSet"], columns=shots["headers"])
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ShotCache(cache_dir=str(tmp_path / "shots"), ttl=60)
+
+
+def age(cache, player_id, seconds, season=SEASON):
+    """Backdate an entry's write time"""
+    path = cache._path(player_id, season)
+    written = time.time() - seconds
+    os.utime(path, (written, written))
+
+
+@pytest.mark.parametrize("normalized", [False, True])
+def test_round_trip_through_normalize_shots(cache, normalized):
+    shots_df = stub_frame(1)
+    if normalized:
+        shots_df = normalize_shots(shots_df)
+
+    cache.set(1, SEASON, None, shots_df)
+    cached = cache.get(1, SEASON)
+
+    pd.testing.assert_frame_equal(normalize_shots(cached), normalize_shots(shots_df))
+
+
+def test_game_entries_are_separate(cache):
+    season_df = stub_frame(1)
+    game_id = season_df["GAME_ID"].iloc[0]
+    game_df = season_df[season_df["GAME_ID"] == game_id]
+
+    cache.set(1, SEASON, None, season_df)
+    cache.set(1, SEASON, game_id, game_df)
+
+    assert len(cache.get(1, SEASON)) == len(season_df)
+    assert len(cache.get(1, SEASON, game_id)) == len(game_df)
+    assert cache.get(2, SEASON) is None
+
+
+def test_completed_seasons_never_expire(cache, monkeypatch):
+    monkeypatch.setattr(ShotChart, "current_season", staticmethod(lambda: "2016-17"))
+    cache.set(1, SEASON, None, stub_frame(1))
+    age(cache, 1, 365 * 24 * 60 * 60)
+
+    assert cache.get(1, SEASON) is not None
+
+
+def test_current_season_expires_after_ttl(cache, monkeypatch):
+    monkeypatch.setattr(ShotChart, "current_season", staticmethod(lambda: SEASON))
+    cache.set(1, SEASON, None, stub_frame(1))
+
+    age(cache, 1, cache.ttl - 5)
+    assert cache.get(1, SEASON) is not None
+    age(cache, 1, cache.ttl + 5)
+    assert cache.get(1, SEASON) is None
+
+
+def test_empty_frames_are_not_cached(cache):
+    cache.set(1, SEASON, None, stub_frame(1).iloc[:0])
+
+    assert cache.get(1, SEASON) is None
+
+
+def test_least_recently_read_entries_are_evicted(cache):
+    for player_id in (1, 2):
+        cache.set(player_id, SEASON, None, stub_frame(player_id))
+    entry_size = os.path.getsize(cache._path(1, SEASON))
+    cache.max_bytes = int(entry_size * 2.5)
+    # Entry 1 was written first but read last
+    now = time.time()
+    os.utime(cache._path(1, SEASON), (now - 100, now - 100))
+    os.utime(cache._path(2, SEASON), (now - 200, now - 100))
+    cache.get(1, SEASON)
+
+    cache.set(3, SEASON, None, stub_frame(3))
+
+    assert cache.get(2, SEASON) is None
+    assert cache.get(1, SEASON) is not None
+    assert cache.get(3, SEASON) is not None
+
+
+def test_size_is_counted_once_and_tracked_while_under_cap(cache, monkeypatch):
+    walks = []
+    real_walk = os.walk
+
+    def counting_walk(*args, **kwargs):
+        walks.append(args)
+        return real_walk(*args, **kwargs)
+
+    monkeypatch.setattr(os, "walk", counting_walk)
+    for player_id in (1, 2, 3):
+        cache.set(player_id, SEASON, None, stub_frame(player_id))
+    # Rewriting an entry replaces its size rather than adding to it
+    cache.set(1, SEASON, None, stub_frame(1))
+
+    assert len(walks) == 1
+    sizes = [os.path.getsize(cache._path(p, SEASON)) for p in (1, 2, 3)]
+    assert cache._size == sum(sizes)
+
+    # Going over the cap walks again to evict and recount
+    cache.max_bytes = sum(sizes)
+    cache.set(4, SEASON, None, stub_frame(4))
+    assert len(walks) == 2
+    assert cache._size <= cache.max_bytes
@@ -0,0 +1,147 @@
+# tests/test_density.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.density import (
+    BIN_COLUMNS,
+    HEX_SIZE,
+    DensityCache,
+    density_cache,
+    hexbin,
+    shot_density,
+)
+from app.models import ShotChart, normalize_shots
+from app.store import shot_store
+from tests.stub import shot_chart
+
+CURRY_ID = 201939
+
+
+def stub_frame(player_id, season):
+    result = shot_chart({"PlayerID": player_id, "Season": season})
+    shots = result["resultSets"][0]
+    return pd.DataFrame(shots["rowSet"], columns=shots["headers"])
+
+
+@pytest.fixture(autouse=True)
+def empty_density_cache():
+    density_cache.clear()
+    yield
+    density_cache.clear()
+
+
+def test_hexbin_counts_attempts_and_makes_per_cell():
+    # Three shots at the rim, one from the corner
+    bins = hexbin([0, 2, -2, 220], [0, 1, -1, 0], [1, 0, 1, 1])
+
+    assert len(bins) == 2
+    assert bins["Attempts"].sum() == 4
+    rim = bins.loc[bins["X"].abs() < HEX_SIZE].iloc[0]
+    assert (rim["Attempts"], rim["Made"]) == (3, 2)
+    assert rim["FGPercent"] == pytest.approx(200 / 3)
+    # Cell centres lie within one hex of the shots they hold
+    corner = bins.loc[bins["X"] > 100].iloc[0]
+    assert np.hypot(corner["X"] - 220, corner["Y"]) <= HEX_SIZE
+
+
+def test_hexbin_cells_are_stable_across_calls():
+    shots = stub_frame(CURRY_ID, "2015-16")
+
+    first = hexbin(shots["LOC_X"], shots["LOC_Y"], shots["SHOT_MADE_FLAG"])
+    subset = shots.iloc[: len(shots) // 2]
+    second = hexbin(subset["LOC_X"], subset["LOC_Y"], subset["SHOT_MADE_FLAG"])
+
+    # The same court location always maps to the same packed key
+    assert set(second.index) <= set(first.index)
+    assert first["Attempts"].sum() == len(shots)
+
+
+def test_cache_keeps_completed_seasons_only(monkeypatch):
+    monkeypatch.setattr(ShotChart, "current_season", staticmethod(lambda: "2016-17"))
+    cache = DensityCache()
+    builds = []
+
+    def build():
+        builds.append(1)
+        return "grid"
+
+    for season in ("2015-16", "2015-16", "2016-17", "2016-17"):
+        cache.get_or_build(("player", season), season, build)
+
+    # Built once for the completed season, every time for the live one
+    assert len(builds) == 3
+
+
+def test_cache_does_not_keep_missing_grids():
+    cache = DensityCache()
+    builds = []
+
+    def build():
+        builds.append(1)
+        return None
+
+    cache.get_or_build("league", "2015-16", build)
+    cache.get_or_build("league", "2015-16", build)
+
+    assert len(builds) == 2
+
+
+def test_cache_evicts_least_recently_used():
+    cache = DensityCache(max_entries=2)
+    cache.get_or_build("a", "2015-16", lambda: "a")
+    cache.get_or_build("b", "2015-16", lambda: "b")
+    cache.get_or_build("a", "2015-16", lambda: "rebuilt")
+    cache.get_or_build("c", "2015-16", lambda: "c")
+
+    assert cache.get_or_build("a", "2015-16", lambda: "rebuilt") == "a"
+    assert cache.get_or_build("b", "2015-16", lambda: "rebuilt") == "rebuilt"
+
+
+def test_league_comparison_appears_after_ingest(make_app, tmp_path):
+    make_app(SHOT_STORE_PATH=str(tmp_path / "shots.db"))
+    try:
+        # The store exists, but the season is not ingested yet
+        with shot_store.connect() as conn:
+            shot_store.save_player_season(conn, "2014-15", 1, stub_frame(1, "2014-15"))
+        shots_df = normalize_shots(stub_frame(CURRY_ID, "2015-16"))
+
+        before = shot_density(shots_df, CURRY_ID, "2015-16")
+        assert before["Diff"].isna().all()
+
+        with shot_store.connect() as conn:
+            for player_id in (CURRY_ID, 2544, 201142):
+                shot_store.save_player_season(
+                    conn, "2015-16", player_id, stub_frame(player_id, "2015-16")
+                )
+
+        after = shot_density(shots_df, CURRY_ID, "2015-16")
+        assert after["Diff"].notna().all()
+        assert list(after.columns) == BIN_COLUMNS
+    finally:
+        shot_store.path = None
+
+
+def test_api_density_payload(client):
+    response = client.get(f"/api/density/{CURRY_ID}/2015-16")
+
+    assert response.status_code == 200
+    payload = response.get_json()
+    assert (payload["player_id"], payload["season"], payload["game_id"]) == (
+        CURRY_ID,
+        "2015-16",
+        None,
+    )
+    bins = payload["bins"]
+    assert set(bins) == {"x", "y", "attempts", "made", "fg_pct", "diff"}
+    assert len({len(column) for column in bins.values()}) == 1
+    assert sum(bins["attempts"]) == len(stub_frame(CURRY_ID, "2015-16"))
+    # No shot store in tests, so no league comparison
+    assert set(bins["diff"]) == {None}
+
+
+def test_api_density_unknown_player(client):
+    response = client.get("/api/density/1/2015-16")
+
+    assert response.status_code == 404
+    assert "not found" in response.get_json()["error"]
@@ -0,0 +1,115 @@
+# tests/test_export.py
+import json
+import os
+
+import pytest
+
+from app.export import MANIFEST, export_charts, load_manifest
+from app.models import ShotChart
+from tests.stub import season_games
+
+SEASON = "2015-16"
+CURRY = ("Stephen Curry", SEASON, None)
+FILENAME = "Stephen_Curry_2015-16_shot_chart.html"
+
+
+@pytest.fixture
+def export(app, tmp_path):
+    """Run export_charts as html into one directory, collecting its log"""
+    out_dir = str(tmp_path / "exports")
+    lines = []
+
+    def run(jobs=(CURRY,), **kwargs):
+        with app.app_context():
+            return export_charts(
+                list(jobs), out_dir, fmt="html", workers=1, log=lines.append, **kwargs
+            )
+
+    run.out_dir = out_dir
+    run.lines = lines
+    return run
+
+
+def data_calls(stub):
+    return len(stub.endpoint_calls("shotchartdetail")) + len(
+        stub.endpoint_calls("playergamelog")
+    )
+
+
+def test_export_writes_charts_and_a_manifest(export):
+    assert export() == (1, 0, 0)
+
+    assert os.path.exists(os.path.join(export.out_dir, FILENAME))
+    manifest = load_manifest(export.out_dir)
+    assert set(manifest["files"]) == {FILENAME}
+    assert [job["file"] for job in manifest["jobs"].values()] == [FILENAME]
+    assert export.lines == [f"Wrote {FILENAME}"]
+
+
+def test_unchanged_completed_season_is_skipped_before_fetching(export, stub):
+    export()
+    calls = data_calls(stub)
+
+    assert export() == (0, 1, 0)
+    assert data_calls(stub) == calls
+
+
+def test_game_chart_is_skipped_before_fetching(export, stub):
+    game_id, _ = season_games(SEASON)[0]
+    export([("Stephen Curry", SEASON, game_id)])
+    calls = data_calls(stub)
+
+    assert export([("Stephen Curry", SEASON, game_id)]) == (0, 1, 0)
+    assert data_calls(stub) == calls
+
+
+def test_changed_settings_fetch_and_render_again(export, stub):
+    export()
+    calls = data_calls(stub)
+
+    assert export(width=1000) == (1, 0, 0)
+    assert data_calls(stub) > calls
+    assert export(width=1000) == (0, 1, 0)
+
+
+def test_deleted_or_forced_charts_are_rendered_again(export):
+    export()
+    os.remove(os.path.join(export.out_dir, FILENAME))
+
+    assert export() == (1, 0, 0)
+    assert export(force=True) == (1, 0, 0)
+
+
+def test_current_season_is_fetched_but_unchanged_figures_are_skipped(
+    export, stub, monkeypatch
+):
+    monkeypatch.setattr(ShotChart, "current_season", staticmethod(lambda: SEASON))
+    export()
+    calls = data_calls(stub)
+
+    # New games could have been played, so the data is checked upstream
+    assert export() == (0, 1, 0)
+    assert data_calls(stub) > calls
+
+
+def test_unknown_players_fail_without_touching_the_manifest(export):
+    assert export([("Nobody Atall", SEASON, None)]) == (0, 0, 1)
+    assert "Player Nobody Atall not found." in export.lines[0]
+    assert load_manifest(export.out_dir) == {"files": {}, "jobs": {}}
+
+
+def test_older_manifests_still_skip_unchanged_figures(export, stub):
+    export()
+    path = os.path.join(export.out_dir, MANIFEST)
+    with open(path) as f:
+        files = json.load(f)["files"]
+    with open(path, "w") as f:
+        json.dump(files, f)
+    calls = data_calls(stub)
+
+    # Fetched once to fingerprint the figure, then skipped without fetching
+    assert export() == (0, 1, 0)
+    assert data_calls(stub) > calls
+    calls = data_calls(stub)
+    assert export() == (0, 1, 0)
+    assert data_calls(stub) == calls
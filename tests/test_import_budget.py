@@ -0,0 +1,28 @@
+# tests/test_import_budget.py
+"""Cold start guard; benchmarks/bench_import.py reports the same in detail"""
+
+import os
+import statistics
+
+import pytest
+
+from benchmarks.bench_import import EAGER_FORBIDDEN, probe
+
+
+def test_no_eager_imports_at_startup():
+    _, modules = probe()
+
+    eager = [name for name in EAGER_FORBIDDEN if name in modules]
+    assert not eager, f"imported at startup: {eager}"
+
+
+@pytest.mark.skipif(
+    not os.environ.get("IMPORT_BUDGET"),
+    reason="timings vary by machine; set IMPORT_BUDGET (seconds) to check them",
+)
+def test_cold_start_within_budget():
+    budget = float(os.environ["IMPORT_BUDGET"])
+
+    timings = [probe()[0] for _ in range(3)]
+
+    assert statistics.median(timings) <= budget, timings
@@ -0,0 +1,91 @@
+# tests/test_metrics.py
+import threading
+
+import pandas as pd
+import pytest
+
+from app.metrics import Metrics, metrics
+from app.refresh import IncrementalRefresh
+from app.singleflight import SingleFlight
+
+
+def exported(registry):
+    return registry.export().get_data(as_text=True)
+
+
+def sample(text, line_start):
+    """Value of the sample line starting with line_start, or 0"""
+    for line in text.splitlines():
+        if line.startswith(line_start + " "):
+            return float(line.split()[-1])
+    return 0
+
+
+def test_event_counters_are_exported_under_their_own_names():
+    registry = Metrics()
+    registry.count("shot_cache", "hit")
+    registry.increment("singleflight_joins_total", fetch="shots", scope="worker")
+    registry.increment("singleflight_joins_total", fetch="shots", scope="worker")
+
+    text = exported(registry)
+
+    assert "# TYPE shotchart_singleflight_joins_total counter" in text
+    assert "# TYPE shotchart_incremental_refresh_total counter" in text
+    assert (
+        sample(text, 'shotchart_singleflight_joins_total{fetch="shots",scope="worker"}')
+        == 2
+    )
+    # Cache lookups only hold caches
+    lookups = [
+        line
+        for line in text.splitlines()
+        if line.startswith("shotchart_cache_lookups_total{")
+    ]
+    assert lookups == [
+        'shotchart_cache_lookups_total{cache="shot_cache",result="hit"} 1'
+    ]
+
+
+def test_unknown_event_counter_is_rejected():
+    with pytest.raises(ValueError):
+        Metrics().increment("typo_total")
+
+
+def test_single_flight_counts_joins():
+    flights = SingleFlight(share_ttl=0)
+    started, release = threading.Event(), threading.Event()
+
+    def fetch():
+        started.set()
+        release.wait(5)
+        return 42
+
+    label = 'shotchart_singleflight_joins_total{fetch="test",scope="worker"}'
+    before = sample(exported(metrics), label)
+    leader = threading.Thread(target=flights.do, args=(("test", 1), fetch))
+    leader.start()
+    started.wait(5)
+    follower = threading.Thread(target=flights.do, args=(("test", 1), fetch))
+    follower.start()
+    # Let the follower find the flight before it lands
+    while sample(exported(metrics), label) == before:
+        follower.join(0.01)
+    release.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert sample(exported(metrics), label) == before + 1
+
+
+def test_incremental_refresh_counts_results():
+    refresh = IncrementalRefresh()
+    frame = pd.DataFrame({"GAME_ID": ["1"], "GAME_DATE": ["20151027"]})
+    label = 'shotchart_incremental_refresh_total{kind="test",result="%s"}'
+    before = {r: sample(exported(metrics), label % r) for r in ("full", "delta")}
+
+    for _ in range(3):
+        refresh.refresh("test", 1, "2015-16", lambda date_from: frame, "GAME_ID")
+
+    after = {r: sample(exported(metrics), label % r) for r in ("full", "delta")}
+    assert after["full"] - before["full"] == 1
+    assert after["delta"] - before["delta"] == 2
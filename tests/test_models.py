@@ -0,0 +1,126 @@
+# tests/test_models.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.models import SHOT_SCHEMA, ShotChart, normalize_shots
+from app.store import shot_store
+from tests.stub import season_games, shot_chart
+
+CURRY_ID = 201939
+SEASON = "2015-16"
+
+
+def stub_shots(**params):
+    result = shot_chart({"PlayerID": CURRY_ID, "Season": SEASON, **params})
+    headers = result["resultSets"][0]["headers"]
+    return pd.DataFrame(result["resultSets"][0]["rowSet"], columns=headers)
+
+
+@pytest.fixture
+def stored_app(make_app, tmp_path):
+    """An app whose shot store holds Curry's first six games of SEASON"""
+    app = make_app(SHOT_STORE_PATH=str(tmp_path / "shots.db"))
+    _, last_stored = season_games(SEASON)[5]
+    shots_df = stub_shots()
+    shots_df = shots_df[shots_df["GAME_DATE"] <= f"{last_stored:%Y%m%d}"]
+    with shot_store.connect() as conn:
+        shot_store.save_player_season(conn, SEASON, CURRY_ID, shots_df)
+    yield app, last_stored
+    shot_store.path = None
+
+
+def curry_shot_calls(stub):
+    return [
+        params
+        for params in stub.endpoint_calls("shotchartdetail")
+        if params["PlayerID"] == str(CURRY_ID) and params["Season"] == SEASON
+    ]
+
+
+def test_completed_season_is_read_from_store(stored_app, stub):
+    app, _ = stored_app
+    calls = len(curry_shot_calls(stub))
+
+    with app.app_context():
+        shots_df, _ = ShotChart.get_player_shots("Stephen Curry", SEASON)
+
+    assert shots_df["GAME_ID"].nunique() == 6
+    assert len(curry_shot_calls(stub)) == calls
+
+
+def test_current_season_refreshes_past_the_store(stored_app, stub, monkeypatch):
+    app, last_stored = stored_app
+    monkeypatch.setattr(ShotChart, "current_season", staticmethod(lambda: SEASON))
+
+    with app.app_context():
+        shots_df, _ = ShotChart.get_player_shots("Stephen Curry", SEASON)
+
+    # Only games from the last ingested date on are fetched
+    assert curry_shot_calls(stub)[-1]["DateFrom"] == f"{last_stored:%m/%d/%Y}"
+    assert shots_df["GAME_ID"].nunique() == len(season_games(SEASON))
+    assert len(shots_df) == len(stub_shots())
+
+
+def assert_schema(shots_df):
+    assert list(shots_df.columns) == list(SHOT_SCHEMA)
+    assert dict(shots_df.dtypes) == SHOT_SCHEMA
+
+
+def test_normalize_shots_projects_onto_the_schema():
+    raw = stub_shots()
+
+    shots_df = normalize_shots(raw)
+
+    assert_schema(shots_df)
+    assert len(shots_df) == len(raw)
+    assert shots_df["GAME_ID"].tolist() == raw["GAME_ID"].astype(int).tolist()
+    assert (
+        shots_df["SHOT_MADE_FLAG"].tolist()
+        == raw["SHOT_MADE_FLAG"].astype(bool).tolist()
+    )
+    assert shots_df.memory_usage(deep=True).sum() < raw.memory_usage(deep=True).sum()
+
+
+def test_normalize_shots_is_idempotent():
+    once = normalize_shots(stub_shots())
+
+    pd.testing.assert_frame_equal(normalize_shots(once), once)
+
+
+def test_normalize_shots_of_an_empty_frame_keeps_the_schema():
+    assert_schema(normalize_shots(pd.DataFrame()))
+    assert_schema(normalize_shots(stub_shots().iloc[:0]))
+
+
+def test_normalized_seasons_concatenate_without_losing_categories():
+    seasons = [
+        normalize_shots(stub_shots(Season=season)) for season in ("2014-15", SEASON)
+    ]
+    # One season lacks a zone the other has; fixed categories still line up
+    seasons[0] = seasons[0][seasons[0]["SHOT_ZONE_BASIC"] != "Backcourt"]
+
+    assert_schema(pd.concat(seasons, ignore_index=True))
+
+
+def test_unknown_zones_become_missing_rather_than_new_categories():
+    raw = stub_shots().head(2)
+    raw.loc[raw.index[0], "SHOT_ZONE_BASIC"] = "Half Court"
+
+    zones = normalize_shots(raw)["SHOT_ZONE_BASIC"]
+
+    assert zones.isna().tolist() == [True, False]
+    assert "Half Court" not in zones.cat.categories
+
+
+def test_store_projection_matches_normalized_fetch(stored_app):
+    columns = [*SHOT_SCHEMA, "GAME_DATE"]
+    stored = shot_store.get_shots(CURRY_ID, SEASON, columns=columns)
+    _, last_stored = stored_app
+    expected = stub_shots()
+    expected = expected[expected["GAME_DATE"] <= f"{last_stored:%Y%m%d}"]
+
+    pd.testing.assert_frame_equal(
+        normalize_shots(stored), normalize_shots(expected.reset_index(drop=True))
+    )
+    assert np.array_equal(stored["GAME_DATE"], expected["GAME_DATE"])
@@ -0,0 +1,28 @@
+# tests/test_offline.py
+"""The app rendered end to end against the local stub instead of stats.nba.com"""
+
+CURRY_ID = "201939"
+
+
+def test_home_renders_from_stub(client, stub):
+    response = client.get(
+        "/", query_string={"player": "Stephen Curry", "season": "2015-16"}
+    )
+
+    assert response.status_code == 200
+    page = response.get_data(as_text=True)
+    assert "Stephen Curry's Shot Chart (2015-16)" in page
+    assert "2PT Field Goals" in page
+    for endpoint in ("shotchartdetail", "playergamelog"):
+        calls = stub.endpoint_calls(endpoint)
+        assert any(
+            params["PlayerID"] == CURRY_ID and params["Season"] == "2015-16"
+            for params in calls
+        ), endpoint
+
+
+def test_unknown_player_shows_suggestions(client):
+    response = client.get("/", query_string={"player": "Stephen Curr"})
+
+    assert response.status_code == 200
+    assert "Did you mean Stephen Curry" in response.get_data(as_text=True)
@@ -0,0 +1,73 @@
+# tests/test_page_cache.py
+import time
+
+import pytest
+
+from app.page_cache import page_cache
+
+QUERY = {"player": "Stephen Curry", "season": "2015-16"}
+
+
+@pytest.fixture
+def cached_client(make_app):
+    page_cache.clear()
+    yield make_app(PAGE_CACHE_MAX_ENTRIES=8).test_client()
+    page_cache.clear()
+
+
+def wait_for_refresh(key, timeout=10):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        with page_cache._lock:
+            refreshing = key in page_cache._refreshing
+            entry = page_cache._entries.get(key)
+        if not refreshing:
+            return entry
+        time.sleep(0.01)
+    pytest.fail("background refresh did not finish")
+
+
+def test_stale_page_with_query_string_is_rerendered(cached_client, stub):
+    assert cached_client.get("/", query_string=QUERY).headers["X-Page-Cache"] == "MISS"
+    key = page_cache.make_key(QUERY)
+    stale = page_cache._entries[key]
+    stale.expires = time.time() - 1
+    shot_calls = len(stub.endpoint_calls("shotchartdetail"))
+
+    response = cached_client.get("/", query_string=QUERY)
+    assert response.headers["X-Page-Cache"] == "STALE"
+
+    fresh = wait_for_refresh(key)
+    assert fresh is not stale
+    assert fresh.expires > time.time()
+    # Re-rendered from the same query, not the default player
+    assert "Stephen Curry's Shot Chart (2015-16)" in fresh.body.decode()
+    assert len(stub.endpoint_calls("shotchartdetail")) > shot_calls
+    assert cached_client.get("/", query_string=QUERY).headers["X-Page-Cache"] == "HIT"
+
+
+def test_failed_refresh_is_logged(cached_client, monkeypatch, caplog):
+    cached_client.get("/", query_string=QUERY)
+    key = page_cache.make_key(QUERY)
+    stale = page_cache._entries[key]
+    stale.expires = time.time() - 1
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("render failed")
+
+    monkeypatch.setattr(page_cache, "_render", fail)
+    cached_client.get("/", query_string=QUERY)
+
+    assert wait_for_refresh(key) is stale
+    assert "Error refreshing cached page" in caplog.text
+
+
+def test_name_variants_share_a_page_with_the_canonical_name(cached_client):
+    first = cached_client.get("/", query_string={**QUERY, "player": "stephen CURRY"})
+    second = cached_client.get("/", query_string={**QUERY, "player": "Stephen Curry"})
+
+    assert first.headers["X-Page-Cache"] == "MISS"
+    assert second.headers["X-Page-Cache"] == "HIT"
+    page = second.get_data(as_text=True)
+    assert "Stephen Curry's Shot Chart (2015-16)" in page
+    assert "stephen CURRY" not in page
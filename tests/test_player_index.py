@@ -0,0 +1,125 @@
+# tests/test_player_index.py
+import pytest
+
+from app.player_index import PlayerIndex, normalize_name, player_index
+from app.routes import PLAYERS_PER_PAGE
+
+RECORDS = [
+    {"id": 1, "full_name": "Stephen Curry"},
+    {"id": 2, "full_name": "Seth Curry"},
+    {"id": 3, "full_name": "Nikola Jokić"},
+    {"id": 4, "full_name": "Dell Curry"},
+    {"id": 5, "full_name": "Stephon Marbury"},
+    {"id": 6, "full_name": "Eddy Curry"},
+]
+
+
+@pytest.fixture
+def index():
+    return PlayerIndex().load(RECORDS)
+
+
+def names(players):
+    return [player["full_name"] for player in players]
+
+
+def test_normalize_name_folds_case_accents_and_spaces():
+    assert normalize_name("  Nikola   JOKIĆ ") == "nikola jokic"
+
+
+def test_find_id_ignores_case_and_accents(index):
+    assert index.find_id("nikola jokic") == 3
+    assert index.find_id("STEPHEN CURRY") == 1
+    # Near misses do not resolve to some other player
+    assert index.find_id("Stephen Cury") is None
+
+
+def test_exact_match_ranks_first(index):
+    assert names(index.search("dell curry"))[0] == "Dell Curry"
+
+
+def test_prefix_matches_rank_before_trigram_matches(index):
+    # "step" prefixes Stephen and Stephon; no trigram-only hit outranks them
+    assert names(index.search("step"))[:2] == ["Stephen Curry", "Stephon Marbury"]
+    # Every Curry shares the surname token, sorted by full name
+    assert names(index.search("curry")) == [
+        "Dell Curry",
+        "Eddy Curry",
+        "Seth Curry",
+        "Stephen Curry",
+    ]
+
+
+def test_typos_fall_back_to_trigram_matches(index):
+    results = names(index.search("stephen cury"))
+
+    assert results[0] == "Stephen Curry"
+    assert "Nikola Jokić" not in results
+
+
+def test_accented_and_plain_queries_match_alike(index):
+    assert names(index.search("jokić")) == names(index.search("Jokic"))
+    assert names(index.search("jokic")) == ["Nikola Jokić"]
+
+
+def test_empty_query_lists_everyone_by_name(index):
+    assert names(index.search("")) == sorted(r["full_name"] for r in RECORDS)
+    assert len(index.search("   ", limit=2)) == 2
+
+
+def test_suggest(index):
+    assert index.suggest("Stephen Cury", limit=1) == ["Stephen Curry"]
+    assert index.suggest("") == []
+    assert index.suggest("zzzz") == []
+
+
+def players_page(client, **params):
+    response = client.get("/api/players", query_string=params)
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def test_api_players_result_shape(client):
+    payload = players_page(client, q="stephen curry")
+
+    first = payload["results"][0]
+    assert first == {
+        "id": "Stephen Curry",
+        "text": "Stephen Curry",
+        "player_id": 201939,
+    }
+    assert payload["pagination"] == {"more": False}
+
+
+def test_api_players_pagination_boundaries(client):
+    total = len(player_index.search(""))
+    last_page = -(-total // PLAYERS_PER_PAGE)
+
+    first = players_page(client)
+    assert len(first["results"]) == PLAYERS_PER_PAGE
+    assert first["pagination"]["more"]
+    # Pages below 1 clamp to the first
+    assert players_page(client, page=0) == first
+
+    last = players_page(client, page=last_page)
+    assert len(last["results"]) == total - (last_page - 1) * PLAYERS_PER_PAGE
+    assert not last["pagination"]["more"]
+    assert players_page(client, page=last_page - 1)["pagination"]["more"]
+
+    beyond = players_page(client, page=last_page + 1)
+    assert beyond == {"results": [], "pagination": {"more": False}}
+
+
+def test_api_players_pages_do_not_overlap(client):
+    first = players_page(client, q="james", page=1)["results"]
+    second = players_page(client, q="james", page=2)["results"]
+
+    assert second
+    assert not {p["player_id"] for p in first} & {p["player_id"] for p in second}
+
+
+def test_api_players_folds_accents(client):
+    plain = players_page(client, q="jokic")["results"]
+
+    assert plain == players_page(client, q="Jokić")["results"]
+    assert "Nikola Jokić" in [player["text"] for player in plain]
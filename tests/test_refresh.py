@@ -0,0 +1,188 @@
+# tests/test_refresh.py
+import pandas as pd
+import pytest
+
+from app.models import ShotChart, normalize_shots
+from app.refresh import IncrementalRefresh, last_game_date, season_refresh
+from tests import stub as stub_module
+from tests.stub import SHOTS_PER_GAME, game_log, season_games, shot_chart
+
+CURRY_ID = 201939
+SEASON = "2015-16"
+
+
+class Upstream:
+    """A season that grows by games, fetched like the endpoints are"""
+
+    def __init__(self, endpoint, games=3):
+        self.endpoint = endpoint
+        self.games = games
+        self.date_froms = []
+
+    def __call__(self, date_from):
+        self.date_froms.append(date_from)
+        return self.frame(date_from)
+
+    def frame(self, date_from=""):
+        params = {"PlayerID": CURRY_ID, "Season": SEASON, "DateFrom": date_from}
+        result = self.endpoint(params, games=self.games)["resultSets"][0]
+        return pd.DataFrame(result["rowSet"], columns=result["headers"])
+
+
+def refresh_shots(refresher, upstream, **kwargs):
+    return refresher.refresh(
+        "shots",
+        CURRY_ID,
+        SEASON,
+        upstream,
+        game_column="GAME_ID",
+        prepare=normalize_shots,
+        **kwargs,
+    )
+
+
+def refresh_log(refresher, upstream):
+    return refresher.refresh(
+        "game_log", CURRY_ID, SEASON, upstream, game_column="Game_ID", newest_first=True
+    )
+
+
+def test_last_game_date_reads_both_date_formats():
+    assert last_game_date(["OCT 28, 2015", "NOV 01, 2015"]) == pd.Timestamp(
+        "2015-11-01"
+    )
+    assert last_game_date(["20151028", "20151101"]) == pd.Timestamp("2015-11-01")
+    assert last_game_date([]) is None
+
+
+def test_shots_refresh_fetches_from_the_watermark():
+    refresher = IncrementalRefresh()
+    upstream = Upstream(shot_chart)
+
+    refresh_shots(refresher, upstream)
+    upstream.games = 5
+    shots_df = refresh_shots(refresher, upstream)
+
+    # The last held game's day is fetched again, in case it was still live
+    _, third_game = season_games(SEASON)[2]
+    assert upstream.date_froms == ["", f"{third_game:%m/%d/%Y}"]
+    pd.testing.assert_frame_equal(shots_df, normalize_shots(upstream.frame()))
+
+
+def test_game_log_refresh_keeps_newest_first():
+    refresher = IncrementalRefresh()
+    upstream = Upstream(game_log)
+
+    refresh_log(refresher, upstream)
+    upstream.games = 4
+    games_df = refresh_log(refresher, upstream)
+
+    pd.testing.assert_frame_equal(games_df, upstream.frame())
+
+
+def test_refetched_games_replace_held_ones():
+    refresher = IncrementalRefresh()
+    upstream = Upstream(shot_chart)
+    refresh_shots(refresher, upstream)
+
+    # Nothing new: the watermark game is swapped in, not duplicated
+    shots_df = refresh_shots(refresher, upstream)
+
+    assert len(shots_df) == 3 * SHOTS_PER_GAME
+    assert shots_df["GAME_ID"].value_counts().eq(SHOTS_PER_GAME).all()
+
+
+def test_disabled_refresh_always_fetches_the_season():
+    refresher = IncrementalRefresh(enabled=False)
+    upstream = Upstream(shot_chart)
+
+    refresh_shots(refresher, upstream)
+    refresh_shots(refresher, upstream)
+
+    assert upstream.date_froms == ["", ""]
+
+
+def test_seasons_without_games_are_not_held():
+    refresher = IncrementalRefresh()
+    upstream = Upstream(shot_chart, games=0)
+
+    refresh_shots(refresher, upstream)
+    refresh_shots(refresher, upstream)
+
+    assert upstream.date_froms == ["", ""]
+
+
+def test_seed_stands_in_for_the_first_full_fetch():
+    refresher = IncrementalRefresh()
+    upstream = Upstream(shot_chart, games=5)
+    stored = Upstream(shot_chart, games=2).frame()
+
+    shots_df = refresh_shots(refresher, upstream, seed=lambda: stored)
+
+    _, second_game = season_games(SEASON)[1]
+    assert upstream.date_froms == [f"{second_game:%m/%d/%Y}"]
+    pd.testing.assert_frame_equal(shots_df, normalize_shots(upstream.frame()))
+
+
+def test_empty_seed_falls_back_to_a_full_fetch():
+    refresher = IncrementalRefresh()
+    upstream = Upstream(shot_chart)
+
+    refresh_shots(refresher, upstream, seed=lambda: upstream.frame().iloc[:0])
+
+    assert upstream.date_froms == [""]
+
+
+def test_held_seasons_are_bounded():
+    refresher = IncrementalRefresh(max_entries=1)
+    shots, log = Upstream(shot_chart), Upstream(game_log)
+
+    refresh_shots(refresher, shots)
+    refresh_log(refresher, log)
+    refresh_shots(refresher, shots)
+
+    # Holding the game log pushed the shots out
+    assert shots.date_froms == ["", ""]
+
+
+@pytest.fixture
+def live_season(monkeypatch):
+    """SEASON in progress, with the stub serving a game count tests can grow"""
+    monkeypatch.setattr(ShotChart, "current_season", staticmethod(lambda: SEASON))
+    played = {"games": 3}
+    for name, endpoint in (
+        ("shotchartdetail", shot_chart),
+        ("playergamelog", game_log),
+    ):
+        monkeypatch.setitem(
+            stub_module.ENDPOINTS,
+            name,
+            lambda params, endpoint=endpoint, **sizes: endpoint(
+                params, played["games"]
+            ),
+        )
+    yield played
+    season_refresh._held.clear()
+
+
+def test_app_refreshes_the_current_season_incrementally(make_app, stub, live_season):
+    app = make_app(INCREMENTAL_REFRESH=True)
+    with app.app_context():
+        ShotChart.get_game_log("Stephen Curry", SEASON)
+        ShotChart.get_player_shots("Stephen Curry", SEASON)
+        calls = len(stub.calls)
+        live_season["games"] = 5
+
+        games_df = ShotChart.get_game_log("Stephen Curry", SEASON)
+        shots_df, _ = ShotChart.get_player_shots("Stephen Curry", SEASON)
+
+    new_calls = stub.calls[calls:]
+    assert {endpoint for endpoint, _ in new_calls} == {
+        "shotchartdetail",
+        "playergamelog",
+    }
+    assert all(params["DateFrom"] for _, params in new_calls)
+    assert games_df["Game_ID"].tolist() == [
+        game_id for game_id, _ in reversed(season_games(SEASON, 5))
+    ]
+    assert shots_df["GAME_ID"].nunique() == 5
@@ -0,0 +1,301 @@
+# tests/test_routes.py
+import json
+import re
+
+import pandas as pd
+import pytest
+
+from app.compare import MAX_PLAYERS, Comparison
+from app.models import normalize_shots
+from app.routes import chart_filename
+from app.stats import add_free_throws, compute_shot_stats
+from tests import stub as stub_module
+from tests.stub import GAMES_PER_SEASON, SHOTS_PER_GAME
+
+CURRY_ID = 201939
+LEBRON_ID = 2544
+
+
+def chart_traces(page, div_id="shot-chart"):
+    """The data argument of a chart's Plotly.newPlot call"""
+    marker = f'"{div_id}",'
+    start = page.index(marker, page.index("Plotly.newPlot"))
+    rest = page[start + len(marker) :].lstrip()
+    traces, _ = json.JSONDecoder().raw_decode(rest)
+    return traces
+
+
+def test_career_view_has_made_and_missed_traces(client):
+    response = client.get(
+        "/",
+        query_string={
+            "player": "Stephen Curry",
+            "season": "career",
+            "from": "2013-14",
+            "to": "2015-16",
+        },
+    )
+
+    assert response.status_code == 200
+    traces = {
+        trace["name"]: trace for trace in chart_traces(response.get_data(as_text=True))
+    }
+    # A boolean SHOT_MADE_FLAG once mapped to NaN, leaving both traces empty
+    assert set(traces) == {"Made", "Missed"}
+    assert all(len(trace["x"]) > 0 for trace in traces.values())
+    total = sum(len(trace["x"]) for trace in traces.values())
+    assert total == 3 * GAMES_PER_SEASON * SHOTS_PER_GAME
+
+
+GAMES = [{"id": "0021500123", "date": "NOV 12, 2015"}]
+
+
+@pytest.mark.parametrize(
+    "player_name, game_id, games, expected",
+    [
+        ("Stephen Curry", None, [], "Stephen_Curry_2015-16_shot_chart"),
+        (
+            "Stephen Curry",
+            "0021500123",
+            GAMES,
+            "Stephen_Curry_2015-16_2015-11-12_shot_chart",
+        ),
+        # A game missing from the log falls back to its id
+        (
+            "Stephen Curry",
+            "0021500999",
+            GAMES,
+            "Stephen_Curry_2015-16_0021500999_shot_chart",
+        ),
+        ("D'Angelo Russell", None, [], "D_Angelo_Russell_2015-16_shot_chart"),
+        ("J.J. Redick", None, [], "J.J._Redick_2015-16_shot_chart"),
+    ],
+)
+def test_chart_filename(player_name, game_id, games, expected):
+    assert chart_filename(player_name, "2015-16", game_id, games) == expected
+
+
+def compare_page(client, players, **params):
+    response = client.get(
+        "/compare", query_string={"player": players, "season": "2015-16", **params}
+    )
+    assert response.status_code == 200
+    return response.get_data(as_text=True)
+
+
+def compared_players(page):
+    """Players the compare form was rendered with, in order"""
+    start = page.index('id="players"')
+    select = page[start : page.index("</select>", start)]
+    return re.findall(r'<option value="([^"]+)" selected>\1</option>', select)
+
+
+def plot_divs(page):
+    return re.findall(r'<div id="(shot-chart-\d+)"', page)
+
+
+PLAYERS = ["Stephen Curry", "LeBron James", "Kevin Durant"]
+
+
+def test_compare_overlay_draws_every_player_on_one_court(client):
+    page = compare_page(client, PLAYERS)
+
+    assert compared_players(page) == PLAYERS
+    assert plot_divs(page) == ["shot-chart-0"]
+    names = {trace["name"] for trace in chart_traces(page, "shot-chart-0")}
+    assert names == {f"{p} - {r}" for p in PLAYERS for r in ("Made", "Missed")}
+
+
+def test_compare_grid_draws_a_court_per_player(client):
+    page = compare_page(client, PLAYERS, layout="grid")
+
+    assert plot_divs(page) == ["shot-chart-0", "shot-chart-1", "shot-chart-2"]
+    for i in range(len(PLAYERS)):
+        names = {trace["name"] for trace in chart_traces(page, f"shot-chart-{i}")}
+        assert names == {"Made", "Missed"}
+
+
+def test_compare_unknown_layout_falls_back_to_overlay(client):
+    assert plot_divs(compare_page(client, PLAYERS, layout="bogus")) == ["shot-chart-0"]
+
+
+def test_compare_keeps_the_first_max_players(client):
+    players = PLAYERS + ["Klay Thompson", "James Harden"]
+
+    page = compare_page(client, players)
+
+    assert compared_players(page) == players[:MAX_PLAYERS]
+    assert f"Showing the first {MAX_PLAYERS} players." in page
+
+
+def test_compare_skips_unknown_and_repeated_players(client):
+    page = compare_page(
+        client, ["Stephen Curry", "Nobody Atall", "stephen curry", "LeBron James"]
+    )
+
+    assert compared_players(page) == ["Stephen Curry", "LeBron James"]
+    assert "Player Nobody Atall not found." in page
+
+
+def test_compare_empty_form(client, stub):
+    calls = len(stub.calls)
+
+    page = compare_page(client, [])
+
+    assert compared_players(page) == []
+    assert plot_divs(page) == []
+    assert "error-message" not in page
+    assert len(stub.calls) == calls
+
+
+def per_player_rate_headers(page):
+    return re.findall(r"<th>(FGA/36|FGA/G)</th>", page)
+
+
+def test_compare_per36_header_only_for_players_with_minutes(client, monkeypatch):
+    def game_log_without_minutes(params, **sizes):
+        payload = stub_module.game_log(params, **sizes)
+        if params["PlayerID"] == str(LEBRON_ID):
+            log = payload["resultSets"][0]
+            minutes = log["headers"].index("MIN")
+            for row in log["rowSet"]:
+                row[minutes] = None
+        return payload
+
+    monkeypatch.setitem(
+        stub_module.ENDPOINTS, "playergamelog", game_log_without_minutes
+    )
+
+    page = compare_page(client, ["Stephen Curry", "LeBron James"], per36="on")
+    assert per_player_rate_headers(page) == ["FGA/36", "FGA/G"]
+
+    page = compare_page(client, ["Stephen Curry", "LeBron James"])
+    assert per_player_rate_headers(page) == ["FGA/G", "FGA/G"]
+
+
+def stub_frame(player_id):
+    result = stub_module.shot_chart({"PlayerID": player_id, "Season": "2015-16"})
+    shots = result["resultSets"][0]
+    return pd.DataFrame(shots["rowSet"], columns=shots["headers"])
+
+
+class FakeData:
+    """The RequestData calls Comparison.stats makes, from fixed numbers"""
+
+    MINUTES = {"A": (340.0, 10), "B": (0.0, 0), "C": (300.0, 10)}
+
+    def player_minutes(self, name, season):
+        total, games = self.MINUTES[name]
+        return total, games, None
+
+    def player_free_throws(self, name, season):
+        return 40, 35
+
+
+def test_comparison_zone_tables_match_single_player_path():
+    frames = {
+        name: stub_frame(player_id)
+        for name, player_id in zip(FakeData.MINUTES, (1, 2, 3))
+    }
+
+    tables = Comparison("2015-16", frames).stats(FakeData())
+
+    for name, shots_df in frames.items():
+        shots_df = normalize_shots(shots_df)
+        total, games = FakeData.MINUTES[name]
+        minutes_per_game = total / games if games else 0
+        num_games = shots_df["GAME_ID"].nunique()
+        expected = compute_shot_stats(
+            shots_df, num_games, 36 / minutes_per_game if minutes_per_game else 0
+        )
+        expected = add_free_throws(expected, 35, 40, num_games)
+        table, has_minutes = tables[name]
+        pd.testing.assert_frame_equal(table, expected)
+        assert has_minutes == (minutes_per_game > 0)
+
+
+def test_upstream_outage_is_logged_and_served_as_503(client, monkeypatch, caplog):
+    # A throttled response is not the expected JSON, so parsing it fails
+    monkeypatch.setitem(
+        stub_module.ENDPOINTS, "shotchartdetail", lambda params, **sizes: {}
+    )
+
+    with caplog.at_level("WARNING"):
+        response = client.get(
+            "/", query_string={"player": "Stephen Curry", "season": "2011-12"}
+        )
+
+    assert response.status_code == 503
+    assert "Retry-After" in response.headers
+    assert "Error reaching stats.nba.com" in caplog.text
+
+
+def api_json(client, url, **params):
+    response = client.get(url, query_string=params)
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def test_api_shots_columns_and_zone_codes(client):
+    payload = api_json(client, f"/api/shots/{CURRY_ID}/2015-16")
+
+    columns, zones = payload["columns"], payload["zones"]
+    assert set(columns) == {"LOC_X", "LOC_Y", "made", "distance", "zone"}
+    assert {len(column) for column in columns.values()} == {
+        GAMES_PER_SEASON * SHOTS_PER_GAME
+    }
+    assert set(columns["made"]) == {0, 1}
+    # Zones travel as codes into the zone name list
+    expected = normalize_shots(stub_frame(CURRY_ID))["SHOT_ZONE_BASIC"]
+    assert [zones[code] for code in columns["zone"]] == expected.tolist()
+    assert zones == sorted(set(zones))
+    assert payload["title"] == "Stephen Curry's Shot Chart (2015-16)"
+
+
+def test_api_shots_for_one_game(client):
+    game_id = stub_frame(CURRY_ID)["GAME_ID"].iloc[0]
+
+    payload = api_json(client, f"/api/shots/{CURRY_ID}/2015-16", game=game_id)
+
+    assert payload["game_id"] == game_id
+    assert len(payload["columns"]["LOC_X"]) == SHOTS_PER_GAME
+
+
+def test_api_stats_rows_and_totals(client):
+    payload = api_json(client, f"/api/stats/{CURRY_ID}/2015-16")
+
+    zones = [row["Zone"] for row in payload["rows"]]
+    assert {"2PT Field Goals", "3PT Field Goals", "Free Throws"} <= set(zones)
+    assert set(payload["rows"][0]) == {"Zone", "Made", "Attempts", "FG%"}
+    assert payload["total_shots"] == GAMES_PER_SEASON * SHOTS_PER_GAME
+    assert all("/36m" not in row["Made"] for row in payload["rows"])
+
+
+def test_api_stats_per36(client):
+    payload = api_json(client, f"/api/stats/{CURRY_ID}/2015-16", per36="on")
+
+    shot_rows = [row for row in payload["rows"] if row["Zone"] != "Free Throws"]
+    assert all("/36m" in row["Made"] for row in shot_rows)
+
+
+def test_api_stats_pre_1996_season_uses_season_totals(client):
+    payload = api_json(client, f"/api/stats/{CURRY_ID}/1990-91")
+
+    # From the stub's career totals: 990/1837 FG, 29/93 3PT, 571/671 FT
+    assert payload["rows"] == [
+        {"Zone": "2PT Field Goals", "Made": 961, "Attempts": 1744, "FG%": "55.1"},
+        {"Zone": "3PT Field Goals", "Made": 29, "Attempts": 93, "FG%": "31.2"},
+        {"Zone": "Free Throws", "Made": 571, "Attempts": 671, "FG%": "85.1"},
+    ]
+    assert (payload["total_shots"], payload["total_points"]) == (1837, 2580)
+
+    shots = api_json(client, f"/api/shots/{CURRY_ID}/1990-91")
+    assert shots["columns"]["LOC_X"] == [] and shots["zones"] == []
+
+
+@pytest.mark.parametrize("endpoint", ["shots", "stats"])
+def test_api_unknown_player(client, endpoint):
+    response = client.get(f"/api/{endpoint}/1/2015-16")
+
+    assert response.status_code == 404
+    assert response.get_json() == {"error": "Player 1 not found"}
@@ -0,0 +1,149 @@
+# tests/test_singleflight.py
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.models import ShotChart
+from app.singleflight import SingleFlight
+
+
+class CountingFetch:
+    """A fetch that blocks until released and counts how often it ran"""
+
+    def __init__(self, result=42, error=None):
+        self.result = result
+        self.error = error
+        self.calls = 0
+        self.entered = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self):
+        self.calls += 1
+        self.entered.set()
+        self.release.wait(5)
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+def run_concurrently(flights, key, fetch, callers=5):
+    """Start callers, release the fetch once they all joined, return outcomes"""
+    outcomes = [None] * callers
+
+    def call(i):
+        try:
+            outcomes[i] = flights.do(key, fetch)
+        except Exception as e:
+            outcomes[i] = e
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(callers)]
+    threads[0].start()
+    fetch.entered.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    # Joiners block on the leader's future; give them time to reach it
+    time.sleep(0.1)
+    fetch.release.set()
+    for thread in threads:
+        thread.join(5)
+    return outcomes
+
+
+def test_concurrent_callers_share_one_call():
+    fetch = CountingFetch()
+
+    outcomes = run_concurrently(SingleFlight(share_ttl=0), ("test", 1), fetch)
+
+    assert outcomes == [42] * 5
+    assert fetch.calls == 1
+
+
+def test_different_keys_do_not_share():
+    flights = SingleFlight(share_ttl=0)
+
+    assert flights.do(("test", 1), lambda: 1) == 1
+    assert flights.do(("test", 2), lambda: 2) == 2
+
+
+def test_errors_reach_every_waiter_and_are_not_kept():
+    flights = SingleFlight(share_ttl=10)
+    fetch = CountingFetch(error=RuntimeError("upstream down"))
+
+    outcomes = run_concurrently(flights, ("test", 1), fetch)
+
+    assert fetch.calls == 1
+    assert all(isinstance(outcome, RuntimeError) for outcome in outcomes)
+    # The next call retries instead of replaying the failure
+    assert flights.do(("test", 1), lambda: "recovered") == "recovered"
+
+
+def test_results_are_shared_until_the_ttl_expires():
+    flights = SingleFlight(share_ttl=0.2)
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return len(calls)
+
+    assert flights.do(("test", 1), fetch) == 1
+    assert flights.do(("test", 1), fetch) == 1
+    time.sleep(0.25)
+    assert flights.do(("test", 1), fetch) == 2
+
+
+def test_workers_share_results_through_the_lock_dir(tmp_path):
+    # Two instances stand in for two worker processes: flock locks are per
+    # open file, so they exclude each other within one process too
+    worker_a = SingleFlight(lock_dir=str(tmp_path), share_ttl=10)
+    worker_b = SingleFlight(lock_dir=str(tmp_path), share_ttl=10)
+    if not worker_a.shared:
+        pytest.skip("file locks need fcntl")
+    fetch = CountingFetch(result={"shots": [1, 2, 3]})
+
+    leader = threading.Thread(target=worker_a.do, args=(("test", 1), fetch))
+    leader.start()
+    fetch.entered.wait(5)
+    with ThreadPoolExecutor(1) as pool:
+        # Waits on worker A's file lock, then reads its pickled result
+        waiter = pool.submit(worker_b.do, ("test", 1), fetch)
+        time.sleep(0.1)
+        assert not waiter.done()
+        fetch.release.set()
+        assert waiter.result(5) == {"shots": [1, 2, 3]}
+    leader.join(5)
+
+    assert fetch.calls == 1
+
+
+def test_expired_shared_result_is_fetched_again(tmp_path):
+    worker_a = SingleFlight(lock_dir=str(tmp_path), share_ttl=0.2)
+    worker_b = SingleFlight(lock_dir=str(tmp_path), share_ttl=0.2)
+    if not worker_a.shared:
+        pytest.skip("file locks need fcntl")
+
+    assert worker_a.do(("test", 1), lambda: "first") == "first"
+    time.sleep(0.25)
+    assert worker_b.do(("test", 1), lambda: "second") == "second"
+
+
+def test_name_variants_share_one_upstream_call(make_app, stub):
+    app = make_app(SINGLEFLIGHT_SHARE_TTL=10)
+    names = ["Stephen Curry", "stephen curry", "STEPHEN  CURRY", "Stephen Curry"]
+
+    def fetch(name):
+        with app.app_context():
+            shots_df, _ = ShotChart.get_player_shots(name, "2012-13")
+            return len(shots_df)
+
+    with ThreadPoolExecutor(len(names)) as pool:
+        sizes = list(pool.map(fetch, names * 2))
+
+    assert len(set(sizes)) == 1 and sizes[0] > 0
+    calls = [
+        params
+        for params in stub.endpoint_calls("shotchartdetail")
+        if params["Season"] == "2012-13"
+    ]
+    assert len(calls) == 1
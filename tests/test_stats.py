@@ -0,0 +1,249 @@
+# tests/test_stats.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.stats import (
+    ZONES,
+    add_free_throws,
+    compute_shot_stats,
+    format_shot_stats,
+    grouped_zone_counts,
+    parse_minutes,
+    shooting_totals,
+    zone_counts,
+)
+
+ZONE_TYPES = [
+    ("Restricted Area", "2PT Field Goal"),
+    ("In The Paint (Non-RA)", "2PT Field Goal"),
+    ("Mid-Range", "2PT Field Goal"),
+    ("Left Corner 3", "3PT Field Goal"),
+    ("Right Corner 3", "3PT Field Goal"),
+    ("Above the Break 3", "3PT Field Goal"),
+    ("Backcourt", "3PT Field Goal"),
+]
+
+
+def synthetic_shots(rows, seed=0, zone_types=ZONE_TYPES):
+    rng = np.random.default_rng(seed)
+    picks = rng.integers(0, len(zone_types), rows)
+    return pd.DataFrame(
+        {
+            "GAME_ID": rng.integers(0, max(rows // 20, 1), rows).astype(str),
+            "SHOT_ZONE_BASIC": [zone_types[i][0] for i in picks],
+            "SHOT_TYPE": [zone_types[i][1] for i in picks],
+            "SHOT_MADE_FLAG": (rng.random(rows) < 0.46).astype(int),
+        }
+    )
+
+
+def legacy_stats(shots_df, ftm, fta, minutes_per_game, per_game, per36):
+    """
+    The row-wise table and totals home() built before app.stats existed,
+    kept here as the reference the vectorized path must reproduce
+    """
+    num_games = len(set(shots_df["GAME_ID"])) if per_game else 1
+    two_pt_shots = shots_df[shots_df["SHOT_TYPE"] == "2PT Field Goal"]
+    three_pt_shots = shots_df[shots_df["SHOT_TYPE"] == "3PT Field Goal"]
+
+    zone_stats = (
+        shots_df[shots_df["SHOT_ZONE_BASIC"] != "Backcourt"]
+        .groupby("SHOT_ZONE_BASIC")
+        .agg(
+            Made=("SHOT_MADE_FLAG", "sum"),
+            Attempts=("SHOT_MADE_FLAG", "count"),
+            FGPercent=("SHOT_MADE_FLAG", lambda x: f"{(x.mean() * 100):.1f}"),
+        )
+    ).reset_index()
+    zone_stats.columns = ["Zone", "Made", "Attempts", "FG%"]
+
+    per36_multiplier = 36 / minutes_per_game if minutes_per_game > 0 else 0
+
+    def with_rates(value):
+        per_game_value = value / num_games
+        per36_value = per_game_value * per36_multiplier
+        if per36 and minutes_per_game > 0:
+            return f"{value} ({per_game_value:.1f}/game | {per36_value:.1f}/36m)"
+        return f"{value} ({per_game_value:.1f}/game)"
+
+    if per_game:
+        for col in ["Made", "Attempts"]:
+            zone_stats[col] = zone_stats[col].map(with_rates)
+
+    summary_made = [two_pt_shots["SHOT_MADE_FLAG"].sum()]
+    summary_made.append(three_pt_shots["SHOT_MADE_FLAG"].sum())
+    summary_attempts = [len(two_pt_shots), len(three_pt_shots)]
+    summary_stats = pd.DataFrame(
+        {
+            "Zone": ["2PT Field Goals", "3PT Field Goals"],
+            "Made": [with_rates(v) if per_game else v for v in summary_made],
+            "Attempts": [with_rates(v) if per_game else v for v in summary_attempts],
+            "FG%": [
+                f"{(two_pt_shots['SHOT_MADE_FLAG'].mean() * 100):.1f}",
+                f"{(three_pt_shots['SHOT_MADE_FLAG'].mean() * 100):.1f}",
+            ],
+        }
+    )
+    ft_stats = pd.DataFrame(
+        {
+            "Zone": ["Free Throws"],
+            "Made": [f"{ftm} ({(ftm/num_games):.1f}/game)" if per_game else ftm],
+            "Attempts": [f"{fta} ({(fta/num_games):.1f}/game)" if per_game else fta],
+            "FG%": [f"{(ftm/fta * 100):.1f}" if fta > 0 else "0.0"],
+        }
+    )
+    table = pd.concat([zone_stats, summary_stats, ft_stats], ignore_index=True)
+
+    total_shots = len(shots_df)
+    total_points = summary_made[0] * 2 + summary_made[1] * 3 + ftm
+    ts_percent = (
+        (total_points / (2 * (total_shots + 0.44 * fta))) * 100
+        if (total_shots + fta) > 0
+        else 0
+    )
+    return table, {
+        "ts_percent": f"{ts_percent:.1f}",
+        "total_points": int(total_points),
+        "total_shots": int(total_shots),
+    }
+
+
+def vectorized_stats(shots_df, ftm, fta, minutes_per_game, per_game, per36):
+    """The same table and totals through app.stats, as home() builds them now"""
+    num_games = shots_df["GAME_ID"].nunique() if per_game else 1
+    per36_multiplier = 36 / minutes_per_game if minutes_per_game > 0 else 0
+    stats = compute_shot_stats(shots_df, num_games, per36_multiplier)
+    stats = add_free_throws(stats, ftm, fta, num_games)
+    table = format_shot_stats(
+        stats, per_game=per_game, per36=per36 and minutes_per_game > 0
+    )
+    return table, shooting_totals(stats)
+
+
+def as_text(table):
+    return table.astype(str).reset_index(drop=True)
+
+
+@pytest.mark.parametrize("rows", [25, 400, 5000])
+@pytest.mark.parametrize("seed", [0, 1, 2])
+@pytest.mark.parametrize(
+    "per_game, per36, minutes_per_game",
+    [(True, False, 34.5), (True, True, 34.5), (True, True, 0), (False, False, 0)],
+)
+def test_matches_legacy_row_wise_output(rows, seed, per_game, per36, minutes_per_game):
+    shots_df = synthetic_shots(rows, seed)
+    ftm, fta = 110, 130
+    expected_table, expected_totals = legacy_stats(
+        shots_df, ftm, fta, minutes_per_game, per_game, per36
+    )
+    table, totals = vectorized_stats(
+        shots_df, ftm, fta, minutes_per_game, per_game, per36
+    )
+    pd.testing.assert_frame_equal(as_text(table), as_text(expected_table))
+    assert totals == expected_totals
+
+
+def test_empty_frame():
+    shots_df = synthetic_shots(0)
+    stats = add_free_throws(compute_shot_stats(shots_df), 0, 0)
+    table = format_shot_stats(stats)
+
+    assert table["Zone"].tolist() == [
+        "2PT Field Goals",
+        "3PT Field Goals",
+        "Free Throws",
+    ]
+    assert (stats["Attempts"] == 0).all()
+    assert table["FG%"].tolist() == ["0.0", "0.0", "0.0"]
+    assert shooting_totals(stats) == {
+        "ts_percent": "0.0",
+        "total_points": 0,
+        "total_shots": 0,
+    }
+
+
+def test_zones_without_attempts_get_no_row():
+    shots_df = synthetic_shots(50, zone_types=ZONE_TYPES[:2])
+    stats = compute_shot_stats(shots_df)
+
+    assert stats["Zone"].tolist() == [
+        "In The Paint (Non-RA)",
+        "Restricted Area",
+        "2PT Field Goals",
+        "3PT Field Goals",
+    ]
+    # No threes at all: the row stays, at 0.0 rather than NaN
+    three = stats.set_index("Zone").loc["3PT Field Goals"]
+    assert three["Attempts"] == 0
+    assert three["FG%"] == 0.0
+
+
+def test_backcourt_counts_toward_threes_without_a_row():
+    shots_df = pd.DataFrame(
+        {
+            "GAME_ID": ["1", "1", "1"],
+            "SHOT_ZONE_BASIC": ["Backcourt", "Backcourt", "Above the Break 3"],
+            "SHOT_TYPE": ["3PT Field Goal"] * 3,
+            "SHOT_MADE_FLAG": [1, 0, 1],
+        }
+    )
+    stats = compute_shot_stats(shots_df).set_index("Zone")
+
+    assert "Backcourt" not in stats.index
+    assert stats.loc["Above the Break 3", "Attempts"] == 1
+    assert stats.loc["3PT Field Goals", "Attempts"] == 3
+    assert stats.loc["3PT Field Goals", "Made"] == 2
+
+
+def test_grouped_counts_match_per_group_counts():
+    frames = [synthetic_shots(300, seed) for seed in range(3)]
+    combined = pd.concat(frames, ignore_index=True)
+    groups = np.repeat(np.arange(len(frames)), [len(f) for f in frames])
+
+    made, attempts = grouped_zone_counts(combined, groups, len(frames))
+
+    assert made.shape == attempts.shape == (len(frames), len(ZONES), 2)
+    for i, frame in enumerate(frames):
+        frame_made, frame_attempts = zone_counts(frame)
+        np.testing.assert_array_equal(made[i], frame_made)
+        np.testing.assert_array_equal(attempts[i], frame_attempts)
+
+
+def legacy_total_minutes(minutes):
+    """The per-row loop get_player_minutes used before parse_minutes"""
+    total_minutes = 0
+    for min_str in minutes:
+        try:
+            if ":" in str(min_str):
+                mins, secs = map(int, str(min_str).split(":"))
+                total_minutes += mins + (secs / 60)
+            else:
+                total_minutes += float(min_str)
+        except (ValueError, AttributeError):
+            continue
+    return total_minutes
+
+
+@pytest.mark.parametrize(
+    "minutes",
+    [
+        [34, 36, 28],
+        [34.5, 12.25],
+        ["34:12", "36:00", "8:30"],
+        ["34:12", 36, "28"],
+        ["34:12", "DNP", ""],
+    ],
+)
+def test_parse_minutes_matches_legacy_total(minutes):
+    assert parse_minutes(minutes).sum() == pytest.approx(legacy_total_minutes(minutes))
+
+
+def test_parse_minutes_values():
+    parsed = parse_minutes(["34:12", "0:45", 30, "DNP", None, np.nan])
+    np.testing.assert_allclose(parsed, [34.2, 0.75, 30, 0, 0, 0])
+
+
+def test_parse_minutes_numeric_nan_is_zero():
+    # The old loop summed float("nan") and turned the season total into NaN
+    np.testing.assert_allclose(parse_minutes([34.0, np.nan, 30.0]), [34, 0, 30])
@@ -0,0 +1,64 @@
+# tests/test_transport.py
+import pytest
+import requests
+
+from app.transport import Transport, UpstreamError
+
+
+def endpoint(error=None):
+    """An nba_api endpoint class whose request raises error, if given"""
+
+    class Endpoint:
+        def __init__(self, **params):
+            if error is not None:
+                raise error
+
+    Endpoint.endpoint = "stubendpoint"
+    return Endpoint
+
+
+@pytest.fixture
+def transport():
+    return Transport(rate=0, retries=0, breaker_threshold=1, breaker_reset=0)
+
+
+def test_breaker_closes_after_successful_trial(transport):
+    with pytest.raises(UpstreamError):
+        transport.call(endpoint(requests.ConnectionError("refused")))
+
+    transport.call(endpoint())
+
+    assert transport.breaker("stubendpoint").allow() is None
+
+
+@pytest.mark.parametrize("error", [TypeError("bad params"), RuntimeError("bug")])
+def test_unexpected_error_in_trial_is_recorded(transport, error):
+    with pytest.raises(UpstreamError):
+        transport.call(endpoint(requests.ConnectionError("refused")))
+
+    # The half-open trial fails with an error that is not retried
+    with pytest.raises(type(error)):
+        transport.call(endpoint(error))
+
+    # ...and the next trial still gets through and closes the circuit
+    transport.call(endpoint())
+    assert transport.breaker("stubendpoint").allow() is None
+
+
+def test_open_circuit_fails_fast(transport):
+    transport.breaker_reset = 60
+    with pytest.raises(UpstreamError):
+        transport.call(endpoint(requests.ConnectionError("refused")))
+
+    with pytest.raises(UpstreamError, match="circuit open") as raised:
+        transport.call(endpoint())
+    assert raised.value.retry_after > 0
+
+
+def test_workers_split_the_configured_rate(make_app):
+    from app.transport import transport
+
+    make_app(UPSTREAM_RATE=4.0, UPSTREAM_BURST=8, UPSTREAM_WORKERS=4)
+
+    assert transport.bucket.rate == 1.0
+    assert transport.bucket.burst == 2.0
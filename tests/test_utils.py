@@ -0,0 +1,67 @@
+# tests/test_utils.py
+import json
+
+import numpy as np
+import plotly.graph_objects as go
+import plotly.io as pio
+import pytest
+
+from app.utils import COURT_STYLES, court_figure, court_layout, court_shapes
+
+IMAGE_URL = "/static/images/shot_chart.png"
+
+
+def made_trace():
+    return dict(
+        type="scatter",
+        mode="markers",
+        name="Made",
+        x=np.array([-20, 0, 150]),
+        y=np.array([10, 0, 200]),
+        customdata=np.array([2, 0, 25]),
+    )
+
+
+def test_court_layout_is_built_once_per_style():
+    court_layout.cache_clear()
+
+    for court in COURT_STYLES:
+        assert court_layout(court, IMAGE_URL) is court_layout(court, IMAGE_URL)
+
+    assert court_layout.cache_info().misses == len(COURT_STYLES)
+
+
+def test_court_styles():
+    raster = court_layout("raster", IMAGE_URL)
+    vector = court_layout("vector", IMAGE_URL)
+
+    assert [image["source"] for image in raster["images"]] == [IMAGE_URL]
+    assert "shapes" not in raster
+    assert len(vector["shapes"]) == len(court_shapes())
+    assert "images" not in vector
+    # The default template is resolved in, so pages need no validation
+    assert "template" in raster and "template" in vector
+    with pytest.raises(ValueError):
+        court_layout("chalk")
+
+
+def test_court_figure_does_not_modify_the_shared_layout():
+    shared = court_layout("vector", None)
+    before = json.dumps(shared, sort_keys=True)
+
+    figure = court_figure([made_trace()], court="vector", title=dict(text="Chart"))
+
+    assert figure["layout"]["title"] == {"text": "Chart"}
+    assert json.dumps(shared, sort_keys=True) == before
+    assert figure["layout"]["xaxis"] is shared["xaxis"]
+
+
+@pytest.mark.parametrize("court", COURT_STYLES)
+def test_unvalidated_figure_serializes_like_a_validated_one(court):
+    figure = court_figure(
+        [made_trace()], court=court, image_url=IMAGE_URL, title=dict(text="Chart")
+    )
+
+    # The validating constructor accepts it, and validate=False changes nothing
+    validated = json.loads(pio.to_json(go.Figure(figure)))
+    assert json.loads(pio.to_json(figure, validate=False)) == validated
@@ -0,0 +1,104 @@
+# tests/test_warmup.py
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+from flask import Flask
+
+from app import warmup as warmup_module
+from app.warmup import Warmup
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Imports run.py as the flask CLI does, then reports what it left running
+IMPORT_RUN = """
+import json, sys, threading, time
+before = threading.active_count()
+import run
+from app.warmup import warmup
+time.sleep(0.5)
+print(json.dumps({
+    "threads": threading.active_count() - before,
+    "started": warmup.started,
+    "endpoints": "nba_api.stats.endpoints" in sys.modules,
+}))
+"""
+
+
+def test_importing_run_starts_no_warmup(tmp_path):
+    env = {
+        **os.environ,
+        "SHOT_CACHE_DIR": str(tmp_path / "shots"),
+        "SHOT_STORE_PATH": str(tmp_path / "shots.db"),
+        "LEAGUE_BASELINES_PATH": str(tmp_path / "baselines.parquet"),
+    }
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_RUN],
+        cwd=ROOT,
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+
+    result = json.loads(output.strip().splitlines()[-1])
+    assert result == {"threads": 0, "started": False, "endpoints": False}
+
+
+@pytest.fixture
+def probe_app():
+    """A bare app with a fresh Warmup's routes"""
+    app = Flask(__name__)
+    warmup = Warmup()
+    warmup.init_app(app)
+    return app, warmup
+
+
+def test_healthz(probe_app):
+    app, _ = probe_app
+
+    response = app.test_client().get("/healthz")
+
+    assert response.status_code == 200
+    assert response.get_json() == {"status": "ok"}
+
+
+def test_readyz_follows_the_warmup(probe_app, monkeypatch):
+    app, warmup = probe_app
+    client = app.test_client()
+    entered, release = threading.Event(), threading.Event()
+
+    def slow(app):
+        entered.set()
+        release.wait(5)
+
+    def broken(app):
+        raise RuntimeError("no store")
+
+    monkeypatch.setattr(warmup_module, "STEPS", [("slow", slow), ("broken", broken)])
+
+    # Never warmed up: ready, state is built lazily
+    assert client.get("/readyz").status_code == 200
+
+    warmup.start(app)
+    entered.wait(5)
+    response = client.get("/readyz")
+    assert response.status_code == 503
+    assert response.get_json()["ready"] is False
+
+    release.set()
+    for _ in range(500):
+        if warmup.finished:
+            break
+        time.sleep(0.01)
+    response = client.get("/readyz")
+    assert response.status_code == 200
+    payload = response.get_json()
+    assert payload["ready"] is True
+    # A failed step is reported, but does not hold readiness back
+    assert payload["steps"]["slow"] >= 0
+    assert payload["steps"]["broken"] is None
@@ -0,0 +1,15 @@
+# wsgi.py
+import gc
+
+from app import create_app
+from app.warmup import warmup
+
+app = create_app()
+
+# Imported once in the gunicorn master (preload_app), so everything warmed
+# here is shared copy-on-write by the forked workers
+warmup.run(app)
+
+# Keep the warmed objects out of garbage collection passes, which would
+# otherwise touch and copy their pages in every worker
+gc.freeze()